@@ -0,0 +1,283 @@
+import os
+import json
+import time
+import uuid
+import sqlite3
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# Job states
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+# Jobs interrupted this many times (e.g. by a crashing worker) are failed instead of retried
+MAX_ATTEMPTS = 3
+
+def _process_alive(pid):
+    """Return whether a process with this id is running on this machine."""
+    # Signalling pid 0 or a negative pid would address process groups
+    if pid <= 0:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+class JobStore:
+    """
+    Persist analysis jobs in a local SQLite database.
+    
+    Several gunicorn workers can share one database: a job is only run by
+    the process that claims it, and the claim is a single atomic update.
+    """
+    
+    def __init__(self, path=os.path.join(".cache", "jobs.sqlite")):
+        """
+        Open (or create) the job database.
+        
+        Args:
+            path: Path to the SQLite database file
+        """
+        self.path = path
+        
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        
+        self._lock = threading.Lock()
+        # Workers share the file, so wait for each other's writes
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                params TEXT NOT NULL,
+                status TEXT NOT NULL,
+                result TEXT,
+                error TEXT,
+                progress TEXT,
+                owner INTEGER,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                created_at REAL NOT NULL,
+                started_at REAL,
+                finished_at REAL
+            );
+            CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status);
+        """)
+        self._conn.commit()
+    
+    def create(self, params):
+        """Record a new queued job with JSON-serializable parameters and return its id."""
+        job_id = uuid.uuid4().hex
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO jobs (id, params, status, created_at) VALUES (?, ?, ?, ?)",
+                (job_id, json.dumps(params), QUEUED, time.time())
+            )
+            self._conn.commit()
+        return job_id
+    
+    def claim(self, job_id):
+        """
+        Mark a queued job as run by this process.
+        
+        Returns:
+            The job's parameters, or None if the job is not queued (another
+            process claimed it, or it does not exist)
+        """
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET status = ?, owner = ?, attempts = attempts + 1, started_at = ? "
+                "WHERE id = ? AND status = ?",
+                (RUNNING, os.getpid(), time.time(), job_id, QUEUED)
+            )
+            self._conn.commit()
+            if cursor.rowcount == 0:
+                return None
+            row = self._conn.execute("SELECT params FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return json.loads(row["params"])
+    
+    def finish(self, job_id, result):
+        """Store the JSON-serializable result of a job."""
+        self._set_outcome(job_id, DONE, json.dumps(result), None)
+    
+    def fail(self, job_id, error):
+        """Store the error message of a failed job."""
+        self._set_outcome(job_id, FAILED, None, error)
+    
+    def update_progress(self, job_id, progress):
+        """Store the latest JSON-serializable progress snapshot of a running job."""
+        with self._lock:
+            self._conn.execute("UPDATE jobs SET progress = ? WHERE id = ?", (json.dumps(progress), job_id))
+            self._conn.commit()
+    
+    def _set_outcome(self, job_id, status, result, error):
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = ?, finished_at = ? WHERE id = ?",
+                (status, result, error, time.time(), job_id)
+            )
+            self._conn.commit()
+    
+    def get(self, job_id):
+        """
+        Look up a job.
+        
+        Returns:
+            A dictionary with the job's "id", "params", "status", latest
+            "progress" snapshot, "result" (once done), "error" (once
+            failed) and "created_at", "started_at" and "finished_at"
+            timestamps; None if there is no such job
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        
+        return {
+            "id": row["id"],
+            "params": json.loads(row["params"]),
+            "status": row["status"],
+            "result": json.loads(row["result"]) if row["result"] is not None else None,
+            "error": row["error"],
+            "progress": json.loads(row["progress"]) if row["progress"] is not None else None,
+            "created_at": row["created_at"],
+            "started_at": row["started_at"],
+            "finished_at": row["finished_at"]
+        }
+    
+    def recover(self):
+        """
+        Requeue the jobs whose process stopped while running them.
+        
+        Jobs interrupted MAX_ATTEMPTS times are failed instead, so that a
+        job crashing its worker is not retried forever.
+        
+        Returns:
+            The ids of all queued jobs, oldest first
+        """
+        with self._lock:
+            running = self._conn.execute(
+                "SELECT id, owner, attempts FROM jobs WHERE status = ?", (RUNNING,)
+            ).fetchall()
+            for row in running:
+                if row["owner"] is not None and _process_alive(row["owner"]):
+                    continue
+                if row["attempts"] >= MAX_ATTEMPTS:
+                    self._conn.execute(
+                        "UPDATE jobs SET status = ?, error = ?, finished_at = ? WHERE id = ? AND status = ?",
+                        (FAILED, "Interrupted too many times", time.time(), row["id"], RUNNING)
+                    )
+                else:
+                    self._conn.execute(
+                        "UPDATE jobs SET status = ?, owner = NULL WHERE id = ? AND status = ?",
+                        (QUEUED, row["id"], RUNNING)
+                    )
+            self._conn.commit()
+            
+            queued = self._conn.execute(
+                "SELECT id FROM jobs WHERE status = ? ORDER BY created_at", (QUEUED,)
+            ).fetchall()
+        return [row["id"] for row in queued]
+    
+    def purge(self, max_age_seconds):
+        """Delete finished and failed jobs older than max_age_seconds and return how many were deleted."""
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM jobs WHERE status IN (?, ?) AND finished_at < ?",
+                (DONE, FAILED, time.time() - max_age_seconds)
+            )
+            self._conn.commit()
+        return cursor.rowcount
+    
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+class JobQueue:
+    """
+    Run persisted jobs on a bounded pool of threads.
+    
+    submit() records a job and returns its id immediately; at most
+    max_workers jobs run at once and the rest wait in the pool's queue.
+    When the queue starts, jobs left queued or interrupted by a previous
+    process are picked up again.
+    """
+    
+    def __init__(self, store, run_job, max_workers=2, retention_seconds=24 * 3600):
+        """
+        Initialize the queue.
+        
+        Args:
+            store: The JobStore persisting the jobs
+            run_job: Called with a job's parameters and a callback storing
+                its progress snapshots; returns its JSON-serializable
+                result or raises
+            max_workers: Number of jobs run at once
+            retention_seconds: Age after which finished jobs are deleted
+        """
+        self.store = store
+        self.run_job = run_job
+        self.max_workers = max_workers
+        self.retention_seconds = retention_seconds
+        self._executor = None
+        self._lock = threading.Lock()
+    
+    def start(self):
+        """Start the pool and resume the jobs a previous process left behind."""
+        with self._lock:
+            if self._executor is not None:
+                return
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="analysis-job")
+        
+        purged = self.store.purge(self.retention_seconds)
+        if purged:
+            logger.info(f"Deleted {purged} old jobs")
+        
+        pending = self.store.recover()
+        if pending:
+            logger.info(f"Resuming {len(pending)} queued jobs")
+        for job_id in pending:
+            self._executor.submit(self._run, job_id)
+    
+    def submit(self, params):
+        """Queue a job and return its id."""
+        self.start()
+        job_id = self.store.create(params)
+        self._executor.submit(self._run, job_id)
+        return job_id
+    
+    def get(self, job_id):
+        """Look up a job, see JobStore.get."""
+        return self.store.get(job_id)
+    
+    def _run(self, job_id):
+        params = self.store.claim(job_id)
+        if params is None:
+            return
+        
+        try:
+            result = self.run_job(params, lambda progress: self.store.update_progress(job_id, progress))
+        except Exception as e:
+            logger.error(f"Job {job_id} failed: {str(e)}")
+            self.store.fail(job_id, str(e))
+            return
+        
+        self.store.finish(job_id, result)
+    
+    def shutdown(self, wait=True):
+        """Stop the pool, waiting for the running jobs unless wait is False."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
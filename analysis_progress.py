@@ -0,0 +1,77 @@
+import time
+
+class AnalysisProgress:
+    """
+    Track the stage and partial results of one analysis.
+    
+    The stages are "queued", then "login", "search", "scroll" and "extract"
+    while scraping (or "waiting" for an identical analysis), "analyze",
+    "render" and "done".
+    
+    The scraper calls the tracker with each stage it reaches and the posts
+    it extracts, and the analysis reports its running aggregate. Every
+    change produces a snapshot passed to publish: the "stage", the
+    "posts_collected" and "posts_analyzed" so far, the running "sentiments"
+    counts and, once finished, the "chart_data". Snapshots within the same
+    stage are published at most every min_interval seconds.
+    """
+    
+    def __init__(self, publish, post_count, min_interval=0.5):
+        """
+        Initialize the tracker.
+        
+        Args:
+            publish: Called with each snapshot
+            post_count: Number of posts requested
+            min_interval: Seconds between two snapshots of the same stage
+        """
+        self.publish = publish
+        self.min_interval = min_interval
+        self.state = {
+            "stage": "queued",
+            "post_count": post_count,
+            "posts_collected": 0,
+            "posts_analyzed": 0,
+            "sentiments": {"positive": 0, "neutral": 0, "negative": 0}
+        }
+        self._published_at = 0
+    
+    def __call__(self, stage, new_posts=0):
+        """Record that the scraper reached a stage and extracted new_posts more posts."""
+        self.state["posts_collected"] += new_posts
+        self._update(stage)
+    
+    def collected(self, posts):
+        """Record the posts collected once scraping (or its fallback) is over."""
+        self.state["posts_collected"] = len(posts)
+        self._update("extract", force=True)
+    
+    def waiting(self):
+        """Record that an identical analysis run by another request is awaited."""
+        self._update("waiting")
+    
+    def analyzed(self, aggregate):
+        """Record the running aggregate of the posts analyzed so far."""
+        self.state["posts_analyzed"] = aggregate.total_posts
+        self.state["sentiments"] = dict(aggregate.sentiment_counts)
+        self._update("analyze")
+    
+    def rendering(self):
+        """Record that the report is being built."""
+        self._update("render")
+    
+    def finished(self, result):
+        """Record the finished analysis's counts and chart data."""
+        self.state["posts_analyzed"] = sum(result["sentiments"].values())
+        self.state["sentiments"] = dict(result["sentiments"])
+        self.state["chart_data"] = result["chart_data"]
+        self._update("done", force=True)
+    
+    def _update(self, stage, force=False):
+        now = time.time()
+        if stage == self.state["stage"] and not force and now - self._published_at < self.min_interval:
+            return
+        
+        self.state["stage"] = stage
+        self._published_at = now
+        self.publish(dict(self.state))
@@ -0,0 +1,145 @@
+"""
+Side-by-side comparison of several companies' analyses, and its command line.
+"""
+
+import os
+import sys
+import json
+import argparse
+
+def net_sentiment(positive, negative, total):
+    """Return the share of positive minus the share of negative posts, or None without posts."""
+    return round((positive - negative) / total, 4) if total else None
+
+def mention_counts(result, kind):
+    """Return the mentions of every feature or issue of an analysis, kind being "features" or "issues"."""
+    if 'mentions' in result:
+        return result['mentions'][kind]
+    # Analyses cached before all mentions were kept only have the charts' top ones
+    chart = result['chart_data']['top_' + kind]
+    return {label: count for label, count in zip(chart['labels'], chart['values']) if count}
+
+def compare_mentions(results, kind):
+    """Return the mentions of each feature or issue by company, most mentioned overall first."""
+    counts = [mention_counts(result, kind) for result in results]
+    names = {name for company_counts in counts for name in company_counts}
+    
+    rows = [
+        {
+            'name': name,
+            'mentions': {result['company_name']: company_counts.get(name, 0)
+                         for result, company_counts in zip(results, counts)}
+        }
+        for name in names
+    ]
+    rows.sort(key=lambda row: (-sum(row['mentions'].values()), row['name']))
+    return rows
+
+def side_by_side(results):
+    """
+    Compare the analyses of several companies.
+    
+    Args:
+        results: The report data of each company's analysis
+    
+    Returns:
+        A JSON-serializable dictionary with, for each company in the given
+        order, its sentiment counts, shares and net sentiment ("companies");
+        its monthly sentiment counts and net sentiment over the months of
+        all companies ("trend"); and the mentions of every feature and
+        issue by company, most mentioned first ("features", "issues")
+    """
+    companies = []
+    for result in results:
+        sentiments = result['sentiments']
+        total = sum(sentiments.values())
+        companies.append({
+            'company': result['company_name'],
+            'industry': result['company_type'],
+            'source': result['data_source'],
+            'date_range': result['date_range'],
+            'posts': total,
+            'sentiments': sentiments,
+            'shares': {sentiment: round(count / total, 4) if total else 0 for sentiment, count in sentiments.items()},
+            'net_sentiment': net_sentiment(sentiments['positive'], sentiments['negative'], total)
+        })
+    
+    # Align every company's trend on the months of all of them
+    months = sorted({month for result in results for month in result['chart_data']['sentiment_trend']['labels']})
+    trend = {'months': months, 'companies': {}}
+    for result in results:
+        company_trend = result['chart_data']['sentiment_trend']
+        by_month = {
+            month: (positive, neutral, negative)
+            for month, positive, neutral, negative in zip(company_trend['labels'], company_trend['positive'],
+                                                          company_trend['neutral'], company_trend['negative'])
+        }
+        counts = [by_month.get(month, (0, 0, 0)) for month in months]
+        trend['companies'][result['company_name']] = {
+            'positive': [positive for positive, _, _ in counts],
+            'neutral': [neutral for _, neutral, _ in counts],
+            'negative': [negative for _, _, negative in counts],
+            'net_sentiment': [net_sentiment(positive, negative, positive + neutral + negative)
+                              for positive, neutral, negative in counts]
+        }
+    
+    return {
+        'companies': companies,
+        'trend': trend,
+        'features': compare_mentions(results, 'features'),
+        'issues': compare_mentions(results, 'issues')
+    }
+
+def top_mention(rows, company_name):
+    """Return the feature or issue a company mentions most, or "-" if it mentions none."""
+    top = max(rows, key=lambda row: row['mentions'][company_name], default=None)
+    return top['name'] if top is not None and top['mentions'][company_name] else '-'
+
+def format_table(comparison):
+    """Format the sentiment shares, net sentiment and top feature and issue of each company as a text table."""
+    lines = [f"{'Company':<24} {'Posts':>6} {'Positive':>9} {'Neutral':>8} {'Negative':>9} {'Net':>6}  Top feature / issue"]
+    for company in comparison['companies']:
+        name = company['company']
+        top_feature = top_mention(comparison['features'], name)
+        top_issue = top_mention(comparison['issues'], name)
+        shares = company['shares']
+        net = company['net_sentiment'] if company['net_sentiment'] is not None else 0
+        lines.append(
+            f"{name[:24]:<24} {company['posts']:>6} {shares['positive']:>9.1%} {shares['neutral']:>8.1%} "
+            f"{shares['negative']:>9.1%} {net:>+6.2f}  {top_feature} / {top_issue}"
+        )
+    return "\n".join(lines)
+
+def parse_arguments(argv=None):
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description='Compare the LinkedIn sentiment of several companies')
+    
+    parser.add_argument('companies', nargs='+', help='Names of the companies to compare')
+    parser.add_argument('--posts', type=int, default=30, help='Number of posts to analyze per company')
+    parser.add_argument('--concurrency', type=int, default=3,
+                        help='Number of companies whose posts are collected at once, each in its own browser')
+    parser.add_argument('--use-mock-data', action='store_true',
+                        help='Use generated posts instead of scraping LinkedIn')
+    parser.add_argument('--output', default=None, help='JSON file to save the full comparison to')
+    
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    """Compare companies from the command line, printing a summary table."""
+    args = parse_arguments(argv)
+    if args.use_mock_data:
+        # Read by the app when it is imported
+        os.environ['DATA_SOURCE'] = 'mock'
+    
+    from linkedin_sentiment_ui import compare_companies
+    comparison = compare_companies(args.companies, args.posts, concurrency=args.concurrency)
+    
+    print(format_table(comparison))
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(comparison, f, indent=2)
+        print(f"\nFull comparison saved to {args.output}")
+    return comparison
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
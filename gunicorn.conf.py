@@ -0,0 +1,36 @@
+import os
+
+from src.sentiment_analysis.preload import preload_models, post_fork_worker, process_memory
+
+# Gunicorn reads this file from the working directory. With preloading, the
+# app and its models are loaded once in the master and the workers share the
+# weights copy-on-write instead of loading a copy each.
+preload_app = os.environ.get("GUNICORN_PRELOAD", "1").lower() in ("1", "true", "yes")
+
+# Progress streams are long requests. Threaded workers serve them without
+# tying up a whole process, and keep telling the master they are alive
+# while they do, so that streaming workers are not killed as stuck.
+worker_class = os.environ.get("GUNICORN_WORKER_CLASS", "gthread")
+threads = int(os.environ.get("GUNICORN_THREADS", 8))
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", 60))
+
+def model_threads(server):
+    """Split the CPU cores between the workers for the emotion model's intra-op threads."""
+    return max(1, (os.cpu_count() or 1) // server.cfg.workers)
+
+def when_ready(server):
+    """Load the models in the master, before the workers are forked."""
+    if preload_app:
+        from linkedin_sentiment_ui import EMOTION_ANALYSIS
+        preload_models(emotion_analysis=EMOTION_ANALYSIS, threads=model_threads(server))
+
+def post_fork(server, worker):
+    """Give each worker its own thread pool."""
+    post_fork_worker(model_threads(server))
+
+def post_worker_init(worker):
+    """Log how much memory the worker does not share with the others."""
+    memory = process_memory(os.getpid())
+    if memory:
+        worker.log.info(f"Worker {os.getpid()} memory: RSS {memory['rss'] / 2 ** 20:.1f} MB, "
+                        f"unique {memory['uss'] / 2 ** 20:.1f} MB, shared {memory['shared'] / 2 ** 20:.1f} MB")
@@ -0,0 +1,119 @@
+import os
+import json
+from functools import lru_cache
+
+from keyword_matching import KeywordMatcher, compile_keywords
+
+# Version of the taxonomy file format this module reads
+TAXONOMY_VERSION = 1
+
+# The taxonomy file shipped with the app, and the environment variable overriding it
+DEFAULT_TAXONOMY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "industry_taxonomy.json")
+TAXONOMY_ENV = "INDUSTRY_TAXONOMY"
+
+class Industry:
+    """
+    Everything the app knows about one industry.
+    
+    Attributes:
+        name: The industry's key in the taxonomy, e.g. "fintech"
+        name_terms: Terms of company names that identify the industry
+        strengths: The conclusion's strengths when sentiment is mostly
+            "positive" and otherwise ("negative")
+        priority_areas: The report page's priority areas, each with an
+            "icon", a "title" and "items"
+        feature_keywords: Keywords of each feature, looked up in positive posts
+        issue_keywords: Keywords of each issue, looked up in negative posts
+        reviews: Material of generate_company_reviews: the "positive_share"
+            and "neutral_share" of posts, review "features" and "issues",
+            post "templates" of each sentiment and specific "posts"
+    
+    The attributes are shared by every request and must not be modified.
+    """
+    
+    def __init__(self, name, spec):
+        """
+        Initialize an industry from its taxonomy entry.
+        
+        Args:
+            name: The industry's key in the taxonomy
+            spec: The industry's entry in the taxonomy file
+        """
+        self.name = name
+        self.name_terms = spec.get("name_terms", [])
+        self.strengths = spec["strengths"]
+        self.priority_areas = spec["priority_areas"]
+        self.feature_keywords = spec["feature_keywords"]
+        self.issue_keywords = spec["issue_keywords"]
+        self.reviews = spec["reviews"]
+        self._recommendations = spec["recommendations"]
+        
+        # Compile the keyword matchers now, so that requests find them cached
+        compile_keywords(self.feature_keywords)
+        compile_keywords(self.issue_keywords)
+    
+    def recommendations(self, company_name):
+        """Return the report's recommendations for a company of the industry."""
+        return [recommendation.replace("{company_name}", company_name) for recommendation in self._recommendations]
+    
+    def strength(self, sentiments):
+        """Return the strengths the conclusion focuses on, given the sentiment counts."""
+        return self.strengths["positive" if sentiments["positive"] > sentiments["negative"] else "negative"]
+
+class Taxonomy:
+    """
+    The industries of a taxonomy file, compiled for lookups.
+    
+    The file holds a "version", the "industries" in the order company names
+    are matched against them, the "default_industry" of names matching none,
+    and a "generic" entry for industries missing from the file. The generic
+    entry takes the fields it does not define from the industry it is "like".
+    """
+    
+    def __init__(self, document):
+        """
+        Compile a parsed taxonomy file.
+        
+        Args:
+            document: The parsed taxonomy file
+        
+        Raises:
+            ValueError: If the file's version is not supported
+        """
+        self.version = document.get("version")
+        if self.version != TAXONOMY_VERSION:
+            raise ValueError(f"Unsupported taxonomy version {self.version}, expected {TAXONOMY_VERSION}")
+        
+        self.industries = {name: Industry(name, spec) for name, spec in document["industries"].items()}
+        self.default_industry = document["default_industry"]
+        
+        generic = dict(document["generic"])
+        like = document["industries"][generic.pop("like")]
+        generic["reviews"] = {**like["reviews"], **generic.get("reviews", {})}
+        self.generic = Industry("generic", {**like, "name_terms": [], **generic})
+        
+        self._name_matcher = KeywordMatcher({name: industry.name_terms for name, industry in self.industries.items()})
+    
+    def classify(self, company_name):
+        """Return the name of the first industry with a term in the company name, or the default industry."""
+        matches = self._name_matcher.topics_in(company_name)
+        return matches[0] if matches else self.default_industry
+    
+    def industry(self, name):
+        """Return an industry by name, or the generic industry if the taxonomy does not have it."""
+        return self.industries.get(name, self.generic)
+
+def load_taxonomy(path=DEFAULT_TAXONOMY_PATH):
+    """Parse and compile a taxonomy file."""
+    with open(path, encoding="utf-8") as f:
+        return Taxonomy(json.load(f))
+
+@lru_cache(maxsize=None)
+def get_taxonomy():
+    """Return the taxonomy of this process, loading it on first use from $INDUSTRY_TAXONOMY or the shipped file."""
+    return load_taxonomy(os.environ.get(TAXONOMY_ENV) or DEFAULT_TAXONOMY_PATH)
+
+@lru_cache(maxsize=1024)
+def classify_company(company_name):
+    """Return the industry of a company from its name, remembering the names seen."""
+    return get_taxonomy().classify(company_name)
@@ -0,0 +1,125 @@
+import gzip
+import json
+import hashlib
+
+from flask import Response
+
+# Brotli is optional: without it responses are gzip-compressed only
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Bodies smaller than this are sent as they are, compression would barely shrink them
+MIN_COMPRESS_SIZE = 512
+
+def compact_post(post):
+    """Return the fields of a sample post the API exposes."""
+    return {
+        'author': post.get('author', ''),
+        'date': post.get('date', ''),
+        'text': post.get('text', ''),
+        'url': post.get('url', ''),
+        'score': round(post.get('compound_score', 0), 4)
+    }
+
+def compact_report(result):
+    """
+    Return the API payload of a run_analysis result.
+    
+    The payload has the same sentiments, monthly trend, top features and
+    issues and sample posts as the report page, without the report text
+    and the chart placeholders. Features and issues are [name, mentions]
+    pairs, most mentioned first.
+    
+    Args:
+        result: The report data of an analysis
+    
+    Returns:
+        A JSON-serializable dictionary
+    """
+    chart_data = result['chart_data']
+    trend = chart_data['sentiment_trend']
+    
+    payload = {
+        'company': result['company_name'],
+        'industry': result['company_type'],
+        'source': result['data_source'],
+        'requested_posts': result['post_count'],
+        'posts': sum(result['sentiments'].values()),
+        'date_range': result['date_range'],
+        'sentiments': result['sentiments'],
+        'trend': {
+            'months': trend['labels'],
+            'positive': trend['positive'],
+            'neutral': trend['neutral'],
+            'negative': trend['negative']
+        },
+        # Charts show a placeholder bar with no mentions when there are none
+        'features': [[label, count] for label, count in zip(chart_data['top_features']['labels'],
+                                                            chart_data['top_features']['values']) if count],
+        'issues': [[label, count] for label, count in zip(chart_data['top_issues']['labels'],
+                                                          chart_data['top_issues']['values']) if count],
+        'samples': {
+            'positive': [compact_post(post) for post in result['sample_posts']['positive']],
+            'negative': [compact_post(post) for post in result['sample_posts']['negative']]
+        }
+    }
+    
+    if 'emotion_distribution' in chart_data:
+        emotions = chart_data['emotion_distribution']
+        payload['emotions'] = dict(zip(emotions['labels'], emotions['values']))
+    return payload
+
+def negotiate_encoding(request):
+    """Return the best content coding the client accepts among those available, or None for identity."""
+    available = ['br', 'gzip'] if brotli is not None else ['gzip']
+    return request.accept_encodings.best_match(available)
+
+def compress(body, encoding):
+    """Compress a body with a content coding returned by negotiate_encoding."""
+    if encoding == 'br':
+        # A middle quality: the top ones are far slower for little gain on JSON
+        return brotli.compress(body, quality=5)
+    # mtime=0 keeps the output identical for identical bodies
+    return gzip.compress(body, compresslevel=6, mtime=0)
+
+def json_response(payload, request):
+    """
+    Return a JSON response supporting conditional GETs and compression.
+    
+    The body is serialized canonically, so that identical payloads always
+    produce identical bytes, and the strong ETag is a hash of those bytes.
+    Each content coding is a different representation, so its ETag gets
+    the coding as a suffix. A request whose If-None-Match lists the ETag
+    gets an empty 304 response, without the body being compressed.
+    
+    Args:
+        payload: A JSON-serializable value
+        request: The request being answered
+    
+    Returns:
+        A Flask response
+    """
+    body = json.dumps(payload, separators=(',', ':'), sort_keys=True, ensure_ascii=False).encode('utf-8')
+    encoding = negotiate_encoding(request) if len(body) >= MIN_COMPRESS_SIZE else None
+    
+    etag = hashlib.sha256(body).hexdigest()[:32]
+    if encoding is not None:
+        etag += '-' + encoding
+    
+    response = Response(mimetype='application/json')
+    response.set_etag(etag)
+    response.headers['Vary'] = 'Accept-Encoding'
+    # Clients may keep the response but must check that it is still current
+    response.headers['Cache-Control'] = 'no-cache'
+    
+    if request.method in ('GET', 'HEAD') and request.if_none_match.contains_weak(etag):
+        response.status_code = 304
+        return response
+    
+    if encoding is not None:
+        body = compress(body, encoding)
+        response.headers['Content-Encoding'] = encoding
+    response.set_data(body)
+    return response
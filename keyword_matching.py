@@ -0,0 +1,101 @@
+import re
+from collections import namedtuple
+from functools import lru_cache
+
+# One keyword found in a text: its span in the lowercased text, the keyword and its topic
+KeywordMatch = namedtuple("KeywordMatch", ["start", "end", "keyword", "topic"])
+
+class KeywordMatcher:
+    """
+    Find the keywords of many topics in a text in one regex pass.
+    
+    Matching is by substring on the lowercased text, like checking
+    `keyword in text.lower()` for every keyword, but all keywords are
+    compiled into one alternation that the regex engine scans for in C.
+    After each match the scan resumes at the next character, so overlapping
+    keywords are all found: at each position the longest keyword matches,
+    and the keywords that are prefixes of it match there too.
+    """
+    
+    def __init__(self, keywords_by_topic):
+        """
+        Compile the keywords.
+        
+        Args:
+            keywords_by_topic: Lowercase keywords of each topic, e.g. the
+                keywords of each feature of an industry
+        """
+        self.topics = list(keywords_by_topic)
+        self._topic_order = {topic: i for i, topic in enumerate(self.topics)}
+        
+        # Topics of each keyword, in topic order
+        topics_of = {}
+        for topic, keywords in keywords_by_topic.items():
+            for keyword in keywords:
+                topics = topics_of.setdefault(keyword, [])
+                if topic not in topics:
+                    topics.append(topic)
+        
+        # Every keyword matching where a longer keyword matches is one of its prefixes
+        keywords = sorted(topics_of, key=len, reverse=True)
+        self._hits = {
+            keyword: [(prefix, topic) for prefix in keywords if keyword.startswith(prefix) for topic in topics_of[prefix]]
+            for keyword in keywords
+        }
+        self._topics_at = {keyword: {topic for _, topic in hits} for keyword, hits in self._hits.items()}
+        self._pattern = re.compile("|".join(re.escape(keyword) for keyword in keywords)) if keywords else None
+    
+    def _matches(self, text):
+        """Yield the start and the longest keyword of every position where a keyword starts."""
+        search = self._pattern.search
+        match = search(text)
+        while match is not None:
+            yield match.start(), match.group()
+            # Search again from the next position, so that overlapping keywords are found
+            match = search(text, match.start() + 1)
+    
+    def find(self, text):
+        """
+        Find every keyword occurrence in a text.
+        
+        Args:
+            text: The text to search
+        
+        Returns:
+            A KeywordMatch per occurrence and topic, ordered by position.
+            Positions index the lowercased text, which has the same length
+            as the text except for a few non-ASCII characters.
+        """
+        if self._pattern is None:
+            return []
+        
+        return [
+            KeywordMatch(start, start + len(keyword), keyword, topic)
+            for start, longest in self._matches(text.lower())
+            for keyword, topic in self._hits[longest]
+        ]
+    
+    def topics_in(self, text):
+        """Return the topics with a keyword in the text, in the order the topics were given."""
+        if self._pattern is None:
+            return []
+        
+        text = text.lower()
+        search = self._pattern.search
+        match = search(text)
+        if match is None:
+            return []
+        
+        found = set()
+        while match is not None:
+            found.update(self._topics_at[match.group()])
+            match = search(text, match.start() + 1)
+        return sorted(found, key=self._topic_order.__getitem__)
+
+@lru_cache(maxsize=64)
+def _compile(frozen_keywords):
+    return KeywordMatcher({topic: list(keywords) for topic, keywords in frozen_keywords})
+
+def compile_keywords(keywords_by_topic):
+    """Return the matcher of a taxonomy, compiling it only the first time it is seen."""
+    return _compile(tuple((topic, tuple(keywords)) for topic, keywords in keywords_by_topic.items()))
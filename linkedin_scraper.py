@@ -7,6 +7,7 @@ import time
 import random
 import logging
 import datetime
+import threading
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
@@ -19,6 +20,11 @@ from bs4 import BeautifulSoup
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+def report_progress(progress, stage, new_posts=0):
+    """Tell a progress callback, if any, the scraping stage reached and the number of posts just extracted."""
+    if progress is not None:
+        progress(stage, new_posts)
+
 def setup_driver():
     """Set up and return a configured Chrome WebDriver."""
     options = Options()
@@ -89,6 +95,104 @@ def login_to_linkedin(driver, username, password):
         logging.error(f"Error during login: {str(e)}")
         return False
 
+class BrowserPool:
+    """
+    Share logged-in browsers between the scrapes of several companies.
+    
+    Up to size browsers are started, each on first need, and logged in
+    once; a scrape borrows one and gives it back when done, so that a run
+    over many companies pays for starting Chrome and logging in once per
+    browser rather than once per company. A failed login is not retried:
+    once one fails, scrapes finding no idle browser fall back to mock data
+    right away.
+    """
+    
+    def __init__(self, size=2, username=None, password=None):
+        """
+        Initialize the pool without starting any browser.
+        
+        Args:
+            size: Maximum number of browsers running at once
+            username: LinkedIn username, LINKEDIN_USERNAME by default
+            password: LinkedIn password, LINKEDIN_PASSWORD by default
+        """
+        self.size = size
+        self.username = username or os.environ.get('LINKEDIN_USERNAME')
+        self.password = password or os.environ.get('LINKEDIN_PASSWORD')
+        self.login_failed = False
+        # Browsers logged in and not borrowed, and all browsers running
+        self._idle = []
+        self._drivers = []
+        self._starting = 0
+        self._available = threading.Condition()
+    
+    def acquire(self):
+        """
+        Borrow a logged-in browser, waiting for one if size are in use.
+        
+        Returns:
+            The driver, or None if logging in failed
+        """
+        with self._available:
+            while True:
+                if self._idle:
+                    return self._idle.pop()
+                if self.login_failed:
+                    return None
+                if len(self._drivers) + self._starting < self.size:
+                    self._starting += 1
+                    break
+                self._available.wait()
+        
+        # Start the browser outside the lock, other scrapes go on meanwhile
+        driver = None
+        try:
+            driver = setup_driver()
+            logged_in = login_to_linkedin(driver, self.username, self.password)
+        except Exception as e:
+            logging.error(f"Error starting a browser: {str(e)}")
+            logged_in = False
+        
+        with self._available:
+            self._starting -= 1
+            if logged_in:
+                self._drivers.append(driver)
+            else:
+                self.login_failed = True
+                # Waiting scrapes fall back to mock data too
+                self._available.notify_all()
+        
+        if not logged_in and driver:
+            driver.quit()
+        return driver if logged_in else None
+    
+    def release(self, driver, healthy=True):
+        """Give a borrowed browser back, or quit it if it was left in an unknown state."""
+        with self._available:
+            if healthy:
+                self._idle.append(driver)
+            else:
+                # Frees a slot for a new browser
+                self._drivers.remove(driver)
+            self._available.notify()
+        
+        if not healthy:
+            try:
+                driver.quit()
+            except Exception as e:
+                logging.error(f"Error closing a browser: {str(e)}")
+    
+    def close(self):
+        """Quit every browser started by the pool."""
+        with self._available:
+            drivers, self._drivers = self._drivers, []
+            self._idle = []
+        for driver in drivers:
+            try:
+                driver.quit()
+            except Exception as e:
+                logging.error(f"Error closing a browser: {str(e)}")
+
 def search_company(driver, company_name):
     """Search for a company on LinkedIn and return its URL."""
     try:
@@ -116,7 +220,7 @@ def search_company(driver, company_name):
         logging.error(f"Error searching for company: {str(e)}")
         return None
 
-def get_company_posts(driver, company_url, limit=5):
+def get_company_posts(driver, company_url, limit=5, progress=None):
     """Get posts from a company's LinkedIn page."""
     if not company_url:
         return []
@@ -137,6 +241,7 @@ def get_company_posts(driver, company_url, limit=5):
             logging.warning("Could not find Posts tab, using default page")
         
         # Scroll a few times to load more posts
+        report_progress(progress, "scroll")
         for _ in range(3):
             driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
             time.sleep(random.uniform(1, 2))
@@ -192,6 +297,7 @@ def get_company_posts(driver, company_url, limit=5):
                     "author": company_name,
                     "url": url
                 })
+                report_progress(progress, "extract", 1)
                 
             except Exception as e:
                 logging.warning(f"Error extracting post: {str(e)}")
@@ -202,7 +308,7 @@ def get_company_posts(driver, company_url, limit=5):
         logging.error(f"Error getting company posts: {str(e)}")
         return []
 
-def scrape_public_posts(driver, company_name, limit=10):
+def scrape_public_posts(driver, company_name, limit=10, progress=None):
     """Find and scrape posts from LinkedIn users mentioning the company."""
     posts = []
     
@@ -213,6 +319,7 @@ def scrape_public_posts(driver, company_name, limit=10):
         time.sleep(random.uniform(3, 5))
         
         # Scroll a few times to load more posts
+        report_progress(progress, "scroll")
         for _ in range(2):
             driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
             time.sleep(random.uniform(1, 2))
@@ -267,6 +374,7 @@ def scrape_public_posts(driver, company_name, limit=10):
                     "author": author,
                     "url": url
                 })
+                report_progress(progress, "extract", 1)
                 
             except Exception as e:
                 logging.warning(f"Error extracting public post: {str(e)}")
@@ -307,25 +415,44 @@ def convert_linkedin_date(date_text):
     except:
         return today.strftime("%Y-%m-%d")
 
-def scrape_linkedin_for_company(company_name, post_limit=10, use_mock_data=False):
-    """Main function to scrape LinkedIn posts for a specific company."""
+def scrape_linkedin_for_company(company_name, post_limit=10, use_mock_data=False, progress=None, browsers=None):
+    """
+    Main function to scrape LinkedIn posts for a specific company.
+    
+    progress, if given, is called with each stage reached ("login",
+    "search", "scroll", "extract") and the number of posts just extracted.
+    With a BrowserPool as browsers, a logged-in browser is borrowed from
+    it instead of starting and logging in a new one.
+    
+    Returns:
+        The posts, and whether they were all scraped from LinkedIn: False
+        if use_mock_data is set or if scraping fell back to (or was topped
+        up with) generated posts
+    """
     if use_mock_data:
         # Import and use the mock data generator
         from linkedin_sentiment_analysis import generate_company_reviews
         posts = generate_company_reviews(company_name, post_limit)
-        return posts, True
+        return posts, False
     
     posts = []
     driver = None
+    healthy = True
     
     try:
-        driver = setup_driver()
-        
-        # Log in to LinkedIn
-        username = os.environ.get('LINKEDIN_USERNAME')
-        password = os.environ.get('LINKEDIN_PASSWORD')
-        
-        login_successful = login_to_linkedin(driver, username, password)
+        if browsers is not None:
+            report_progress(progress, "login")
+            driver = browsers.acquire()
+            login_successful = driver is not None
+        else:
+            driver = setup_driver()
+            
+            # Log in to LinkedIn
+            report_progress(progress, "login")
+            username = os.environ.get('LINKEDIN_USERNAME')
+            password = os.environ.get('LINKEDIN_PASSWORD')
+            
+            login_successful = login_to_linkedin(driver, username, password)
         
         if not login_successful:
             logging.warning("Login failed, falling back to mock data")
@@ -334,15 +461,17 @@ def scrape_linkedin_for_company(company_name, post_limit=10, use_mock_data=False
             return posts, False
         
         # Find the company page
+        report_progress(progress, "search")
         company_url = search_company(driver, company_name)
         
         # Get posts from the company page
-        company_posts = get_company_posts(driver, company_url, limit=post_limit//2)
+        company_posts = get_company_posts(driver, company_url, limit=post_limit//2, progress=progress)
         posts.extend(company_posts)
         
         # Get public posts mentioning the company
         if len(posts) < post_limit:
-            public_posts = scrape_public_posts(driver, company_name, limit=post_limit-len(posts))
+            report_progress(progress, "search")
+            public_posts = scrape_public_posts(driver, company_name, limit=post_limit-len(posts), progress=progress)
             posts.extend(public_posts)
         
         logging.info(f"Successfully scraped {len(posts)} LinkedIn posts for {company_name}")
@@ -358,6 +487,7 @@ def scrape_linkedin_for_company(company_name, post_limit=10, use_mock_data=False
         return posts, True
         
     except Exception as e:
+        healthy = False
         logging.error(f"Error in LinkedIn scraping: {str(e)}")
         # Fall back to mock data
         logging.warning("Error occurred, falling back to mock data")
@@ -366,7 +496,9 @@ def scrape_linkedin_for_company(company_name, post_limit=10, use_mock_data=False
         return posts, False
         
     finally:
-        if driver:
+        if driver and browsers is not None:
+            browsers.release(driver, healthy)
+        elif driver:
             driver.quit()
 
 if __name__ == "__main__":
@@ -1,15 +1,68 @@
 import flask
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, Response, render_template, request, jsonify, url_for, redirect, stream_with_context
 import os
 import datetime
 import json
+import time
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 
 # Import our modules
 from linkedin_sentiment_analysis import analyze_sentiment, generate_report, generate_company_reviews
-from linkedin_scraper import scrape_linkedin_for_company
+from linkedin_scraper import scrape_linkedin_for_company, BrowserPool
+from src.sentiment_analysis.service import get_inference_client
+from report_aggregation import ReportAggregator
+from industry_taxonomy import classify_company, get_taxonomy
+from analysis_jobs import JobStore, JobQueue, QUEUED, DONE, FAILED
+from result_cache import ResultCache, make_key
+from single_flight import SingleFlight
+from analysis_progress import AnalysisProgress
+from json_api import compact_report, json_response
+from company_comparison import side_by_side
 
 app = Flask(__name__, template_folder='templates')
 
+# Parse and compile the industry taxonomy once, before gunicorn forks the workers
+get_taxonomy()
+
+# Emotion analysis loads the transformer model, so it is opt-in
+EMOTION_ANALYSIS = os.environ.get("EMOTION_ANALYSIS", "").lower() in ("1", "true", "yes")
+
+# Where posts come from: "linkedin" scrapes LinkedIn (falling back to generated
+# posts), "mock" only generates posts
+DATA_SOURCE = os.environ.get("DATA_SOURCE", "linkedin")
+
+# Posts analyzed between two progress reports of a tracked analysis
+PROGRESS_CHUNK_SIZE = 10
+
+# Seconds between two looks at a job's progress while streaming it
+PROGRESS_POLL_INTERVAL = 0.5
+
+# Seconds a progress stream stays open before it ends and the browser
+# reconnects, so that no stream holds a server thread for a whole analysis;
+# keep it well under gunicorn's worker timeout
+EVENT_STREAM_MAX_SECONDS = float(os.environ.get("EVENT_STREAM_MAX_SECONDS", 20))
+
+# Milliseconds the browser waits before reconnecting to an ended stream
+EVENT_STREAM_RETRY_MS = 1000
+
+# Companies whose posts a comparison collects at once, each in its own browser
+COMPARE_CONCURRENCY = int(os.environ.get("COMPARE_CONCURRENCY", 3))
+
+# Companies a comparison request may ask for
+MAX_COMPARE_COMPANIES = 10
+
+# Posts an analysis request may ask for, per company
+MAX_POST_COUNT = 500
+
+# Analyses run at once by each process's job queue
+JOB_WORKERS = int(os.environ.get("JOB_WORKERS", 2))
+
+def inference_client():
+    """Return the client of this process's shared inference service, or None without emotion analysis."""
+    return get_inference_client(timeout=60) if EMOTION_ANALYSIS else None
+
 # Add the datetime.now function to templates
 @app.context_processor
 def inject_now():
@@ -20,451 +73,506 @@ def index():
     """Render the main page."""
     return render_template('index.html')
 
-@app.route('/analyze', methods=['POST'])
-def analyze():
-    """Generate sentiment analysis report based on form data and real LinkedIn scraping."""
-    company_name = request.form.get('company_name', 'Company')
-    post_count = int(request.form.get('post_count', 30))
-    
+def run_analysis(company_name, post_count, progress=None, browsers=None):
+    """
+    Collect, analyze and report on a company's posts.
+    
+    Args:
+        company_name: The company to analyze
+        post_count: Number of posts to collect
+        progress: An AnalysisProgress told about each stage and the
+            running sentiment counts, if given
+        browsers: A BrowserPool to borrow a browser from, if given
+    
+    Returns:
+        The data of the report page, JSON-serializable
+    """
+    posts, data_source = collect_posts(company_name, post_count, progress, browsers)
+    return build_report(company_name, post_count, posts, data_source, progress)
+
+def collect_posts(company_name, post_count, progress=None, browsers=None):
+    """
+    Collect a company's posts, scraping LinkedIn unless DATA_SOURCE is "mock".
+    
+    Args:
+        company_name: The company to analyze
+        post_count: Number of posts to collect
+        progress: An AnalysisProgress told about each stage, if given
+        browsers: A BrowserPool to borrow a browser from, if given
+    
+    Returns:
+        The posts and a description of where they come from
+    """
     # First attempt to scrape real LinkedIn data for the company
     try:
         # This will try to scrape LinkedIn, and fall back to mock data if needed
-        posts, is_mock_data = scrape_linkedin_for_company(company_name, post_count, use_mock_data=False)
-        data_source = "LinkedIn" if not is_mock_data else "generated mock data"
+        posts, real_data = scrape_linkedin_for_company(company_name, post_count, use_mock_data=DATA_SOURCE == "mock",
+                                                       progress=progress, browsers=browsers)
+        if real_data:
+            data_source = "LinkedIn"
+        elif DATA_SOURCE == "mock":
+            data_source = "generated mock data"
+        else:
+            # The scraper fell back to generated posts
+            data_source = "generated mock data (scraping failed)"
     except Exception as e:
         # If anything goes wrong, fall back to mock data
         posts = generate_company_reviews(company_name, post_count)
         data_source = "generated mock data (scraping failed)"
     
-    # Sort posts by date to find newest and oldest
-    sorted_by_date = sorted(posts, key=lambda x: x.get("date", ""), reverse=True)
-    newest_date = sorted_by_date[0]["date"] if sorted_by_date else "Unknown"
-    oldest_date = sorted_by_date[-1]["date"] if sorted_by_date else "Unknown"
-    
-    # Analyze sentiment
-    analyzed_posts = analyze_sentiment(posts)
+    if progress is not None:
+        progress.collected(posts)
+    return posts, data_source
+
+def build_report(company_name, post_count, posts, data_source, progress=None):
+    """
+    Analyze a company's collected posts and build the data of its report page.
+    
+    Args:
+        company_name: The company analyzed
+        post_count: Number of posts requested
+        posts: The collected posts
+        data_source: Where the posts come from
+        progress: An AnalysisProgress told about the running sentiment
+            counts, if given
+    
+    Returns:
+        The data of the report page, JSON-serializable
+    """
+    # Determine company type based on name
+    company_type = classify_company(company_name)
+    industry = get_taxonomy().industry(company_type)
+    
+    # Analyze sentiment, and count sentiments, monthly trend, sample posts and
+    # features/issues in the same pass. With a progress tracker the posts
+    # are analyzed in chunks so that the running counts can be reported.
+    aggregate = ReportAggregator(industry.feature_keywords, industry.issue_keywords)
+    chunk_size = PROGRESS_CHUNK_SIZE if progress is not None else max(len(posts), 1)
+    analyzed_posts = []
+    for start in range(0, len(posts), chunk_size):
+        analyzed_chunk = analyze_sentiment(posts[start:start + chunk_size], client=inference_client())
+        aggregate.update_many(analyzed_chunk)
+        analyzed_posts.extend(analyzed_chunk)
+        if progress is not None:
+            progress.analyzed(aggregate)
+    
+    if progress is not None:
+        progress.rendering()
+    
+    newest_date = aggregate.newest_date if aggregate.total_posts else "Unknown"
+    oldest_date = aggregate.oldest_date if aggregate.total_posts else "Unknown"
     
     # Generate report
-    report = generate_report(company_name, analyzed_posts, newest_date, oldest_date)
+    report = generate_report(company_name, analyzed_posts, newest_date, oldest_date, aggregate=aggregate)
     
-    # Count sentiments
-    sentiments = {"positive": 0, "neutral": 0, "negative": 0}
-    for post in analyzed_posts:
-        sentiments[post["sentiment"]] += 1
+    sentiments = aggregate.sentiment_counts
+    chart_data = aggregate.chart_data()
     
-    # Prepare data for charts
-    chart_data = {
-        'sentiment_distribution': {
-            'labels': ['Positive', 'Neutral', 'Negative'],
-            'values': [sentiments['positive'], sentiments['neutral'], sentiments['negative']]
-        }
-    }
-    
-    # Prepare monthly trend data if available
-    from collections import defaultdict
-    import datetime as dt
-    
-    month_sentiments = defaultdict(lambda: {"positive": 0, "neutral": 0, "negative": 0, "total": 0})
+    # Average emotion scores, if the posts went through the emotion model
+    emotion_totals = defaultdict(float)
+    emotion_posts = 0
     for post in analyzed_posts:
-        try:
-            post_date = dt.datetime.strptime(post["date"], "%Y-%m-%d")
-            month_key = f"{post_date.year}-{post_date.month:02d}"
-            month_sentiments[month_key][post["sentiment"]] += 1
-            month_sentiments[month_key]["total"] += 1
-        except:
-            pass  # Skip if date parsing fails
-    
-    # Convert to chart format
-    months = sorted(month_sentiments.keys())
-    trend_data = {
-        'labels': months,
-        'positive': [month_sentiments[m]['positive'] for m in months],
-        'neutral': [month_sentiments[m]['neutral'] for m in months],
-        'negative': [month_sentiments[m]['negative'] for m in months]
-    }
-    
-    chart_data['sentiment_trend'] = trend_data
-    
-    # Extract top features and issues
-    from collections import Counter
-    
-    # Determine company type based on name
-    company_type = "fintech"  # Default assumption
-    company_name_lower = company_name.lower()
-    
-    if any(term in company_name_lower for term in ["bank", "finance", "fi", "pay", "money", "wealth", "invest"]):
-        company_type = "fintech"
-    elif any(term in company_name_lower for term in ["tech", "software", "app", "digital", "ai", "data", "microsoft", "apple", "google"]):
-        company_type = "tech"
-    elif any(term in company_name_lower for term in ["food", "restaurant", "eat", "kitchen", "meal", "coffee", "cafe", "dining", "starbucks", "pizza", "zomato", "swiggy", "doordash", "uber eats"]):
-        company_type = "food"
-    elif any(term in company_name_lower for term in ["travel", "trip", "hotel", "flight", "vacation", "booking", "airbnb"]):
-        company_type = "travel"
-    elif any(term in company_name_lower for term in ["retail", "shop", "store", "market", "mall", "mart", "amazon", "walmart"]):
-        company_type = "retail"
-    
-    print(f"DEBUG: Detected company_type='{company_type}' for company_name='{company_name}'")
-    
-    # Industry-specific feature and issue extraction
-    positive_features_mentioned = []
-    negative_issues_mentioned = []
-    
-    # Define keywords for different industries
-    feature_keywords = {
-        "fintech": {
-            "zero forex markup": ["forex", "international", "currency", "exchange rate"],
-            "smart deposit features": ["smart deposit", "savings", "interest", "fd", "rd"],
-            "user interface": ["interface", "ui", "ux", "user experience", "design"],
-            "customer service": ["customer service", "support", "help", "assistance"],
-            "ATM benefits": ["atm", "withdraw", "cash"],
-            "interest rates": ["interest", "rate", "return"],
-            "quick KYC process": ["kyc", "verification", "onboarding"]
-        },
-        "tech": {
-            "user interface": ["interface", "ui", "ux", "user experience", "design"],
-            "performance": ["fast", "performance", "speed", "responsive"],
-            "feature updates": ["update", "feature", "new"],
-            "cross-platform": ["platform", "cross-platform", "device"],
-            "data security": ["security", "privacy", "data", "encryption"],
-            "customer support": ["support", "help", "service", "assistance"],
-            "documentation": ["documentation", "guide", "tutorial"]
-        },
-        "food": {
-            "taste quality": ["delicious", "tasty", "flavor", "taste"],
-            "delivery speed": ["delivery", "quick", "fast", "on time"],
-            "freshness": ["fresh", "quality", "ingredients"],
-            "value for money": ["price", "value", "worth", "affordable"],
-            "portion size": ["portion", "size", "quantity", "amount"],
-            "menu variety": ["menu", "variety", "options", "selection"],
-            "customer service": ["service", "staff", "waiter", "waitress"]
-        },
-        "travel": {
-            "booking experience": ["booking", "reservation", "easy"],
-            "pricing transparency": ["price", "fee", "transparent", "hidden"],
-            "customer support": ["support", "service", "help", "assistance"],
-            "accommodation quality": ["hotel", "stay", "room", "accommodation"],
-            "cancellation policy": ["cancel", "refund", "policy", "flexible"],
-            "loyalty program": ["loyalty", "rewards", "points", "miles"],
-            "travel planning": ["planning", "itinerary", "schedule"]
-        },
-        "retail": {
-            "product quality": ["quality", "product", "well-made", "durable"],
-            "shipping speed": ["shipping", "delivery", "fast", "quick"],
-            "return policy": ["return", "refund", "exchange", "policy"],
-            "customer service": ["service", "support", "help", "assistance"],
-            "website usability": ["website", "site", "online", "interface"],
-            "product selection": ["selection", "variety", "range", "options"],
-            "pricing": ["price", "affordable", "value", "discount"]
+        if post.get("emotions"):
+            emotion_posts += 1
+            for emotion, score in post["emotions"].items():
+                emotion_totals[emotion] += score
+    
+    if emotion_posts:
+        emotions = sorted(emotion_totals)
+        chart_data['emotion_distribution'] = {
+            'labels': [emotion.title() for emotion in emotions],
+            'values': [round(emotion_totals[emotion] / emotion_posts, 4) for emotion in emotions]
         }
+    
+    sample_posts = {
+        'positive': aggregate.most_positive(),
+        'negative': aggregate.most_negative()
     }
     
-    issue_keywords = {
-        "fintech": {
-            "customer service": ["customer service", "support", "wait time", "unresponsive"],
-            "app stability": ["crash", "bug", "freeze", "not working", "issue", "problem"],
-            "KYC process": ["kyc", "verification", "document", "reject"],
-            "transaction issues": ["transaction", "payment", "fail", "error", "decline"],
-            "notification system": ["notification", "alert", "notify", "miss"]
-        },
-        "tech": {
-            "app crashes": ["crash", "freeze", "unresponsive", "hang"],
-            "poor performance": ["slow", "lag", "performance", "battery"],
-            "missing features": ["missing", "lack", "need", "without"],
-            "poor support": ["support", "service", "help", "unresponsive"],
-            "user interface issues": ["confusing", "complex", "difficult", "hard to use"]
-        },
-        "food": {
-            "late delivery": ["late", "slow", "delay", "wait"],
-            "incorrect orders": ["wrong", "mistake", "incorrect", "missing"],
-            "food quality": ["cold", "stale", "quality", "bad", "taste"],
-            "high prices": ["expensive", "overpriced", "cost", "price"],
-            "small portions": ["small", "tiny", "portion", "size"]
-        },
-        "travel": {
-            "hidden fees": ["hidden", "fee", "extra", "charge", "unexpected"],
-            "cancellation issues": ["cancel", "refund", "policy", "difficult"],
-            "poor customer service": ["service", "support", "unhelpful", "unresponsive"],
-            "inaccurate listings": ["inaccurate", "misleading", "not as advertised", "different"],
-            "booking problems": ["booking", "reservation", "problem", "error", "mistake"]
-        },
-        "retail": {
-            "shipping delays": ["delay", "late", "shipping", "delivery"],
-            "product quality": ["quality", "poor", "cheap", "break", "damage"],
-            "customer service": ["service", "support", "unhelpful", "unresponsive"],
-            "return difficulties": ["return", "refund", "difficult", "policy", "hassle"],
-            "website issues": ["website", "site", "error", "crash", "problem"]
+    return {
+        'company_name': company_name,
+        'report': report,
+        'post_count': post_count,
+        'date_range': f"{oldest_date} to {newest_date}",
+        'sentiments': sentiments,
+        'chart_data': chart_data,
+        'sample_posts': sample_posts,
+        'data_source': data_source,
+        'priority_areas': industry.priority_areas,
+        'company_type': company_type,
+        # Mentions of every feature and issue, for comparisons beyond the charts' top ones
+        'mentions': {
+            'features': dict(aggregate.feature_counts),
+            'issues': dict(aggregate.issue_counts)
         }
     }
-    
-    # Extract features and issues based on company type
-    current_feature_keywords = feature_keywords.get(company_type, feature_keywords["tech"])
-    current_issue_keywords = issue_keywords.get(company_type, issue_keywords["tech"])
-    
-    for post in analyzed_posts:
-        text = post["text"].lower()
-        
-        if post["sentiment"] == "positive":
-            for feature, keywords in current_feature_keywords.items():
-                if any(keyword in text for keyword in keywords):
-                    positive_features_mentioned.append(feature)
+
+# The result cache of this process, and the process that created it
+_result_cache = None
+_result_cache_pid = None
+_result_cache_lock = threading.Lock()
+
+def result_cache():
+    """Return this process's result cache, creating it on first use after any fork."""
+    global _result_cache, _result_cache_pid
+    with _result_cache_lock:
+        if _result_cache is None or _result_cache_pid != os.getpid():
+            _result_cache = ResultCache(
+                ttl_seconds=float(os.environ.get("RESULT_CACHE_TTL", 900)),
+                max_size_mb=float(os.environ.get("RESULT_CACHE_MB", 64)),
+                disk_path=os.environ.get("RESULT_CACHE_DB") or None
+            )
+            _result_cache_pid = os.getpid()
+        return _result_cache
+
+# Analyses running in this process, so that identical concurrent requests share one
+analysis_flights = SingleFlight()
+
+# Seconds a request waits for an identical analysis another request is running
+ANALYSIS_WAIT_TIMEOUT = float(os.environ.get("ANALYSIS_WAIT_TIMEOUT", 300))
+
+def cached_analysis(company_name, post_count, progress=None, browsers=None):
+    """
+    Return the report data of an analysis, reusing a recent result for the same company and post count.
+    
+    Concurrent requests for the same analysis wait for the first one's
+    result instead of scraping and analyzing again. A progress tracker, if
+    given, follows the analysis this request runs or waits for; a
+    BrowserPool, if given, lends the browser of the scrape it runs.
+    
+    Raises:
+        TimeoutError: If the identical analysis another request is running
+            takes longer than ANALYSIS_WAIT_TIMEOUT
+    """
+    cache = result_cache()
+    key = make_key(company_name, post_count, DATA_SOURCE)
+    result = cache.get(key)
+    
+    if result is None:
+        def compute():
+            # The previous flight may have stored the result since the cache was checked
+            result = cache.get(key, count_miss=False)
+            if result is not None:
+                return result
+            result = run_analysis(company_name, post_count, progress, browsers)
+            # Retry failed scrapes on the next request rather than serving their fallback data
+            if not result['data_source'].endswith("(scraping failed)"):
+                cache.put(key, result)
+            return result
         
-        elif post["sentiment"] == "negative":
-            for issue, keywords in current_issue_keywords.items():
-                if any(keyword in text for keyword in keywords):
-                    negative_issues_mentioned.append(issue)
+        if progress is not None and analysis_flights.in_flight(key):
+            progress.waiting()
+        result = analysis_flights.do(key, compute, timeout=ANALYSIS_WAIT_TIMEOUT)
     
-    # Count occurrences
-    positive_counts = Counter(positive_features_mentioned)
-    negative_counts = Counter(negative_issues_mentioned)
-    
-    # Get top features/issues
-    top_positive = positive_counts.most_common(3)
-    top_negative = negative_counts.most_common(3)
-    
-    # Handle empty results
-    if not top_positive:
-        top_positive = [("No specific features mentioned", 0)]
-    
-    if not top_negative:
-        top_negative = [("No specific issues mentioned", 0)]
-    
-    chart_data['top_features'] = {
-        'labels': [feature for feature, _ in top_positive],
-        'values': [count for _, count in top_positive]
-    }
+    if progress is not None:
+        progress.finished(result)
+    return result
+
+def compare_companies(company_names, post_count, concurrency=COMPARE_CONCURRENCY):
+    """
+    Analyze several companies together and compare them side by side.
+    
+    Each company goes through cached_analysis, so recent analyses are
+    reused and an analysis another request is running is waited for
+    rather than run twice. The others are run concurrently, at most
+    concurrency at a time, with browsers shared through one BrowserPool;
+    each company's posts are analyzed on their own, like a single
+    analysis's.
+    
+    Args:
+        company_names: The companies to compare; names differing only in
+            case and spacing are analyzed once
+        post_count: Number of posts to collect per company
+        concurrency: Number of companies analyzed at once
+    
+    Returns:
+        The comparison, see side_by_side
+    
+    Raises:
+        TimeoutError: If an identical analysis another request is running
+            takes longer than ANALYSIS_WAIT_TIMEOUT
+    """
+    companies = {}
+    for company_name in company_names:
+        companies.setdefault(make_key(company_name, post_count, DATA_SOURCE), company_name)
+    
+    # Browsers are only started once a scrape borrows one
+    browsers = BrowserPool(size=concurrency) if DATA_SOURCE != "mock" else None
+    try:
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="compare") as executor:
+            results = list(executor.map(
+                lambda company_name: cached_analysis(company_name, post_count, browsers=browsers), companies.values()
+            ))
+    finally:
+        if browsers is not None:
+            browsers.close()
+    
+    return side_by_side(results)
+
+def render_report(result):
+    """Render the report page of a run_analysis result."""
+    return render_template('report.html', **dict(result, chart_data=json.dumps(result['chart_data'])))
+
+def parse_post_count(value):
+    """
+    Read the post count of a request, given as a string or a number.
     
-    chart_data['top_issues'] = {
-        'labels': [issue for issue, _ in top_negative],
-        'values': [count for _, count in top_negative]
+    Raises:
+        ValueError: If it is not a whole number from 1 to MAX_POST_COUNT
+    """
+    try:
+        post_count = int(value)
+    except (TypeError, ValueError):
+        post_count = 0
+    if not 1 <= post_count <= MAX_POST_COUNT:
+        raise ValueError(f"post_count must be a whole number from 1 to {MAX_POST_COUNT}")
+    return post_count
+
+def analysis_params(form):
+    """
+    Read the company name and post count of an analysis request.
+    
+    Raises:
+        ValueError: If the post count is invalid, see parse_post_count
+    """
+    return form.get('company_name', 'Company'), parse_post_count(form.get('post_count', 30))
+
+@app.route('/analyze', methods=['POST'])
+def analyze():
+    """Generate sentiment analysis report based on form data and real LinkedIn scraping."""
+    try:
+        company_name, post_count = analysis_params(request.form)
+    except ValueError as e:
+        return str(e), 400
+    try:
+        return render_report(cached_analysis(company_name, post_count))
+    except TimeoutError as e:
+        return str(e), 504
+
+def run_analysis_job(params, publish_progress):
+    """Run the analysis of a queued job, publishing its progress."""
+    progress = AnalysisProgress(publish_progress, params['post_count'])
+    return cached_analysis(params['company_name'], params['post_count'], progress)
+
+# The job queue of this process, and the process that created it
+_job_queue = None
+_job_queue_pid = None
+_job_queue_lock = threading.Lock()
+
+def job_queue():
+    """Return this process's job queue, creating it on first use after any fork."""
+    global _job_queue, _job_queue_pid
+    with _job_queue_lock:
+        if _job_queue is None or _job_queue_pid != os.getpid():
+            store = JobStore(os.environ.get("JOBS_DB", os.path.join(".cache", "jobs.sqlite")))
+            _job_queue = JobQueue(store, run_analysis_job, max_workers=JOB_WORKERS)
+            _job_queue_pid = os.getpid()
+            _job_queue.start()
+        return _job_queue
+
+def job_status(job):
+    """Return the JSON status of a job, with its result once done."""
+    status = {
+        'id': job['id'],
+        'status': job['status'],
+        'company_name': job['params']['company_name'],
+        'post_count': job['params']['post_count'],
+        'created_at': job['created_at'],
+        'started_at': job['started_at'],
+        'finished_at': job['finished_at'],
+        'progress': job['progress']
     }
+    if job['status'] == DONE:
+        status['result'] = job['result']
+        status['report_url'] = url_for('job_report', job_id=job['id'])
+    elif job['status'] == FAILED:
+        status['error'] = job['error']
+    return status
+
+@app.route('/jobs', methods=['POST'])
+def submit_job():
+    """Queue an analysis and return its job id right away."""
+    try:
+        company_name, post_count = analysis_params(request.get_json(silent=True) or request.form)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    job_id = job_queue().submit({'company_name': company_name, 'post_count': post_count})
+    
+    return jsonify({
+        'id': job_id,
+        'status': QUEUED,
+        'status_url': url_for('get_job', job_id=job_id),
+        'events_url': url_for('job_events', job_id=job_id),
+        'live_url': url_for('job_live', job_id=job_id),
+        'api_url': url_for('api_report', job_id=job_id)
+    }), 202
+
+@app.route('/jobs/<job_id>')
+def get_job(job_id):
+    """Return the status of a job, with the finished report's data."""
+    job = job_queue().get(job_id)
+    if job is None:
+        return jsonify({'error': 'Unknown job'}), 404
+    return jsonify(job_status(job))
+
+@app.route('/jobs/<job_id>/report')
+def job_report(job_id):
+    """Render the report page of a finished job."""
+    job = job_queue().get(job_id)
+    if job is None:
+        return jsonify({'error': 'Unknown job'}), 404
+    if job['status'] != DONE:
+        return jsonify(job_status(job)), 500 if job['status'] == FAILED else 202
+    return render_report(job['result'])
+
+def server_sent_event(event, data):
+    """Format a Server-Sent Event with JSON data."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+@app.route('/jobs/<job_id>/events')
+def job_events(job_id):
+    """
+    Stream a job's progress as Server-Sent Events.
+    
+    A "progress" event carries each new snapshot of the job's stage, posts
+    collected and analyzed so far and running sentiment counts. The stream
+    ends with a "done" event carrying the report URL, sentiment counts and
+    chart data, or a "failed" event carrying the error.
+    
+    A stream still running after EVENT_STREAM_MAX_SECONDS ends early. The
+    browser's EventSource then reconnects after EVENT_STREAM_RETRY_MS, and
+    the new stream resumes with the job's latest snapshot.
+    """
+    queue = job_queue()
+    if queue.get(job_id) is None:
+        return jsonify({'error': 'Unknown job'}), 404
+    
+    def events():
+        # The job may run in another worker, so follow its progress in the job database
+        last_progress = None
+        started = last_sent = time.time()
+        yield f"retry: {EVENT_STREAM_RETRY_MS}\n\n"
+        while True:
+            job = queue.get(job_id)
+            if job['progress'] is not None and job['progress'] != last_progress:
+                last_progress = job['progress']
+                last_sent = time.time()
+                yield server_sent_event('progress', last_progress)
+            
+            if job['status'] == DONE:
+                yield server_sent_event('done', {
+                    'report_url': url_for('job_report', job_id=job_id),
+                    'sentiments': job['result']['sentiments'],
+                    'chart_data': job['result']['chart_data']
+                })
+                return
+            if job['status'] == FAILED:
+                yield server_sent_event('failed', {'error': job['error']})
+                return
+            
+            if time.time() - started > EVENT_STREAM_MAX_SECONDS:
+                return
+            
+            # Comment lines keep proxies from closing an idle stream
+            if time.time() - last_sent > 15:
+                last_sent = time.time()
+                yield ": keep-alive\n\n"
+            time.sleep(PROGRESS_POLL_INTERVAL)
+    
+    return Response(stream_with_context(events()), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+
+@app.route('/jobs/<job_id>/live')
+def job_live(job_id):
+    """Render the report page of a job, filled in from its progress events as it runs."""
+    job = job_queue().get(job_id)
+    if job is None:
+        return jsonify({'error': 'Unknown job'}), 404
+    if job['status'] == DONE:
+        return redirect(url_for('job_report', job_id=job_id))
+    
+    company_name = job['params']['company_name']
+    return render_report({
+        'company_name': company_name,
+        'report': '',
+        'post_count': job['params']['post_count'],
+        'date_range': 'Collecting posts...',
+        'sentiments': {'positive': 0, 'neutral': 0, 'negative': 0},
+        'chart_data': ReportAggregator().chart_data(),
+        'sample_posts': {'positive': [], 'negative': []},
+        'data_source': 'Collecting posts...',
+        'priority_areas': [],
+        'company_type': classify_company(company_name),
+        'events_url': url_for('job_events', job_id=job_id)
+    })
+
+@app.route('/api/analyze', methods=['GET', 'POST'])
+def api_analyze():
+    """
+    Return the data of an analysis as compact JSON.
+    
+    The company name and post count are read from the query string, the
+    form or a JSON body. Responses carry a strong ETag, so that clients
+    polling the same analysis get an empty 304 until it changes, and are
+    compressed when the client accepts it.
+    """
+    params = request.args if request.method == 'GET' else request.get_json(silent=True) or request.form
+    try:
+        company_name, post_count = analysis_params(params)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    try:
+        result = cached_analysis(company_name, post_count)
+    except TimeoutError as e:
+        return jsonify({'error': str(e)}), 504
+    return json_response(compact_report(result), request)
+
+@app.route('/api/report/<job_id>')
+def api_report(job_id):
+    """Return the data of a finished job as compact JSON, see api_analyze."""
+    job = job_queue().get(job_id)
+    if job is None:
+        return jsonify({'error': 'Unknown job'}), 404
+    if job['status'] != DONE:
+        return jsonify(job_status(job)), 500 if job['status'] == FAILED else 202
+    return json_response(compact_report(job['result']), request)
+
+@app.route('/api/compare', methods=['GET', 'POST'])
+def api_compare():
+    """
+    Compare several companies' sentiment, trend and feature and issue mentions as compact JSON.
+    
+    The companies are read from repeated "company" query parameters or the
+    "companies" list of a JSON body, with a shared post count. Responses
+    carry ETags and are compressed like api_analyze's.
+    """
+    if request.method == 'GET':
+        company_names = request.args.getlist('company')
+        post_count = request.args.get('post_count', 30)
+    else:
+        params = request.get_json(silent=True) or {}
+        company_names = params.get('companies', [])
+        post_count = params.get('post_count', 30)
     
-    # Sort posts for samples
-    sorted_posts = sorted(analyzed_posts, key=lambda x: x.get("compound_score", 0), reverse=True)
-    most_positive = sorted_posts[:3]
-    most_negative = sorted_posts[-3:] if len(sorted_posts) >= 3 else sorted_posts[-len(sorted_posts):]
-    
-    sample_posts = {
-        'positive': most_positive,
-        'negative': list(reversed(most_negative))
-    }
+    if not isinstance(company_names, list) or not 1 <= len(company_names) <= MAX_COMPARE_COMPANIES:
+        return jsonify({'error': f'Give between 1 and {MAX_COMPARE_COMPANIES} companies'}), 400
+    try:
+        post_count = parse_post_count(post_count)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     
-    # Generate priority areas based on company type and negative issues
-    priority_areas = []
-    
-    if company_type == "fintech":
-        priority_areas = [
-            {
-                "icon": "bi-headset",
-                "title": "Customer Service Enhancement",
-                "items": [
-                    "Implement 24/7 customer support or at least extended hours",
-                    "Improve response time to under 24 hours for all queries",
-                    "Better train support staff on common technical issues",
-                    "Add more support channels like WhatsApp or in-app chat"
-                ]
-            },
-            {
-                "icon": "bi-phone",
-                "title": "Technical Reliability",
-                "items": [
-                    "Comprehensive quality assurance before app updates",
-                    "Reduce app crashes through improved error handling",
-                    "Simplify the user interface in areas causing confusion",
-                    "Implement better offline functionality for basic features"
-                ]
-            },
-            {
-                "icon": "bi-credit-card",
-                "title": "Transaction System Improvements",
-                "items": [
-                    "Audit and fix the transaction processing pipeline",
-                    "Provide clearer error messages for failed transactions",
-                    "Implement real-time transaction status updates",
-                    "Create a simplified dispute resolution process"
-                ]
-            }
-        ]
-    elif company_type == "tech":
-        priority_areas = [
-            {
-                "icon": "bi-speedometer",
-                "title": "Performance Optimization",
-                "items": [
-                    "Improve application speed and responsiveness",
-                    "Reduce resource usage and battery consumption",
-                    "Optimize for low-end devices",
-                    "Implement better caching mechanisms"
-                ]
-            },
-            {
-                "icon": "bi-headset",
-                "title": "Customer Support Improvements",
-                "items": [
-                    "Expand technical support availability",
-                    "Develop better knowledge base and self-help resources",
-                    "Improve response times for technical issues",
-                    "Provide clear escalation paths for complex problems"
-                ]
-            },
-            {
-                "icon": "bi-shield-check",
-                "title": "Reliability and Security",
-                "items": [
-                    "Enhance error handling and crash reporting",
-                    "Improve data security and privacy controls",
-                    "Implement more robust backup and recovery options",
-                    "Conduct regular security audits and updates"
-                ]
-            }
-        ]
-    elif company_type == "food":
-        priority_areas = [
-            {
-                "icon": "bi-stopwatch",
-                "title": "Delivery Experience",
-                "items": [
-                    "Improve delivery time accuracy and tracking",
-                    "Ensure food arrives at the optimal temperature",
-                    "Enhance packaging to maintain food quality",
-                    "Implement better delivery staff training"
-                ]
-            },
-            {
-                "icon": "bi-egg-fried",
-                "title": "Food Quality Consistency",
-                "items": [
-                    "Implement stricter quality control measures",
-                    "Maintain consistency across all locations",
-                    "Source higher quality ingredients",
-                    "Regular review of food preparation processes"
-                ]
-            },
-            {
-                "icon": "bi-currency-dollar",
-                "title": "Value Optimization",
-                "items": [
-                    "Review pricing strategies",
-                    "Introduce more value meal options",
-                    "Enhance portion size consistency",
-                    "Develop better loyalty and rewards programs"
-                ]
-            }
-        ]
-    elif company_type == "travel":
-        priority_areas = [
-            {
-                "icon": "bi-info-circle",
-                "title": "Transparency Improvements",
-                "items": [
-                    "Clear disclosure of all fees upfront",
-                    "Accurate descriptions of accommodations and services",
-                    "Better communication about changes or disruptions",
-                    "Detailed information about cancellation policies"
-                ]
-            },
-            {
-                "icon": "bi-headset",
-                "title": "Customer Support Enhancements",
-                "items": [
-                    "24/7 support availability for travelers",
-                    "Better emergency assistance protocols",
-                    "Multilingual support options",
-                    "Improved response times for urgent issues"
-                ]
-            },
-            {
-                "icon": "bi-arrow-repeat",
-                "title": "Booking Process Refinement",
-                "items": [
-                    "Streamline the reservation process",
-                    "Implement better error checking for bookings",
-                    "Provide more flexible modification options",
-                    "Enhance the user experience on mobile devices"
-                ]
-            }
-        ]
-    elif company_type == "retail":
-        priority_areas = [
-            {
-                "icon": "bi-truck",
-                "title": "Shipping and Delivery",
-                "items": [
-                    "Improve delivery time accuracy",
-                    "Enhance package tracking capabilities",
-                    "Implement better handling procedures to reduce damage",
-                    "Expand delivery options and timeframes"
-                ]
-            },
-            {
-                "icon": "bi-arrow-counterclockwise",
-                "title": "Return Process Simplification",
-                "items": [
-                    "Streamline the return authorization process",
-                    "Provide clearer return instructions",
-                    "Offer more convenient return options",
-                    "Faster processing of refunds"
-                ]
-            },
-            {
-                "icon": "bi-headset",
-                "title": "Customer Service Improvement",
-                "items": [
-                    "Reduce response times for customer inquiries",
-                    "Better training for service representatives",
-                    "Implement more contact channels",
-                    "Improve issue resolution processes"
-                ]
-            }
-        ]
-    else:
-        # Generic priority areas for any other company type
-        priority_areas = [
-            {
-                "icon": "bi-headset",
-                "title": "Customer Experience Enhancement",
-                "items": [
-                    "Improve response times for customer inquiries",
-                    "Enhance training for customer-facing staff",
-                    "Develop better self-service options",
-                    "Implement regular customer feedback reviews"
-                ]
-            },
-            {
-                "icon": "bi-gear",
-                "title": "Product/Service Optimization",
-                "items": [
-                    "Address common quality issues",
-                    "Improve reliability and consistency",
-                    "Enhance user experience design",
-                    "Implement more rigorous testing procedures"
-                ]
-            },
-            {
-                "icon": "bi-graph-up",
-                "title": "Value Proposition Improvement",
-                "items": [
-                    "Review pricing and value perception",
-                    "Develop more competitive offerings",
-                    "Enhance unique selling points",
-                    "Better communicate benefits to customers"
-                ]
-            }
-        ]
-    
-    # Render template with data
-    return render_template(
-        'report.html',
-        company_name=company_name,
-        report=report,
-        post_count=post_count,
-        date_range=f"{oldest_date} to {newest_date}",
-        sentiments=sentiments,
-        chart_data=json.dumps(chart_data),
-        sample_posts=sample_posts,
-        data_source=data_source,
-        priority_areas=priority_areas,
-        company_type=company_type
-    )
+    try:
+        comparison = compare_companies(company_names, post_count)
+    except TimeoutError as e:
+        return jsonify({'error': str(e)}), 504
+    return json_response(comparison, request)
+
+@app.route('/cache/stats')
+def cache_stats():
+    """Return the result cache's size and hit/miss counters, and the coalescing of identical analyses."""
+    return jsonify(dict(result_cache().stats(), single_flight=analysis_flights.stats()))
 
 @app.route('/export_report', methods=['POST'])
 def export_report():
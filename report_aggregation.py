@@ -0,0 +1,151 @@
+import heapq
+import datetime
+from collections import Counter
+from functools import lru_cache
+
+from keyword_matching import compile_keywords
+
+@lru_cache(maxsize=4096)
+def month_key(date):
+    """Return the "YYYY-MM" month of a "YYYY-MM-DD" date, or None if it does not parse."""
+    try:
+        post_date = datetime.datetime.strptime(date, "%Y-%m-%d")
+    except (TypeError, ValueError):
+        return None
+    return f"{post_date.year}-{post_date.month:02d}"
+
+class ReportAggregator:
+    """
+    Compute everything the report and its charts need in a single pass over analyzed posts.
+    
+    Posts are in the format of analyze_sentiment: a "sentiment" category, a
+    "compound_score", a "date" and a "text". The aggregate holds the
+    sentiment counts, the monthly trend, the most positive and most negative
+    posts (kept in bounded heaps instead of sorting all posts) and, given
+    keyword lists, the features mentioned in positive posts and the issues
+    mentioned in negative ones.
+    """
+    
+    def __init__(self, feature_keywords=None, issue_keywords=None, top_k=3):
+        """
+        Initialize an empty aggregate.
+        
+        Args:
+            feature_keywords: Keywords of each feature, looked up in positive posts
+            issue_keywords: Keywords of each issue, looked up in negative posts
+            top_k: Number of sample posts kept at each end of the sentiment scale
+        """
+        self.feature_keywords = feature_keywords or {}
+        self.issue_keywords = issue_keywords or {}
+        self._feature_matcher = compile_keywords(self.feature_keywords)
+        self._issue_matcher = compile_keywords(self.issue_keywords)
+        self.top_k = top_k
+        self.total_posts = 0
+        self.sentiment_counts = {"positive": 0, "neutral": 0, "negative": 0}
+        self.month_sentiments = {}
+        self.feature_counts = Counter()
+        self.issue_counts = Counter()
+        self.newest_date = None
+        self.oldest_date = None
+        
+        # Min-heap of the top_k highest scores and max-heap of the top_k
+        # lowest. Ties rank as in a stable sort from highest to lowest score.
+        self._top = []
+        self._bottom = []
+    
+    def update(self, post):
+        """Add one analyzed post to the aggregate."""
+        index = self.total_posts
+        self.total_posts += 1
+        sentiment = post["sentiment"]
+        self.sentiment_counts[sentiment] += 1
+        
+        # Monthly trend
+        date = post.get("date", "")
+        month = month_key(date)
+        if month is not None:
+            counts = self.month_sentiments.get(month)
+            if counts is None:
+                counts = self.month_sentiments[month] = {"positive": 0, "neutral": 0, "negative": 0, "total": 0}
+            counts[sentiment] += 1
+            counts["total"] += 1
+        
+        if self.newest_date is None or date > self.newest_date:
+            self.newest_date = date
+        if self.oldest_date is None or date < self.oldest_date:
+            self.oldest_date = date
+        
+        # Sample posts
+        score = post.get("compound_score", 0)
+        if self.top_k:
+            top_entry = (score, -index, post)
+            if len(self._top) < self.top_k:
+                heapq.heappush(self._top, top_entry)
+            elif top_entry[:2] > self._top[0][:2]:
+                heapq.heapreplace(self._top, top_entry)
+            
+            bottom_entry = (-score, index, post)
+            if len(self._bottom) < self.top_k:
+                heapq.heappush(self._bottom, bottom_entry)
+            elif bottom_entry[:2] > self._bottom[0][:2]:
+                heapq.heapreplace(self._bottom, bottom_entry)
+        
+        # Features and issues
+        if sentiment == "positive" and self.feature_keywords:
+            self.feature_counts.update(self._feature_matcher.topics_in(post["text"]))
+        elif sentiment == "negative" and self.issue_keywords:
+            self.issue_counts.update(self._issue_matcher.topics_in(post["text"]))
+    
+    def update_many(self, posts):
+        """Add every post of an iterable and return the aggregate."""
+        for post in posts:
+            self.update(post)
+        return self
+    
+    def most_positive(self):
+        """Return the most positive posts, highest score first."""
+        return [post for _, _, post in sorted(self._top, reverse=True)]
+    
+    def most_negative(self):
+        """Return the most negative posts, lowest score first."""
+        return [post for _, _, post in sorted(self._bottom, reverse=True)]
+    
+    def trend(self):
+        """Return the sentiment counts of each month, in month order."""
+        return [(month, self.month_sentiments[month]) for month in sorted(self.month_sentiments)]
+    
+    def top_features(self, n=3):
+        """Return the n features mentioned most in positive posts, with their counts."""
+        return self.feature_counts.most_common(n)
+    
+    def top_issues(self, n=3):
+        """Return the n issues mentioned most in negative posts, with their counts."""
+        return self.issue_counts.most_common(n)
+    
+    def chart_data(self):
+        """Return the data of the report page's charts."""
+        trend = self.trend()
+        top_positive = self.top_features() or [("No specific features mentioned", 0)]
+        top_negative = self.top_issues() or [("No specific issues mentioned", 0)]
+        
+        return {
+            'sentiment_distribution': {
+                'labels': ['Positive', 'Neutral', 'Negative'],
+                'values': [self.sentiment_counts['positive'], self.sentiment_counts['neutral'],
+                           self.sentiment_counts['negative']]
+            },
+            'sentiment_trend': {
+                'labels': [month for month, _ in trend],
+                'positive': [counts['positive'] for _, counts in trend],
+                'neutral': [counts['neutral'] for _, counts in trend],
+                'negative': [counts['negative'] for _, counts in trend]
+            },
+            'top_features': {
+                'labels': [feature for feature, _ in top_positive],
+                'values': [count for _, count in top_positive]
+            },
+            'top_issues': {
+                'labels': [issue for issue, _ in top_negative],
+                'values': [count for _, count in top_negative]
+            }
+        }
@@ -0,0 +1,192 @@
+import os
+import json
+import time
+import sqlite3
+import logging
+import threading
+from collections import OrderedDict
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+def make_key(company_name, post_count, mode):
+    """Return the cache key of an analysis: the company name ignoring case and spacing, the post count and the data-source mode."""
+    return f"{mode}|{post_count}|{' '.join(company_name.lower().split())}"
+
+class ResultCache:
+    """
+    Cache finished analyses for a limited time.
+    
+    Results live in memory, where the least recently used are evicted once
+    their total serialized size exceeds max_size_mb. With a disk_path they
+    are also written to a SQLite database, so that they survive restarts
+    and are shared by the processes using the same file; a memory miss then
+    falls back to the disk before counting as a miss. Entries expire
+    ttl_seconds after they were stored in both tiers.
+    """
+    
+    def __init__(self, ttl_seconds=900, max_size_mb=64, disk_path=None, max_disk_size_mb=256):
+        """
+        Initialize the cache.
+        
+        Args:
+            ttl_seconds: How long a result is served after it was computed
+            max_size_mb: Memory budget of the in-memory tier
+            disk_path: Path to the SQLite database of the on-disk tier, or
+                None to keep results in memory only
+            max_disk_size_mb: Size budget of the on-disk tier
+        """
+        self.ttl_seconds = ttl_seconds
+        self.max_size_bytes = int(max_size_mb * 1024 * 1024)
+        self.max_disk_size_bytes = int(max_disk_size_mb * 1024 * 1024)
+        self.disk_path = disk_path
+        
+        # Key -> (expiry time, serialized size, result), least recently used first
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0, "expirations": 0}
+        
+        self._conn = None
+        if disk_path:
+            directory = os.path.dirname(disk_path)
+            if directory and not os.path.exists(directory):
+                os.makedirs(directory)
+            # Workers share the file, so wait for each other's writes
+            self._conn = sqlite3.connect(disk_path, check_same_thread=False, timeout=30)
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS results (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    expires_at REAL NOT NULL,
+                    last_access REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_results_last_access ON results (last_access);
+            """)
+            self._conn.commit()
+    
+    def get(self, key, count_miss=True):
+        """
+        Return the cached result of a key, or None if there is none or it expired.
+        
+        The result is shared with other callers and must not be modified.
+        Pass count_miss=False when looking again after a miss, so that the
+        request is not counted as missing twice.
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._entries.move_to_end(key)
+                    self._counters["hits"] += 1
+                    return entry[2]
+                self._remove(key)
+                self._counters["expirations"] += 1
+            
+            if self._conn is not None:
+                row = self._conn.execute(
+                    "SELECT value, expires_at FROM results WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None and row[1] > now:
+                    self._conn.execute("UPDATE results SET last_access = ? WHERE key = ?", (now, key))
+                    self._conn.commit()
+                    result = json.loads(row[0])
+                    self._store(key, result, len(row[0]), row[1])
+                    self._counters["disk_hits"] += 1
+                    return result
+            
+            if count_miss:
+                self._counters["misses"] += 1
+            return None
+    
+    def put(self, key, result):
+        """Cache a JSON-serializable result under a key."""
+        if self.ttl_seconds <= 0:
+            return
+        
+        serialized = json.dumps(result)
+        expires_at = time.time() + self.ttl_seconds
+        with self._lock:
+            self._store(key, result, len(serialized), expires_at)
+            
+            if self._conn is not None:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO results (key, value, size, expires_at, last_access) VALUES (?, ?, ?, ?, ?)",
+                    (key, serialized, len(serialized), expires_at, time.time())
+                )
+                self._conn.commit()
+                self._evict_disk()
+    
+    def _store(self, key, result, size, expires_at):
+        """Add an entry to the memory tier and evict down to its budget. The caller must hold the lock."""
+        if key in self._entries:
+            self._remove(key)
+        if size > self.max_size_bytes:
+            return
+        
+        self._entries[key] = (expires_at, size, result)
+        self._size += size
+        while self._size > self.max_size_bytes:
+            self._remove(next(iter(self._entries)))
+            self._counters["evictions"] += 1
+    
+    def _remove(self, key):
+        """Remove an entry from the memory tier. The caller must hold the lock."""
+        _, size, _ = self._entries.pop(key)
+        self._size -= size
+    
+    def _evict_disk(self):
+        """Remove expired entries, then least recently used ones, until the disk tier fits its budget. The caller must hold the lock."""
+        self._conn.execute("DELETE FROM results WHERE expires_at <= ?", (time.time(),))
+        total_size = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+        
+        evicted_keys = []
+        if total_size > self.max_disk_size_bytes:
+            for key, size in self._conn.execute("SELECT key, size FROM results ORDER BY last_access"):
+                if total_size <= self.max_disk_size_bytes:
+                    break
+                evicted_keys.append((key,))
+                total_size -= size
+            self._conn.executemany("DELETE FROM results WHERE key = ?", evicted_keys)
+            logger.info(f"Evicted {len(evicted_keys)} entries from the result cache's disk tier")
+        self._conn.commit()
+    
+    def stats(self):
+        """
+        Report the cache's size and counters.
+        
+        Returns:
+            A dictionary with the memory tier's entry count and size, the
+            hits served from memory and from disk, the misses, the memory
+            evictions and expirations, and the hit rate
+        """
+        with self._lock:
+            stats = dict(self._counters)
+            stats["entries"] = len(self._entries)
+            stats["size_bytes"] = self._size
+            stats["max_size_bytes"] = self.max_size_bytes
+            stats["ttl_seconds"] = self.ttl_seconds
+            if self._conn is not None:
+                stats["disk_entries"], stats["disk_size_bytes"] = self._conn.execute(
+                    "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results"
+                ).fetchone()
+        
+        lookups = stats["hits"] + stats["disk_hits"] + stats["misses"]
+        stats["hit_rate"] = (stats["hits"] + stats["disk_hits"]) / lookups if lookups else 0
+        return stats
+    
+    def clear(self):
+        """Remove all entries of both tiers."""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM results")
+                self._conn.commit()
+    
+    def close(self):
+        """Close the on-disk tier's database connection."""
+        if self._conn is not None:
+            self._conn.close()
@@ -0,0 +1,78 @@
+import threading
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+
+class SingleFlight:
+    """
+    Run at most one call per key at a time, sharing its outcome with concurrent callers.
+    
+    The first caller of a key runs the function in its own thread. Callers
+    arriving while it runs wait for its result instead of running the
+    function again, and get its exception if it raises. Once the call
+    returns, the next caller of the key starts a new one.
+    """
+    
+    def __init__(self):
+        """Initialize with no calls in flight."""
+        self._calls = {}
+        self._lock = threading.Lock()
+        self._counters = {"calls": 0, "coalesced": 0, "timeouts": 0}
+    
+    def do(self, key, function, timeout=None):
+        """
+        Run function() for a key, or wait for the call already running for it.
+        
+        Args:
+            key: Identifies identical work
+            function: Called without arguments to compute the result
+            timeout: Seconds a waiting caller waits for the running call;
+                None waits until it finishes. The running call itself is
+                never interrupted.
+        
+        Returns:
+            The result of the call
+        
+        Raises:
+            TimeoutError: If the caller waited longer than timeout
+            Exception: Whatever the call raised
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = Future()
+                self._counters["calls"] += 1
+            else:
+                self._counters["coalesced"] += 1
+        
+        if not leader:
+            try:
+                return future.result(timeout)
+            except FutureTimeoutError:
+                # The call itself raised a TimeoutError
+                if future.done():
+                    raise
+                with self._lock:
+                    self._counters["timeouts"] += 1
+                raise TimeoutError(f"Timed out after {timeout}s waiting for the running call for {key!r}")
+        
+        try:
+            result = function()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._calls[key]
+    
+    def in_flight(self, key):
+        """Return whether a call is running for a key."""
+        with self._lock:
+            return key in self._calls
+    
+    def stats(self):
+        """Return the number of calls run, callers that waited for a running call, waiters that timed out and calls in flight."""
+        with self._lock:
+            return dict(self._counters, in_flight=len(self._calls))
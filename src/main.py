@@ -14,7 +14,9 @@ logger = logging.getLogger(__name__)
 
 # Import components
 from data_collection import LinkedInScraper, MockDataProvider
-from sentiment_analysis import SentimentAnalyzer
+from sentiment_analysis import SentimentAnalyzer, AnalysisCache, ParallelSentimentAnalyzer, PostDeduplicator, ResourceManager
+from sentiment_analysis.service import InferenceService, InferenceClient
+from sentiment_analysis.resources import DEFAULT_RESOURCE_DIR, RESOURCE_DIR_ENV
 from report_generation import ReportGenerator
 
 def parse_arguments():
@@ -28,6 +30,28 @@ def parse_arguments():
     parser.add_argument('--output-dir', default='reports', help='Directory to save reports')
     parser.add_argument('--use-mock-data', action='store_true', 
                        help='Use mock data instead of scraping LinkedIn')
+    parser.add_argument('--batch-size', type=int, default=32,
+                       help='Number of posts per emotion model forward pass')
+    parser.add_argument('--long-text-mode', choices=['truncate', 'chunk'], default='truncate',
+                       help='Truncate long posts at the model token limit or score them in overlapping windows')
+    parser.add_argument('--backend', choices=['torch', 'onnx'], default='torch',
+                       help='Inference backend for the emotion model')
+    parser.add_argument('--cache-path', default=None,
+                       help='SQLite file for caching analysis results between runs')
+    parser.add_argument('--cache-max-mb', type=float, default=256,
+                       help='Size of the analysis cache above which old entries are evicted')
+    parser.add_argument('--workers', type=int, default=1,
+                       help='Number of worker processes for analysis (each loads its own models)')
+    parser.add_argument('--dedup', action='store_true',
+                       help='Analyze duplicate and near-duplicate posts once and count each cluster once')
+    parser.add_argument('--emotion-mode', choices=['full', 'tiered'], default='full',
+                       help='Run the emotion model on every post, or only on ambiguous, sampled and report posts')
+    parser.add_argument('--sample-rate', type=float, default=0.1,
+                       help='Fraction of unambiguous posts scored by the emotion model in tiered mode')
+    parser.add_argument('--resource-dir', default=os.getenv(RESOURCE_DIR_ENV, DEFAULT_RESOURCE_DIR),
+                       help='Directory of the offline resource bundle built by the prefetch command')
+    parser.add_argument('--allow-downloads', action='store_true',
+                       help='Download the emotion model if it is not available locally')
     
     return parser.parse_args()
 
@@ -83,6 +107,26 @@ def main():
     args = parse_arguments()
     
     try:
+        # Start loading the models first, so that the emotion model loads
+        # in the background while posts are collected
+        cache = AnalysisCache(args.cache_path, max_size_mb=args.cache_max_mb) if args.cache_path else None
+        deduplicator = PostDeduplicator() if args.dedup else None
+        resources = ResourceManager(args.resource_dir, allow_downloads=args.allow_downloads)
+        if args.workers > 1:
+            # The workers open the cache themselves
+            analyzer = ParallelSentimentAnalyzer(workers=args.workers, cache_path=args.cache_path,
+                                                 cache_max_mb=args.cache_max_mb, batch_size=args.batch_size,
+                                                 long_text_mode=args.long_text_mode, backend=args.backend,
+                                                 deduplicator=deduplicator, emotion_mode=args.emotion_mode,
+                                                 sample_rate=args.sample_rate, resources=resources)
+        else:
+            # Posts go through the same batching service as the web app's requests
+            service = InferenceService(SentimentAnalyzer(batch_size=args.batch_size, long_text_mode=args.long_text_mode,
+                                                         cache=cache, backend=args.backend, deduplicator=deduplicator,
+                                                         emotion_mode=args.emotion_mode, sample_rate=args.sample_rate,
+                                                         model_loading="background", resources=resources)).start()
+            analyzer = InferenceClient(service)
+        
         # Step 1: Collect data
         posts = collect_data(args.company, args.limit, args.use_mock_data)
         
@@ -92,23 +136,32 @@ def main():
         
         # Step 2: Analyze sentiment
         logger.info("Analyzing sentiment and emotions...")
-        analyzer = SentimentAnalyzer()
-        analyzed_posts = analyzer.analyze_posts(posts)
-        
-        # Step 3: Aggregate results
-        aggregated_results = analyzer.get_aggregated_results(analyzed_posts)
+        if isinstance(analyzer, InferenceClient) and not analyzer.wait_ready():
+            logger.warning("Emotion model unavailable, analyzing sentiment only")
+        analyzed_posts = analyzer.iter_analyze(posts)
         
-        # Step 4: Generate report
+        # Steps 3 and 4: Aggregate results and generate the report in one pass over the stream
         logger.info("Generating report...")
         report_generator = ReportGenerator(output_dir=args.output_dir)
         include_viz = args.report_type == 'full'
-        report_files = report_generator.generate_report(
+        report_files = report_generator.generate_report_from_stream(
             args.company, 
             analyzed_posts, 
-            aggregated_results, 
+            analyzer.get_aggregated_results, 
             include_viz=include_viz
         )
         
+        if isinstance(analyzer, ParallelSentimentAnalyzer):
+            analyzer.close()
+        else:
+            analyzer.service.stop()
+        
+        if cache:
+            # Session counters only cover this process, so report the lifetime rate for workers
+            stats = cache.stats()
+            hit_rate = stats['hit_rate'] if args.workers > 1 else stats['session_hit_rate']
+            logger.info(f"Analysis cache hit rate: {hit_rate:.1%}")
+        
         # Step 5: Print report locations
         logger.info("Analysis complete!")
         for report_type, file_path in report_files.items():
@@ -1,3 +1,3 @@
-from .report_generator import ReportGenerator
+from .report_generator import ReportGenerator, SamplePostCollector, select_sample_posts
 
-__all__ = ['ReportGenerator'] 
\ No newline at end of file
+__all__ = ['ReportGenerator', 'SamplePostCollector', 'select_sample_posts'] 
\ No newline at end of file
@@ -1,8 +1,9 @@
 import os
+import heapq
 import logging
 import json
 import datetime
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Iterable, Callable, Tuple
 import matplotlib.pyplot as plt
 import matplotlib
 matplotlib.use('Agg')  # Use non-interactive backend
@@ -14,6 +15,72 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+def _compound_score(post: Dict[str, Any]) -> float:
+    """Return the VADER compound score of an analyzed post."""
+    return post.get("sentiment", {}).get("scores", {}).get("compound", 0)
+
+class SamplePostCollector:
+    """Keep the most positive and most negative posts seen in a stream."""
+    
+    def __init__(self, k: int = 3):
+        """
+        Initialize the collector.
+        
+        Args:
+            k: Number of posts to keep at each end of the sentiment scale
+        """
+        self.k = k
+        self._seen = 0
+        
+        # Min-heap of the k highest scores and max-heap of the k lowest scores.
+        # Ties rank as in a stable sort from highest to lowest score.
+        self._top = []
+        self._bottom = []
+    
+    def add(self, post: Dict[str, Any]) -> None:
+        """Offer a post to the collector."""
+        score = _compound_score(post)
+        self._seen += 1
+        
+        if len(self._top) < self.k:
+            heapq.heappush(self._top, (score, -self._seen, post))
+        elif (score, -self._seen) > self._top[0][:2]:
+            heapq.heapreplace(self._top, (score, -self._seen, post))
+        
+        if len(self._bottom) < self.k:
+            heapq.heappush(self._bottom, (-score, self._seen, post))
+        elif (-score, self._seen) > self._bottom[0][:2]:
+            heapq.heapreplace(self._bottom, (-score, self._seen, post))
+    
+    def most_positive(self) -> List[Dict[str, Any]]:
+        """Return the most positive posts, highest score first."""
+        return [post for _, _, post in sorted(self._top, key=lambda x: (-x[0], -x[1]))]
+    
+    def most_negative(self) -> List[Dict[str, Any]]:
+        """Return the most negative posts, least negative first."""
+        return [post for _, _, post in sorted(self._bottom, key=lambda x: x[:2])]
+
+def select_sample_posts(analyzed_posts: Iterable[Dict[str, Any]], k: int = 3) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    Select the most positive and most negative posts in a single pass.
+    
+    Args:
+        analyzed_posts: An iterable of posts with sentiment analysis results,
+            or a columnar store that selects its own samples
+        k: Number of posts to select at each end
+        
+    Returns:
+        The most positive posts and the most negative posts
+    """
+    # Columnar results select samples with vectorized top-k
+    if hasattr(analyzed_posts, "sample_posts"):
+        return analyzed_posts.sample_posts(k)
+    
+    collector = SamplePostCollector(k)
+    for post in analyzed_posts:
+        collector.add(post)
+    return collector.most_positive(), collector.most_negative()
+
 class ReportGenerator:
     """A class to generate reports based on sentiment analysis results."""
     
@@ -99,6 +166,32 @@ class ReportGenerator:
             analyzed_posts: List of posts with sentiment analysis results
             aggregated_results: Aggregated sentiment and emotion analysis results
             
+        Returns:
+            Path to the generated report file
+        """
+        most_positive, most_negative = select_sample_posts(analyzed_posts)
+        return self._write_text_report(company_name, aggregated_results, most_positive, most_negative)
+    
+    @staticmethod
+    def _error_note(emotion_errors: Optional[Dict[str, Optional[float]]], emotion: str) -> str:
+        """Describe the uncertainty of a sampled emotion estimate, if there is one."""
+        if emotion_errors is None or emotion not in emotion_errors:
+            return ""
+        if emotion_errors[emotion] is None:
+            return " (estimated, too few samples for an error bound)"
+        return f" (±{1.96 * emotion_errors[emotion]:.1%} at 95% confidence)"
+    
+    def _write_text_report(self, company_name: str, aggregated_results: Dict[str, Any],
+                           most_positive: List[Dict[str, Any]], most_negative: List[Dict[str, Any]]) -> str:
+        """
+        Write the text report for already selected sample posts.
+        
+        Args:
+            company_name: Name of the company
+            aggregated_results: Aggregated sentiment and emotion analysis results
+            most_positive: The most positive posts, highest score first
+            most_negative: The most negative posts, least negative first
+            
         Returns:
             Path to the generated report file
         """
@@ -114,6 +207,7 @@ class ReportGenerator:
             # Extract data for the report
             sentiment_counts = aggregated_results.get("sentiment_counts", {})
             emotion_distribution = aggregated_results.get("emotion_distribution", {})
+            emotion_errors = aggregated_results.get("emotion_distribution_error")
             total_posts = sum(sentiment_counts.values())
             
             with open(file_path, "w") as f:
@@ -131,7 +225,7 @@ class ReportGenerator:
                 # Write emotion breakdown
                 f.write("## Emotion Analysis\n\n")
                 for emotion, score in sorted(emotion_distribution.items(), key=lambda x: x[1], reverse=True):
-                    f.write(f"{emotion.capitalize()}: {score:.1%}\n")
+                    f.write(f"{emotion.capitalize()}: {score:.1%}{self._error_note(emotion_errors, emotion)}\n")
                 f.write("\n")
                 
                 # Write actionable insights
@@ -143,24 +237,17 @@ class ReportGenerator:
                 # Write sample posts (top positive and negative)
                 f.write("## Sample Posts\n\n")
                 
-                # Sort posts by sentiment score
-                sorted_posts = sorted(
-                    analyzed_posts, 
-                    key=lambda x: x.get("sentiment", {}).get("scores", {}).get("compound", 0),
-                    reverse=True
-                )
-                
                 # Write top positive posts
                 f.write("### Most Positive Posts\n\n")
-                for post in sorted_posts[:3]:
-                    score = post.get("sentiment", {}).get("scores", {}).get("compound", 0)
+                for post in most_positive:
+                    score = _compound_score(post)
                     f.write(f"Score: {score:.2f}\n")
                     f.write(f"Text: {post.get('text', '')[:200]}...\n\n")
                 
                 # Write top negative posts
                 f.write("### Most Negative Posts\n\n")
-                for post in sorted_posts[-3:]:
-                    score = post.get("sentiment", {}).get("scores", {}).get("compound", 0)
+                for post in most_negative:
+                    score = _compound_score(post)
                     f.write(f"Score: {score:.2f}\n")
                     f.write(f"Text: {post.get('text', '')[:200]}...\n\n")
             
@@ -249,6 +336,10 @@ class ReportGenerator:
             filename = f"{company_name.replace(' ', '_')}_{timestamp}_data.json"
             file_path = os.path.join(self.output_dir, filename)
             
+            # Columnar results provide a dictionary view of their posts
+            if hasattr(analyzed_posts, "to_dicts"):
+                analyzed_posts = analyzed_posts.to_dicts()
+            
             # Prepare data for serialization
             data = {
                 "company": company_name,
@@ -300,6 +391,73 @@ class ReportGenerator:
             report_files["raw_data"] = data_path
         
         return report_files
+    
+    def generate_report_from_stream(self, company_name: str, analyzed_posts: Iterable[Dict[str, Any]],
+                                    aggregate: Callable[[Iterable[Dict[str, Any]]], Dict[str, Any]],
+                                    include_viz: bool = True) -> Dict[str, str]:
+        """
+        Generate a complete report from a stream of analyzed posts.
+        
+        The stream is consumed once: each post is written to the raw data
+        file, offered to the sample post selection and passed on to the
+        aggregation function, so the posts are never held in memory together.
+        
+        Args:
+            company_name: Name of the company
+            analyzed_posts: An iterable of posts with sentiment analysis results,
+                such as SentimentAnalyzer.iter_analyze
+            aggregate: Function that aggregates an iterable of analyzed posts,
+                such as SentimentAnalyzer.get_aggregated_results
+            include_viz: Whether to include visualizations
+            
+        Returns:
+            A dictionary with paths to the generated files
+        """
+        report_files = {}
+        collector = SamplePostCollector()
+        
+        # Generate filename for the raw data
+        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+        filename = f"{company_name.replace(' ', '_')}_{timestamp}_data.json"
+        data_path = os.path.join(self.output_dir, filename)
+        
+        with open(data_path, "w") as f:
+            f.write("{\n")
+            f.write(f'  "company": {json.dumps(company_name)},\n')
+            f.write(f'  "timestamp": {json.dumps(datetime.datetime.now().isoformat())},\n')
+            f.write('  "posts": [')
+            
+            def tap(posts: Iterable[Dict[str, Any]]):
+                for i, post in enumerate(posts):
+                    f.write(",\n    " if i else "\n    ")
+                    f.write(json.dumps(post))
+                    collector.add(post)
+                    yield post
+            
+            aggregated_results = aggregate(tap(analyzed_posts))
+            
+            f.write("\n  ],\n")
+            f.write(f'  "aggregated_results": {json.dumps(aggregated_results)}\n')
+            f.write("}\n")
+        
+        logger.info(f"Saved raw data: {data_path}")
+        
+        # Generate text report
+        text_report_path = self._write_text_report(
+            company_name, aggregated_results, collector.most_positive(), collector.most_negative()
+        )
+        if text_report_path:
+            report_files["text_report"] = text_report_path
+        
+        # Generate visualization if requested
+        if include_viz:
+            viz_path = self.generate_visualization(company_name, aggregated_results)
+            if viz_path:
+                report_files["visualization"] = viz_path
+        
+        report_files["raw_data"] = data_path
+        
+        return report_files
 
 # For testing purposes
 if __name__ == "__main__":
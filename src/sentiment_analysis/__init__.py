@@ -1,3 +1,10 @@
 from .analyzer import SentimentAnalyzer
+from .cache import AnalysisCache
+from .aggregator import SentimentAggregator
+from .columnar import AnalysisColumns
+from .parallel import ParallelSentimentAnalyzer
+from .dedup import PostDeduplicator
+from .resources import ResourceManager
+from .service import InferenceService, InferenceClient
 
-__all__ = ['SentimentAnalyzer'] 
\ No newline at end of file
+__all__ = ['SentimentAnalyzer', 'AnalysisCache', 'SentimentAggregator', 'AnalysisColumns', 'ParallelSentimentAnalyzer', 'PostDeduplicator', 'ResourceManager', 'InferenceService', 'InferenceClient'] 
\ No newline at end of file
@@ -0,0 +1,290 @@
+import math
+from collections import OrderedDict
+from typing import Dict, List, Any, Iterable, Optional, Tuple
+
+# Tiers of posts scored by the emotion model in tiered mode
+MODEL_TIERS = ("ambiguous", "sample", "report")
+
+# Tiers standing for the posts outside the fully scored stratum: the random
+# sample and the posts it was drawn from
+SAMPLED_POPULATION_TIERS = ("sample", "report", "skipped")
+
+def estimate_emotion_distribution(observed_totals: Dict[str, float], observed_counts: Dict[str, int],
+                                  sample_totals: Dict[str, float], sample_squares: Dict[str, float],
+                                  sample_size: int, population: int) -> Tuple[Dict[str, float], Dict[str, Optional[float]]]:
+    """
+    Estimate the average emotion scores from a fully scored stratum and a random sample.
+    
+    The posts scored in full (ambiguous or cached ones, or every post outside
+    tiered mode) contribute their exact totals. The other posts are
+    represented by a uniform random sample, whose mean is scaled up to the
+    population it was drawn from.
+    
+    Args:
+        observed_totals: Sum of each emotion over the fully scored posts
+        observed_counts: Number of fully scored posts with each emotion
+        sample_totals: Sum of each emotion over the sampled posts
+        sample_squares: Sum of each squared emotion score over the sampled posts
+        sample_size: Number of sampled posts
+        population: Number of posts the sample was drawn from, sample included
+        
+    Returns:
+        The estimated average of each emotion and its standard error (None
+        if it cannot be estimated from fewer than two sampled posts)
+    """
+    distribution = {}
+    errors = {}
+    
+    for emotion in set(observed_totals) | set(sample_totals):
+        total = observed_totals.get(emotion, 0.0)
+        count = observed_counts.get(emotion, 0)
+        error = 0.0
+        
+        if population:
+            if sample_size:
+                mean = sample_totals.get(emotion, 0.0) / sample_size
+                total += population * mean
+                count += population
+            
+            if sample_size > 1:
+                variance = max(0.0, (sample_squares.get(emotion, 0.0) - sample_size * mean * mean) / (sample_size - 1))
+                # Standard error of the sample mean with the finite population correction
+                sample_error = math.sqrt(variance / sample_size * (1 - sample_size / population))
+                error = population / count * sample_error
+            else:
+                error = None
+        
+        if count:
+            distribution[emotion] = total / count
+            errors[emotion] = error
+    
+    return distribution, errors
+
+class SentimentAggregator:
+    """
+    A mergeable, single-pass aggregate of sentiment and emotion results.
+    
+    Posts carrying a "cluster_id" (see PostDeduplicator) count once per
+    cluster, so a widely reshared post does not outweigh the others. The
+    aggregate remembers what each of the max_clusters most recently seen
+    clusters added, so that memory stays bounded and a merge can take out
+    a cluster both partials counted; a repeat arriving after that many other
+    clusters counts again. Posts carrying an "emotion_tier" (tiered mode of
+    SentimentAnalyzer) feed an estimate of the emotion distribution with its
+    standard error.
+    """
+    
+    def __init__(self, histogram_bins: int = 20, max_clusters: int = 10000):
+        """
+        Initialize an empty aggregate.
+        
+        Args:
+            histogram_bins: Number of equal-width compound score bins over [-1, 1]
+            max_clusters: Number of clusters whose repeats are recognized
+        """
+        self.histogram_bins = histogram_bins
+        self.sentiment_counts = {"positive": 0, "neutral": 0, "negative": 0}
+        self.post_count = 0
+        self.compound_total = 0.0
+        self.emotion_totals: Dict[str, float] = {}
+        self.emotion_counts: Dict[str, int] = {}
+        self.compound_histogram = [0] * histogram_bins
+        self.max_clusters = max_clusters
+        # Contribution of each counted cluster, least recently seen first
+        self.clusters: "OrderedDict[str, Tuple[str, float, Optional[str], Dict[str, float]]]" = OrderedDict()
+        self.duplicate_posts = 0
+        self.sample_totals: Dict[str, float] = {}
+        self.sample_squares: Dict[str, float] = {}
+        self.sample_size = 0
+        self.sampled_population = 0
+    
+    def update(self, post: Dict[str, Any]) -> None:
+        """
+        Add one analyzed post to the aggregate.
+        
+        Args:
+            post: A post with sentiment and emotion analysis results
+        """
+        # Skip repeats of a cluster that was already counted
+        cluster_id = post.get("cluster_id")
+        if cluster_id is not None and cluster_id in self.clusters:
+            self.clusters.move_to_end(cluster_id)
+            self.duplicate_posts += 1
+            return
+        
+        sentiment = post.get("sentiment", {})
+        contribution = (
+            sentiment.get("category", "neutral"),
+            sentiment.get("scores", {}).get("compound", 0),
+            post.get("emotion_tier"),
+            post.get("emotions", {})
+        )
+        self._add(contribution)
+        if cluster_id is not None:
+            self._remember(cluster_id, contribution)
+    
+    def _add(self, contribution: Tuple[str, float, Optional[str], Dict[str, float]], sign: int = 1) -> None:
+        """Add the contribution of one post to the totals, or take it out with sign -1."""
+        category, compound_score, tier, emotions = contribution
+        
+        # Count sentiment categories
+        self.sentiment_counts[category] = self.sentiment_counts.get(category, 0) + sign
+        
+        # Sum compound scores and place them in the histogram
+        self.compound_total += sign * compound_score
+        self.post_count += sign
+        self.compound_histogram[self._bin(compound_score)] += sign
+        
+        # Aggregate emotions
+        if tier in SAMPLED_POPULATION_TIERS:
+            self.sampled_population += sign
+            # A sampled post whose scoring failed leaves the sample smaller
+            if tier == "sample" and emotions:
+                self.sample_size += sign
+                for emotion, score in emotions.items():
+                    self.sample_totals[emotion] = self.sample_totals.get(emotion, 0) + sign * score
+                    self.sample_squares[emotion] = self.sample_squares.get(emotion, 0) + sign * score * score
+            return
+        
+        for emotion, score in emotions.items():
+            self.emotion_totals[emotion] = self.emotion_totals.get(emotion, 0) + sign * score
+            self.emotion_counts[emotion] = self.emotion_counts.get(emotion, 0) + sign
+    
+    def _remember(self, cluster_id: str, contribution: Tuple[str, float, Optional[str], Dict[str, float]]) -> None:
+        """Record a counted cluster, forgetting the least recently seen one beyond max_clusters."""
+        category, compound_score, tier, emotions = contribution
+        self.clusters[cluster_id] = (category, compound_score, tier, dict(emotions))
+        if len(self.clusters) > self.max_clusters:
+            self.clusters.popitem(last=False)
+    
+    def update_many(self, posts: Iterable[Dict[str, Any]]) -> "SentimentAggregator":
+        """Add every post of an iterable and return the aggregate."""
+        for post in posts:
+            self.update(post)
+        return self
+    
+    def _bin(self, compound_score: float) -> int:
+        """Return the histogram bin of a compound score."""
+        position = int((compound_score + 1) / 2 * self.histogram_bins)
+        return min(max(position, 0), self.histogram_bins - 1)
+    
+    def merge(self, other: "SentimentAggregator") -> "SentimentAggregator":
+        """
+        Combine another partial aggregate into this one.
+        
+        A cluster counted by both partials is counted once, as long as
+        both still remember it (see max_clusters).
+        
+        Args:
+            other: An aggregate built with the same number of histogram bins
+        
+        Returns:
+            This aggregate
+        """
+        if other.histogram_bins != self.histogram_bins:
+            raise ValueError("Cannot merge aggregates with different histogram bins")
+        
+        for category, count in other.sentiment_counts.items():
+            self.sentiment_counts[category] = self.sentiment_counts.get(category, 0) + count
+        
+        self.post_count += other.post_count
+        self.compound_total += other.compound_total
+        
+        for emotion, total in other.emotion_totals.items():
+            self.emotion_totals[emotion] = self.emotion_totals.get(emotion, 0) + total
+            self.emotion_counts[emotion] = self.emotion_counts.get(emotion, 0) + other.emotion_counts[emotion]
+        
+        self.compound_histogram = [a + b for a, b in zip(self.compound_histogram, other.compound_histogram)]
+        self.duplicate_posts += other.duplicate_posts
+        
+        for emotion, total in other.sample_totals.items():
+            self.sample_totals[emotion] = self.sample_totals.get(emotion, 0) + total
+            self.sample_squares[emotion] = self.sample_squares.get(emotion, 0) + other.sample_squares[emotion]
+        self.sample_size += other.sample_size
+        self.sampled_population += other.sampled_population
+        
+        for cluster_id, contribution in other.clusters.items():
+            if cluster_id in self.clusters:
+                # Counted by both partials: keep this aggregate's count only
+                self._add(contribution, -1)
+                self.duplicate_posts += 1
+                self.clusters.move_to_end(cluster_id)
+            else:
+                self._remember(cluster_id, contribution)
+        return self
+    
+    def histogram_edges(self) -> List[float]:
+        """Return the bin edges of the compound score histogram."""
+        return [-1 + 2 * i / self.histogram_bins for i in range(self.histogram_bins + 1)]
+    
+    def result(self) -> Dict[str, Any]:
+        """
+        Compute the aggregated statistics.
+        
+        Returns:
+            A dictionary with sentiment counts, emotion distribution, average
+            sentiment, the compound score histogram and the number of
+            duplicate posts left out; in tiered mode also the standard error
+            of each emotion's estimate
+        """
+        # Calculate average compound score
+        average_sentiment = self.compound_total / self.post_count if self.post_count else 0
+        
+        # Calculate average emotion scores
+        emotion_distribution, emotion_errors = estimate_emotion_distribution(
+            self.emotion_totals, self.emotion_counts, self.sample_totals, self.sample_squares,
+            self.sample_size, self.sampled_population
+        )
+        
+        result = {
+            "sentiment_counts": dict(self.sentiment_counts),
+            "emotion_distribution": emotion_distribution,
+            "average_sentiment": average_sentiment,
+            "compound_histogram": list(self.compound_histogram),
+            "duplicate_posts": self.duplicate_posts
+        }
+        
+        if self.sampled_population:
+            result["emotion_distribution_error"] = emotion_errors
+        
+        return result
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize the partial aggregate, e.g. to store it between runs."""
+        return {
+            "histogram_bins": self.histogram_bins,
+            "max_clusters": self.max_clusters,
+            "sentiment_counts": dict(self.sentiment_counts),
+            "post_count": self.post_count,
+            "compound_total": self.compound_total,
+            "emotion_totals": dict(self.emotion_totals),
+            "emotion_counts": dict(self.emotion_counts),
+            "compound_histogram": list(self.compound_histogram),
+            "clusters": [[cluster_id, *contribution] for cluster_id, contribution in self.clusters.items()],
+            "duplicate_posts": self.duplicate_posts,
+            "sample_totals": dict(self.sample_totals),
+            "sample_squares": dict(self.sample_squares),
+            "sample_size": self.sample_size,
+            "sampled_population": self.sampled_population
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "SentimentAggregator":
+        """Rebuild a partial aggregate serialized with to_dict."""
+        aggregator = cls(histogram_bins=data["histogram_bins"], max_clusters=data.get("max_clusters", 10000))
+        aggregator.sentiment_counts = dict(data["sentiment_counts"])
+        aggregator.post_count = data["post_count"]
+        aggregator.compound_total = data["compound_total"]
+        aggregator.emotion_totals = dict(data["emotion_totals"])
+        aggregator.emotion_counts = dict(data["emotion_counts"])
+        aggregator.compound_histogram = list(data["compound_histogram"])
+        aggregator.clusters = OrderedDict(
+            (cluster_id, (category, compound_score, tier, dict(emotions)))
+            for cluster_id, category, compound_score, tier, emotions in data.get("clusters", [])
+        )
+        aggregator.duplicate_posts = data.get("duplicate_posts", 0)
+        aggregator.sample_totals = dict(data.get("sample_totals", {}))
+        aggregator.sample_squares = dict(data.get("sample_squares", {}))
+        aggregator.sample_size = data.get("sample_size", 0)
+        aggregator.sampled_population = data.get("sampled_population", 0)
+        return aggregator
@@ -1,9 +1,17 @@
+import os
+import random
 import logging
-import nltk
-from typing import Dict, List, Any, Tuple
-from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
-from transformers import pipeline, AutoModelForSequenceClassification, AutoTokenizer
-import torch
+import threading
+from importlib import metadata
+from typing import Dict, List, Any, Tuple, Optional, Iterable, Iterator
+import numpy as np
+
+from .cache import AnalysisCache
+from .aggregator import SentimentAggregator, MODEL_TIERS
+from .columnar import AnalysisColumns, ANALYSIS_KEYS, EMOTION_LABELS
+from .dedup import PostDeduplicator
+from .resources import ResourceManager, get_resource_manager
+from .vader_registry import get_vader_analyzer, get_vader_scorer
 
 # Set up logging
 logging.basicConfig(
@@ -12,34 +20,294 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Download necessary NLTK data
+# Using a pre-trained emotion classifier model
+EMOTION_MODEL_NAME = "j-hartmann/emotion-english-distilroberta-base"
+
+# Texts used to check the ONNX backend against PyTorch when it is loaded
+ONNX_CHECK_TEXTS = [
+    "I absolutely love this product! The customer service was excellent.",
+    "This is terrible. I hate it and will never buy it again.",
+    "The product arrived today. It has four components and a manual.",
+    "I'm worried the new update will break our workflow."
+]
+
 try:
-    nltk.download('punkt', quiet=True)
-    nltk.download('stopwords', quiet=True)
-except Exception as e:
-    logger.warning(f"Failed to download NLTK data: {str(e)}")
+    VADER_VERSION = metadata.version("vaderSentiment")
+except metadata.PackageNotFoundError:
+    VADER_VERSION = "unknown"
 
 class SentimentAnalyzer:
     """A class to analyze sentiment and emotions in text."""
     
-    def __init__(self):
-        """Initialize the sentiment analyzers."""
+    def __init__(self, batch_size: int = 32, long_text_mode: str = "truncate", window_overlap: int = 64,
+                 cache: Optional[AnalysisCache] = None, backend: str = "torch",
+                 onnx_dir: str = os.path.join(".cache", "onnx"), num_threads: Optional[int] = None,
+                 deduplicator: Optional[PostDeduplicator] = None, emotion_mode: str = "full",
+                 ambiguity_threshold: float = 0.5, sample_rate: float = 0.1, report_samples: int = 3,
+                 seed: Optional[int] = None, model_loading: str = "eager",
+                 resources: Optional[ResourceManager] = None):
+        """
+        Initialize the sentiment analyzers.
+        
+        Args:
+            batch_size: Number of token windows per forward pass of the emotion model
+            long_text_mode: How to handle texts longer than the model's token limit,
+                either "truncate" (score the first window only) or "chunk" (score
+                overlapping windows and average them)
+            window_overlap: Number of tokens shared by consecutive windows in "chunk" mode
+            cache: Optional persistent cache of analysis results
+            backend: Inference backend for the emotion model, either "torch" or
+                "onnx" (int8-quantized ONNX Runtime on the CPU)
+            onnx_dir: Directory where the ONNX export is stored
+            num_threads: Intra-op threads for emotion inference (None keeps the
+                library default of one thread per core)
+            deduplicator: Optional clusterer of duplicate posts; posts in a
+                cluster are analyzed once and share the result
+            emotion_mode: "full" runs the emotion model on every post; "tiered"
+                runs it only on posts with ambiguous VADER scores, a random
+                sample of the others and the report's sample posts, and the
+                aggregate estimates the emotion distribution from them
+            ambiguity_threshold: In "tiered" mode, posts whose absolute compound
+                score is below this are ambiguous
+            sample_rate: In "tiered" mode, fraction of the other posts scored
+                as a random sample
+            report_samples: In "tiered" mode, number of most positive and most
+                negative posts scored for the report
+            seed: Seed of the random sample
+            model_loading: When to load the emotion model: "eager" (here),
+                "lazy" (on first use) or "background" (in a thread started
+                here; until it is ready, posts get VADER results only)
+            resources: Resolves the VADER lexicons and model weights
+                (defaults to the process-wide offline resource manager)
+        """
+        if long_text_mode not in ("truncate", "chunk"):
+            raise ValueError(f"Unknown long_text_mode: {long_text_mode}")
+        if backend not in ("torch", "onnx"):
+            raise ValueError(f"Unknown backend: {backend}")
+        if emotion_mode not in ("full", "tiered"):
+            raise ValueError(f"Unknown emotion_mode: {emotion_mode}")
+        if model_loading not in ("eager", "lazy", "background"):
+            raise ValueError(f"Unknown model_loading: {model_loading}")
+        
+        self.batch_size = max(1, batch_size)
+        self.long_text_mode = long_text_mode
+        self.window_overlap = max(0, window_overlap)
+        self.cache = cache
+        self.num_threads = num_threads
+        self.deduplicator = deduplicator
+        self.emotion_mode = emotion_mode
+        self.ambiguity_threshold = ambiguity_threshold
+        self.sample_rate = sample_rate
+        self.report_samples = report_samples
+        self._rng = random.Random(seed)
+        
         # Initialize VADER sentiment analyzer
-        self.vader_analyzer = SentimentIntensityAnalyzer()
+        self.resources = resources or get_resource_manager()
+        self.vader_analyzer = get_vader_analyzer(self.resources)
+        self.vader_scorer = get_vader_scorer(self.resources)
+        
+        # The emotion classifier is loaded by load_emotion_model
+        self.backend = backend
+        self.onnx_dir = onnx_dir
+        self.onnx_model = None
+        self._classifier = None
+        self._model_revision = None
+        self._load_started = False
+        self._load_lock = threading.Lock()
+        self._loaded = threading.Event()
+        
+        if model_loading == "eager":
+            self.load_emotion_model()
+        elif model_loading == "background":
+            self.load_emotion_model(background=True)
+    
+    def load_emotion_model(self, background: bool = False) -> None:
+        """
+        Load the emotion classifier, unless it is loaded or loading already.
+        
+        Args:
+            background: Load in a daemon thread and return immediately
+        """
+        with self._load_lock:
+            if self._load_started:
+                return
+            self._load_started = True
         
-        # Initialize emotion classifier
+        if background:
+            threading.Thread(target=self._load_emotion_model, name="emotion-model-loader", daemon=True).start()
+        else:
+            self._load_emotion_model()
+    
+    def _load_emotion_model(self) -> None:
+        """Load the emotion classifier (and the ONNX backend if requested), then mark it ready."""
         try:
-            # Using a pre-trained emotion classifier model
-            model_name = "j-hartmann/emotion-english-distilroberta-base"
-            self.emotion_classifier = pipeline(
+            # transformers is imported here so that the VADER-only parts of
+            # this package work without it and import quickly
+            from transformers import pipeline
+            
+            if self.num_threads:
+                import torch
+                torch.set_num_threads(self.num_threads)
+            
+            model_path = self.resources.model_path(EMOTION_MODEL_NAME)
+            if model_path is None:
+                raise RuntimeError(f"{EMOTION_MODEL_NAME} is not available offline")
+            
+            self._classifier = pipeline(
                 "text-classification", 
-                model=model_name, 
+                model=model_path, 
                 return_all_scores=True
             )
+            self._model_revision = self.resources.model_revision(EMOTION_MODEL_NAME)
             logger.info("Emotion classifier loaded successfully")
         except Exception as e:
             logger.error(f"Failed to load emotion classifier: {str(e)}")
-            self.emotion_classifier = None
+            self._classifier = None
+        
+        if self.backend == "onnx" and self._classifier:
+            self._load_onnx_backend(self.onnx_dir)
+        
+        self._loaded.set()
+    
+    @property
+    def emotion_classifier(self):
+        """
+        The emotion classifier pipeline, or None if it is unavailable.
+        
+        In "lazy" mode the first access loads the model. While a background
+        load is running this is None, so analysis falls back to VADER only.
+        """
+        if not self._load_started:
+            self.load_emotion_model()
+        return self._classifier if self._loaded.is_set() else None
+    
+    @emotion_classifier.setter
+    def emotion_classifier(self, classifier) -> None:
+        """Replace the emotion classifier, e.g. with a preloaded pipeline."""
+        with self._load_lock:
+            self._load_started = True
+        self._classifier = classifier
+        self._model_revision = None
+        self._loaded.set()
+    
+    def is_ready(self) -> bool:
+        """Return whether the emotion model is loaded and in use."""
+        return self._loaded.is_set() and self._classifier is not None
+    
+    def wait_ready(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait for the emotion model, starting a background load if none has started.
+        
+        Args:
+            timeout: Seconds to wait at most (None waits until loading ends)
+            
+        Returns:
+            Whether the model is ready; False on timeout or if loading failed
+        """
+        self.load_emotion_model(background=True)
+        self._loaded.wait(timeout)
+        return self.is_ready()
+    
+    def _load_onnx_backend(self, onnx_dir: str) -> None:
+        """
+        Switch emotion inference to a quantized ONNX Runtime model.
+        
+        The model is exported and quantized once per revision. It is used
+        only if its scores on ONNX_CHECK_TEXTS stay within
+        ONNX_SCORE_TOLERANCE of the PyTorch scores. After that the PyTorch
+        weights are released. If anything fails, the PyTorch model stays in use.
+        
+        Args:
+            onnx_dir: Directory where the ONNX export is stored
+        """
+        try:
+            from .onnx_backend import OnnxEmotionModel, export_onnx_model, max_score_difference, ONNX_SCORE_TOLERANCE
+            
+            model = self._classifier.model
+            revision = self.model_revision
+            export_dir = os.path.join(onnx_dir, f"{EMOTION_MODEL_NAME.replace('/', '--')}@{revision}")
+            onnx_model = OnnxEmotionModel(export_onnx_model(model, export_dir), num_threads=self.num_threads or 0)
+            
+            # Check the quantized scores against PyTorch before switching
+            sample = self._classifier.tokenizer(ONNX_CHECK_TEXTS, padding=True, truncation=True, return_tensors="np")
+            difference = max_score_difference(model, onnx_model, [dict(sample)])
+            if difference > ONNX_SCORE_TOLERANCE:
+                logger.warning(f"ONNX scores differ from PyTorch by {difference:.4f}, keeping the PyTorch backend")
+                return
+            
+            self.onnx_model = onnx_model
+            
+            # Free the PyTorch weights, keeping the config and labels
+            model.to("meta")
+            logger.info(f"ONNX emotion backend loaded (max score difference {difference:.4f})")
+        
+        except Exception as e:
+            logger.error(f"Failed to load ONNX backend: {str(e)}. Using PyTorch.")
+    
+    @property
+    def model_revision(self) -> str:
+        """The revision of the emotion model, as recorded by the bundle or the hub cache."""
+        return self._model_revision or getattr(self._classifier.model.config, "_commit_hash", None) or "unknown"
+    
+    @property
+    def model_signature(self) -> str:
+        """Identify the models and settings that produce this analyzer's results."""
+        emotion_model = "none"
+        
+        if self.emotion_classifier:
+            emotion_model = f"{EMOTION_MODEL_NAME}@{self.model_revision}/{self.long_text_mode}"
+            if self.long_text_mode == "chunk":
+                emotion_model += f"-{self.window_overlap}"
+            if self.onnx_model:
+                emotion_model += "/onnx-int8"
+        
+        return f"vader-{VADER_VERSION}|{emotion_model}"
+    
+    def _is_cacheable(self, analysis_results: Dict[str, Any]) -> bool:
+        """Only cache results whose emotion scoring did not fail."""
+        return bool(analysis_results["emotions"]) or not self.emotion_classifier
+    
+    def _lookup_cache(self, texts: List[str], indices: List[int]) -> Tuple[Dict[int, str], Dict[int, Dict[str, Any]]]:
+        """
+        Look up several texts in the cache at once.
+        
+        Args:
+            texts: The texts being analyzed
+            indices: Positions of the texts to look up
+            
+        Returns:
+            The cache key of each looked up position and the cached results found
+        """
+        if not self.cache:
+            return {}, {}
+        
+        signature = self.model_signature
+        keys = {i: self.cache.make_key(texts[i], signature) for i in indices}
+        cached = self.cache.get_many(list(keys.values()))
+        return keys, {i: cached[key] for i, key in keys.items() if key in cached}
+    
+    def _store_in_cache(self, keys: Dict[int, str], results: Dict[int, Dict[str, Any]]) -> None:
+        """Write newly computed results back to the cache in bulk."""
+        if self.cache:
+            self.cache.put_many({
+                keys[i]: analysis_results for i, analysis_results in results.items()
+                if self._is_cacheable(analysis_results)
+            })
+    
+    @staticmethod
+    def _categorize(sentiment_scores: Dict[str, float]) -> Dict[str, Any]:
+        """Attach the sentiment category to VADER scores."""
+        if sentiment_scores['compound'] >= 0.05:
+            sentiment_category = "positive"
+        elif sentiment_scores['compound'] <= -0.05:
+            sentiment_category = "negative"
+        else:
+            sentiment_category = "neutral"
+        
+        return {
+            "scores": sentiment_scores,
+            "category": sentiment_category
+        }
     
     def analyze_sentiment(self, text: str) -> Dict[str, Any]:
         """
@@ -51,29 +319,31 @@ class SentimentAnalyzer:
         Returns:
             A dictionary containing sentiment scores and category
         """
-        try:
-            # Get VADER sentiment scores
-            sentiment_scores = self.vader_analyzer.polarity_scores(text)
-            
-            # Determine sentiment category
-            if sentiment_scores['compound'] >= 0.05:
-                sentiment_category = "positive"
-            elif sentiment_scores['compound'] <= -0.05:
-                sentiment_category = "negative"
-            else:
-                sentiment_category = "neutral"
+        return self.analyze_sentiment_batch([text])[0]
+    
+    def analyze_sentiment_batch(self, texts: List[str]) -> List[Dict[str, Any]]:
+        """
+        Analyze the sentiment of several texts with the batch VADER scorer.
+        
+        Args:
+            texts: The texts to analyze
             
-            return {
-                "scores": sentiment_scores,
-                "category": sentiment_category
-            }
+        Returns:
+            A list of dictionaries containing sentiment scores and category,
+            in the order of the input texts
+        """
+        try:
+            return [self._categorize(scores) for scores in self.vader_scorer.polarity_scores_batch(texts)]
         
         except Exception as e:
             logger.error(f"Error in sentiment analysis: {str(e)}")
-            return {
-                "scores": {"neg": 0, "neu": 0, "pos": 0, "compound": 0},
-                "category": "neutral"
-            }
+            return [
+                {
+                    "scores": {"neg": 0, "neu": 0, "pos": 0, "compound": 0},
+                    "category": "neutral"
+                }
+                for _ in texts
+            ]
     
     def analyze_emotion(self, text: str) -> Dict[str, float]:
         """
@@ -85,30 +355,220 @@ class SentimentAnalyzer:
         Returns:
             A dictionary mapping emotion labels to scores
         """
-        emotions = {}
-        
         if not self.emotion_classifier:
             logger.warning("Emotion classifier not available")
-            return emotions
+            return {}
         
         try:
-            # Truncate text if it's too long for the model
-            max_length = 512
-            if len(text.split()) > max_length:
-                text = ' '.join(text.split()[:max_length])
+            return self._score_texts([text])[0]
+        
+        except Exception as e:
+            logger.error(f"Error in emotion analysis: {str(e)}")
+            return {}
+    
+    def _max_tokens(self) -> int:
+        """Return the longest sequence, special tokens included, the model accepts."""
+        tokenizer = self.emotion_classifier.tokenizer
+        config = self.emotion_classifier.model.config
+        
+        # RoBERTa reserves two position embeddings for the padding offset
+        max_positions = getattr(config, "max_position_embeddings", 514) - 2
+        return min(tokenizer.model_max_length, max_positions)
+    
+    def _encode(self, texts: List[str]) -> List[List[List[int]]]:
+        """
+        Tokenize texts into model-sized windows of token ids.
+        
+        In "truncate" mode each text becomes a single window cut at the
+        model's token limit. In "chunk" mode each text is tokenized once
+        into overlapping windows that together cover all of it.
+        
+        Args:
+            texts: The texts to tokenize
+            
+        Returns:
+            A list of windows (token id sequences) for each text
+        """
+        tokenizer = self.emotion_classifier.tokenizer
+        max_tokens = self._max_tokens()
+        
+        if self.long_text_mode != "chunk":
+            encoded = tokenizer(texts, truncation=True, max_length=max_tokens)["input_ids"]
+            return [[ids] for ids in encoded]
+        
+        # The tokenizer emits the overflowing windows of every text in one call
+        encoded = tokenizer(
+            texts,
+            truncation=True,
+            max_length=max_tokens,
+            stride=min(self.window_overlap, max_tokens // 2),
+            return_overflowing_tokens=True
+        )
+        
+        all_windows = [[] for _ in texts]
+        for ids, text_index in zip(encoded["input_ids"], encoded["overflow_to_sample_mapping"]):
+            all_windows[text_index].append(ids)
+        
+        return all_windows
+    
+    def _forward(self, batch_ids: List[List[int]]) -> List[List[float]]:
+        """
+        Run one padded forward pass of the emotion model.
+        
+        Args:
+            batch_ids: Token id sequences to score together
+            
+        Returns:
+            A list of label probability rows, one per sequence
+        """
+        tokenizer = self.emotion_classifier.tokenizer
+        model = self.emotion_classifier.model
+        
+        if self.onnx_model:
+            inputs = tokenizer.pad({"input_ids": batch_ids}, return_tensors="np")
+            return self.onnx_model.predict_proba(inputs["input_ids"], inputs["attention_mask"]).tolist()
+        
+        import torch
+        
+        # Pad only up to the longest sequence in this batch
+        inputs = tokenizer.pad({"input_ids": batch_ids}, return_tensors="pt")
+        with torch.no_grad():
+            logits = model(**inputs).logits
+        return torch.softmax(logits, dim=-1).tolist()
+    
+    @property
+    def emotion_labels(self) -> Tuple[str, ...]:
+        """Return the emotion labels in the model's output order."""
+        if not self.emotion_classifier:
+            return EMOTION_LABELS
+        id2label = self.emotion_classifier.model.config.id2label
+        return tuple(id2label[label_id] for label_id in range(len(id2label)))
+    
+    def _score_matrix(self, texts: List[str]) -> np.ndarray:
+        """
+        Score the emotions of texts with length-bucketed batches.
+        
+        All windows of all texts are sorted by token length and scored in
+        batches of ``batch_size``, so each batch carries as little padding
+        as possible. Window scores are averaged per text, weighted by the
+        number of tokens in each window.
+        
+        Args:
+            texts: The texts to score
+            
+        Returns:
+            A float32 matrix with one row per text and one column per
+            emotion label; rows of texts without windows are NaN
+        """
+        # Flatten the windows, remembering which text each belongs to
+        windows = []
+        owners = []
+        for text_index, text_windows in enumerate(self._encode(texts)):
+            windows.extend(text_windows)
+            owners.extend([text_index] * len(text_windows))
+        
+        sums = np.zeros((len(texts), len(self.emotion_labels)), dtype=np.float64)
+        weights = np.zeros(len(texts), dtype=np.float64)
+        
+        # Group windows of similar length into the same batch
+        order = sorted(range(len(windows)), key=lambda i: len(windows[i]))
+        
+        for start in range(0, len(order), self.batch_size):
+            batch_indices = order[start:start + self.batch_size]
+            probabilities = np.asarray(self._forward([windows[i] for i in batch_indices]), dtype=np.float64)
+            batch_owners = [owners[i] for i in batch_indices]
+            batch_weights = np.array([len(windows[i]) for i in batch_indices], dtype=np.float64)
+            
+            np.add.at(sums, batch_owners, probabilities * batch_weights[:, None])
+            np.add.at(weights, batch_owners, batch_weights)
+        
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return (sums / weights[:, None]).astype(np.float32)
+    
+    def _score_texts(self, texts: List[str]) -> List[Dict[str, float]]:
+        """
+        Score the emotions of texts as dictionaries.
+        
+        Args:
+            texts: The texts to score
             
-            # Get emotion scores
-            emotion_results = self.emotion_classifier(text)[0]
+        Returns:
+            A list of dictionaries mapping emotion labels to scores
+        """
+        labels = self.emotion_labels
+        results = []
+        
+        for row in self._score_matrix(texts):
+            if np.isnan(row).any():
+                results.append({})
+            else:
+                results.append({label: float(score) for label, score in zip(labels, row)})
+        
+        return results
+    
+    def analyze_emotions_batch(self, texts: List[str]) -> List[Dict[str, float]]:
+        """
+        Analyze the emotions in several texts using batched inference.
+        
+        If a batch fails, the texts are scored one at a time instead, so
+        that one bad text only loses its own scores.
+        
+        Args:
+            texts: The texts to analyze
             
-            # Convert to dictionary
-            for emotion in emotion_results:
-                emotions[emotion['label']] = emotion['score']
+        Returns:
+            A list of dictionaries mapping emotion labels to scores, in the
+            order of the input texts
+        """
+        if not texts:
+            return []
+        
+        if not self.emotion_classifier:
+            logger.warning("Emotion classifier not available")
+            return [{} for _ in texts]
+        
+        try:
+            return self._score_texts(texts)
+        
+        except Exception as e:
+            logger.error(f"Error in batched emotion analysis, scoring posts one at a time: {str(e)}")
+            return [self.analyze_emotion(text) for text in texts]
+    
+    def analyze_emotions_matrix(self, texts: List[str]) -> np.ndarray:
+        """
+        Analyze the emotions in several texts, returning a score matrix.
+        
+        If a batch fails, the texts are scored one at a time instead, like
+        analyze_emotions_batch.
+        
+        Args:
+            texts: The texts to analyze
             
-            return emotions
+        Returns:
+            A float32 matrix with one row per text and one column per label
+            in emotion_labels; rows are NaN where scoring was not possible
+        """
+        missing = np.full((len(texts), len(self.emotion_labels)), np.nan, dtype=np.float32)
+        
+        if not texts:
+            return missing
+        
+        if not self.emotion_classifier:
+            logger.warning("Emotion classifier not available")
+            return missing
+        
+        try:
+            return self._score_matrix(texts)
         
         except Exception as e:
-            logger.error(f"Error in emotion analysis: {str(e)}")
-            return emotions
+            logger.error(f"Error in batched emotion analysis, scoring posts one at a time: {str(e)}")
+        
+        for i, text in enumerate(texts):
+            try:
+                missing[i] = self._score_matrix([text])[0]
+            except Exception as e:
+                logger.error(f"Error in emotion analysis: {str(e)}")
+        return missing
     
     def analyze_text(self, text: str) -> Dict[str, Any]:
         """
@@ -129,94 +589,292 @@ class SentimentAnalyzer:
                 "emotions": {}
             }
         
+        # Check the cache first
+        if self.cache:
+            key = self.cache.make_key(text, self.model_signature)
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+        
         # Analyze sentiment
         sentiment = self.analyze_sentiment(text)
         
         # Analyze emotions
         emotions = self.analyze_emotion(text)
         
-        return {
+        analysis_results = {
             "sentiment": sentiment,
             "emotions": emotions
         }
+        
+        if self.cache and self._is_cacheable(analysis_results):
+            self.cache.put(key, analysis_results)
+        
+        return analysis_results
+    
+    def _select_tiers(self, compound_scores: List[float]) -> List[str]:
+        """
+        Choose which posts the emotion model scores in "tiered" mode.
+        
+        Args:
+            compound_scores: VADER compound scores of the posts to analyze
+            
+        Returns:
+            The tier of each post: "ambiguous", "sample" or "report" for
+            posts the model scores, "skipped" for the others
+        """
+        tiers = []
+        for score in compound_scores:
+            if abs(score) < self.ambiguity_threshold:
+                tiers.append("ambiguous")
+            elif self._rng.random() < self.sample_rate:
+                tiers.append("sample")
+            else:
+                tiers.append("skipped")
+        
+        # The report shows the most positive and most negative posts with their emotions
+        by_score = sorted(range(len(compound_scores)), key=lambda k: compound_scores[k])
+        extremes = by_score[:self.report_samples] + by_score[-self.report_samples:] if self.report_samples else []
+        for k in extremes:
+            if tiers[k] == "skipped":
+                tiers[k] = "report"
+        
+        return tiers
+    
+    def _score_tiered(self, texts: List[str], sentiments: List[Dict[str, Any]]) -> Tuple[Optional[List[str]], List[int]]:
+        """
+        Select the texts for the emotion model.
+        
+        Args:
+            texts: The texts to analyze
+            sentiments: Their VADER results
+            
+        Returns:
+            The tier of each text (None in "full" mode) and the positions of
+            the texts the model should score
+        """
+        if self.emotion_mode != "tiered":
+            return None, list(range(len(texts)))
+        
+        tiers = self._select_tiers([sentiment["scores"]["compound"] for sentiment in sentiments])
+        return tiers, [k for k, tier in enumerate(tiers) if tier in MODEL_TIERS]
+    
+    def _cluster_posts(self, posts: List[Dict[str, Any]]) -> Tuple[List[int], List[Dict[str, Any]]]:
+        """
+        Collapse duplicate posts before inference.
+        
+        Args:
+            posts: Posts with text
+            
+        Returns:
+            The representative index of each post, and the posts to analyze
+            with their cluster id and size recorded
+        """
+        clusters, clustered_posts = self.deduplicator.cluster_posts(posts)
+        logger.info(f"Collapsed {len(posts)} posts into {len(set(clusters))} clusters")
+        return clusters, clustered_posts
     
     def analyze_posts(self, posts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
         Analyze sentiment and emotions for a list of posts.
         
+        With a deduplicator, each cluster of duplicate posts is analyzed
+        once and every member gets the result, along with the cluster's
+        "cluster_id" and "cluster_size".
+        
         Args:
             posts: A list of post dictionaries with 'text' keys
             
         Returns:
             The posts with added sentiment and emotion analysis results
         """
-        analyzed_posts = []
+        # Skip posts without text
+        posts = [post for post in posts if post.get("text")]
         
-        for post in posts:
-            if "text" not in post or not post["text"]:
-                continue
+        if self.deduplicator:
+            clusters, posts = self._cluster_posts(posts)
+            representatives = sorted(set(clusters))
+            analyzed = dict(zip(representatives, self._analyze_distinct_posts([posts[i] for i in representatives])))
+            return PostDeduplicator.fan_out(posts, clusters, analyzed)
+        
+        return self._analyze_distinct_posts(posts)
+    
+    def _analyze_distinct_posts(self, posts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Analyze posts that all have text, in batches.
+        
+        Args:
+            posts: A list of post dictionaries with non-empty 'text' keys
             
-            # Analyze text
-            analysis_results = self.analyze_text(post["text"])
+        Returns:
+            The posts with added sentiment and emotion analysis results
+        """
+        texts = [post["text"] for post in posts]
+        non_blank = [i for i, text in enumerate(texts) if text.strip()]
+        
+        # Look up all non-blank posts in the cache at once
+        keys, results_by_index = self._lookup_cache(texts, non_blank)
+        
+        tiers_by_index = {i: "cached" for i in results_by_index}
+        
+        # Score the remaining posts in batches
+        pending = [i for i in non_blank if i not in results_by_index]
+        pending_texts = [texts[i] for i in pending]
+        batch_sentiments = self.analyze_sentiment_batch(pending_texts)
+        
+        # In tiered mode only some of the posts go through the emotion model
+        tiers, scored = self._score_tiered(pending_texts, batch_sentiments)
+        batch_emotions = [{} for _ in pending]
+        for k, emotions in zip(scored, self.analyze_emotions_batch([pending_texts[k] for k in scored])):
+            batch_emotions[k] = emotions
+        
+        for k, (i, sentiment, emotions) in enumerate(zip(pending, batch_sentiments, batch_emotions)):
+            results_by_index[i] = {
+                "sentiment": sentiment,
+                "emotions": emotions
+            }
+            if tiers:
+                tiers_by_index[i] = tiers[k]
+        
+        # Write the new results back in bulk
+        self._store_in_cache(keys, {i: results_by_index[i] for i in pending})
+        
+        analyzed_posts = []
+        
+        for i, post in enumerate(posts):
+            if i in results_by_index:
+                analysis_results = results_by_index[i]
+            else:
+                analysis_results = self.analyze_text(post["text"])
             
             # Add analysis results to post
             post_with_analysis = {**post, **analysis_results}
+            if self.emotion_mode == "tiered" and i in tiers_by_index:
+                post_with_analysis["emotion_tier"] = tiers_by_index[i]
             analyzed_posts.append(post_with_analysis)
         
         return analyzed_posts
     
-    def get_aggregated_results(self, analyzed_posts: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def analyze_posts_columnar(self, posts: List[Dict[str, Any]]) -> AnalysisColumns:
         """
-        Aggregate sentiment and emotion analysis results.
+        Analyze posts into a columnar store instead of nested dictionaries.
+        
+        Sentiment scores and categories are written straight into NumPy
+        columns and emotion scores into an N x labels matrix. Iterating the
+        result yields the same dictionaries as analyze_posts.
         
         Args:
-            analyzed_posts: A list of posts with sentiment and emotion analysis results
+            posts: A list of post dictionaries with 'text' keys
             
         Returns:
-            A dictionary with aggregated statistics
+            The analyzed posts as AnalysisColumns
         """
-        if not analyzed_posts:
-            return {
-                "sentiment_counts": {"positive": 0, "neutral": 0, "negative": 0},
-                "emotion_distribution": {},
-                "average_sentiment": 0
-            }
+        # Skip posts without text
+        posts = [post for post in posts if post.get("text")]
         
-        # Count sentiment categories
-        sentiment_counts = {"positive": 0, "neutral": 0, "negative": 0}
-        compound_scores = []
+        if self.deduplicator:
+            clusters, posts = self._cluster_posts(posts)
+            representatives = sorted(set(clusters))
+            analyzed = self._analyze_distinct_columnar([posts[i] for i in representatives])
+            rows = {representative: row for row, representative in enumerate(representatives)}
+            records = self._records(posts)
+            for record, i in zip(records, clusters):
+                if "emotion_tier" in analyzed.records[rows[i]]:
+                    record["emotion_tier"] = analyzed.records[rows[i]]["emotion_tier"]
+            return analyzed.take([rows[i] for i in clusters], records)
         
-        # Aggregate emotions
-        all_emotions = {}
+        return self._analyze_distinct_columnar(posts)
+    
+    @staticmethod
+    def _records(posts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Return the posts without analysis results."""
+        return [{key: value for key, value in post.items() if key not in ANALYSIS_KEYS} for post in posts]
+    
+    def _analyze_distinct_columnar(self, posts: List[Dict[str, Any]]) -> AnalysisColumns:
+        """
+        Analyze posts that all have text into a columnar store.
         
-        for post in analyzed_posts:
-            # Count sentiment categories
-            category = post.get("sentiment", {}).get("category", "neutral")
-            sentiment_counts[category] = sentiment_counts.get(category, 0) + 1
+        Args:
+            posts: A list of post dictionaries with non-empty 'text' keys
             
-            # Collect compound scores
-            compound_score = post.get("sentiment", {}).get("scores", {}).get("compound", 0)
-            compound_scores.append(compound_score)
+        Returns:
+            The analyzed posts as AnalysisColumns
+        """
+        columns = AnalysisColumns(self._records(posts), self.emotion_labels)
+        
+        texts = [post["text"] for post in posts]
+        non_blank = [i for i, text in enumerate(texts) if text.strip()]
+        
+        keys, cached = self._lookup_cache(texts, non_blank)
+        for i, analysis_results in cached.items():
+            columns.set_analysis(i, analysis_results)
+        
+        pending = [i for i in non_blank if i not in cached]
+        pending_texts = [texts[i] for i in pending]
+        sentiments = self.analyze_sentiment_batch(pending_texts)
+        for i, sentiment in zip(pending, sentiments):
+            columns.set_sentiment(i, sentiment)
+        
+        # In tiered mode only some of the posts go through the emotion model
+        tiers, scored = self._score_tiered(pending_texts, sentiments)
+        columns.emotions[[pending[k] for k in scored]] = self.analyze_emotions_matrix([pending_texts[k] for k in scored])
+        
+        if tiers:
+            for i in cached:
+                columns.records[i]["emotion_tier"] = "cached"
+            for i, tier in zip(pending, tiers):
+                columns.records[i]["emotion_tier"] = tier
+        
+        self._store_in_cache(keys, {i: columns.analysis(i) for i in pending})
+        
+        return columns
+    
+    def iter_analyze(self, posts: Iterable[Dict[str, Any]], chunk_size: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Analyze a stream of posts, yielding analyzed posts as they are ready.
+        
+        Posts are collected into chunks so that the emotion model still runs
+        in length-bucketed batches, but only one chunk is held in memory at a
+        time. Posts without text are skipped, as in analyze_posts.
+        
+        Args:
+            posts: Any iterable of post dictionaries with 'text' keys
+            chunk_size: Number of posts analyzed together (defaults to 8 batches)
             
-            # Aggregate emotions
-            for emotion, score in post.get("emotions", {}).items():
-                if emotion not in all_emotions:
-                    all_emotions[emotion] = []
-                all_emotions[emotion].append(score)
+        Yields:
+            The posts with added sentiment and emotion analysis results
+        """
+        chunk_size = chunk_size or self.batch_size * 8
+        chunk = []
         
-        # Calculate average compound score
-        average_sentiment = sum(compound_scores) / len(compound_scores) if compound_scores else 0
+        for post in posts:
+            chunk.append(post)
+            if len(chunk) >= chunk_size:
+                yield from self.analyze_posts(chunk)
+                chunk = []
         
-        # Calculate average emotion scores
-        emotion_distribution = {}
-        for emotion, scores in all_emotions.items():
-            emotion_distribution[emotion] = sum(scores) / len(scores) if scores else 0
+        if chunk:
+            yield from self.analyze_posts(chunk)
+    
+    def get_aggregated_results(self, analyzed_posts: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Aggregate sentiment and emotion analysis results.
         
-        return {
-            "sentiment_counts": sentiment_counts,
-            "emotion_distribution": emotion_distribution,
-            "average_sentiment": average_sentiment
-        }
+        The posts are consumed in a single pass, so a generator such as
+        iter_analyze can be passed directly. Use SentimentAggregator to
+        build partial aggregates that can be merged later.
+        
+        Args:
+            analyzed_posts: An iterable of posts with sentiment and emotion analysis
+                results, or AnalysisColumns (aggregated with vectorized operations)
+            
+        Returns:
+            A dictionary with aggregated statistics
+        """
+        if isinstance(analyzed_posts, AnalysisColumns):
+            return analyzed_posts.aggregate()
+        
+        return SentimentAggregator().update_many(analyzed_posts).result()
 
 # For testing purposes
 if __name__ == "__main__":
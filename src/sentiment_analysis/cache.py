@@ -0,0 +1,237 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import argparse
+import threading
+from typing import Dict, List, Any, Optional
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+class AnalysisCache:
+    """A persistent, content-addressed cache of text analysis results."""
+    
+    def __init__(self, path: str = os.path.join(".cache", "analysis.sqlite"), max_size_mb: float = 256):
+        """
+        Open (or create) the cache database.
+        
+        Args:
+            path: Path to the SQLite database file
+            max_size_mb: Total size of cached results above which the least
+                recently used entries are evicted
+        """
+        self.path = path
+        self.max_size_bytes = int(max_size_mb * 1024 * 1024)
+        
+        # Hits and misses seen by this instance
+        self.session_hits = 0
+        self.session_misses = 0
+        
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        
+        self._lock = threading.Lock()
+        # Parallel workers share the file, so wait for each other's writes
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS results (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                last_access REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_results_last_access ON results (last_access);
+            CREATE TABLE IF NOT EXISTS stats (
+                name TEXT PRIMARY KEY,
+                value INTEGER NOT NULL
+            );
+            INSERT OR IGNORE INTO stats (name, value) VALUES ('hits', 0), ('misses', 0);
+        """)
+        self._conn.commit()
+    
+    @staticmethod
+    def normalize_text(text: str) -> str:
+        """Collapse whitespace so that trivially different copies share a key."""
+        return " ".join(text.split())
+    
+    def make_key(self, text: str, model_signature: str) -> str:
+        """
+        Build the cache key for a text analyzed by a given model configuration.
+        
+        Args:
+            text: The text being analyzed
+            model_signature: Identifies the models and versions producing the result
+        
+        Returns:
+            A hex SHA-256 digest
+        """
+        payload = f"{model_signature}\n{self.normalize_text(text)}"
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached result for a key, or None on a miss."""
+        return self.get_many([key]).get(key)
+    
+    def get_many(self, keys: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Look up several keys at once.
+        
+        Args:
+            keys: The keys to look up
+        
+        Returns:
+            A dictionary with the cached results of the keys that were found
+        """
+        found = {}
+        unique_keys = list(dict.fromkeys(keys))
+        
+        with self._lock:
+            # Stay well below SQLite's limit on bound parameters
+            for start in range(0, len(unique_keys), 500):
+                chunk = unique_keys[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT key, value FROM results WHERE key IN ({placeholders})", chunk
+                ).fetchall()
+                for key, value in rows:
+                    found[key] = json.loads(value)
+            
+            hits = sum(1 for key in keys if key in found)
+            misses = len(keys) - hits
+            now = time.time()
+            
+            self._conn.executemany(
+                "UPDATE results SET last_access = ? WHERE key = ?",
+                [(now, key) for key in found]
+            )
+            self._conn.execute("UPDATE stats SET value = value + ? WHERE name = 'hits'", (hits,))
+            self._conn.execute("UPDATE stats SET value = value + ? WHERE name = 'misses'", (misses,))
+            self._conn.commit()
+        
+        self.session_hits += hits
+        self.session_misses += misses
+        return found
+    
+    def put(self, key: str, value: Dict[str, Any]) -> None:
+        """Store a single result."""
+        self.put_many({key: value})
+    
+    def put_many(self, items: Dict[str, Dict[str, Any]]) -> None:
+        """
+        Store several results in one transaction, evicting old entries if needed.
+        
+        Args:
+            items: A dictionary mapping keys to analysis results
+        """
+        if not items:
+            return
+        
+        now = time.time()
+        rows = []
+        for key, value in items.items():
+            serialized = json.dumps(value)
+            rows.append((key, serialized, len(serialized), now))
+        
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO results (key, value, size, last_access) VALUES (?, ?, ?, ?)",
+                rows
+            )
+            self._conn.commit()
+            self._evict()
+    
+    def _evict(self) -> int:
+        """
+        Remove least recently used entries until the cache fits its size limit.
+        
+        Evicts down to 90% of the limit so that a full cache does not evict
+        on every write. The caller must hold the lock.
+        
+        Returns:
+            The number of evicted entries
+        """
+        total_size = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+        if total_size <= self.max_size_bytes:
+            return 0
+        
+        target_size = int(self.max_size_bytes * 0.9)
+        evicted_keys = []
+        
+        for key, size in self._conn.execute("SELECT key, size FROM results ORDER BY last_access"):
+            if total_size <= target_size:
+                break
+            evicted_keys.append((key,))
+            total_size -= size
+        
+        self._conn.executemany("DELETE FROM results WHERE key = ?", evicted_keys)
+        self._conn.commit()
+        
+        logger.info(f"Evicted {len(evicted_keys)} entries from the analysis cache")
+        return len(evicted_keys)
+    
+    def stats(self) -> Dict[str, Any]:
+        """
+        Report the size and hit rate of the cache.
+        
+        Returns:
+            A dictionary with entry count, size, and lifetime and session hit rates
+        """
+        with self._lock:
+            entries, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results"
+            ).fetchone()
+            counters = dict(self._conn.execute("SELECT name, value FROM stats").fetchall())
+        
+        hits = counters.get("hits", 0)
+        misses = counters.get("misses", 0)
+        session_lookups = self.session_hits + self.session_misses
+        
+        return {
+            "entries": entries,
+            "size_bytes": size,
+            "max_size_bytes": self.max_size_bytes,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / (hits + misses) if hits + misses else 0,
+            "session_hit_rate": self.session_hits / session_lookups if session_lookups else 0
+        }
+    
+    def clear(self) -> None:
+        """Remove all entries and reset the counters."""
+        with self._lock:
+            self._conn.execute("DELETE FROM results")
+            self._conn.execute("UPDATE stats SET value = 0")
+            self._conn.commit()
+    
+    def close(self) -> None:
+        """Close the database connection."""
+        self._conn.close()
+
+# Command line interface for inspecting the cache
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Inspect the sentiment analysis cache')
+    parser.add_argument('command', choices=['stats', 'clear'], help='Action to perform')
+    parser.add_argument('--path', default=os.path.join(".cache", "analysis.sqlite"), help='Path to the cache database')
+    args = parser.parse_args()
+    
+    cache = AnalysisCache(args.path)
+    
+    if args.command == 'clear':
+        cache.clear()
+        print(f"Cleared {args.path}")
+    else:
+        stats = cache.stats()
+        print(f"Entries: {stats['entries']}")
+        print(f"Size: {stats['size_bytes'] / 1024 / 1024:.1f} MB of {stats['max_size_bytes'] / 1024 / 1024:.1f} MB")
+        print(f"Hits: {stats['hits']}, misses: {stats['misses']}")
+        print(f"Hit rate: {stats['hit_rate']:.1%}")
+    
+    cache.close()
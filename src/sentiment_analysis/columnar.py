@@ -0,0 +1,266 @@
+from typing import Dict, List, Any, Iterator, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .aggregator import estimate_emotion_distribution, SAMPLED_POPULATION_TIERS
+
+# Sentiment categories in the order of their int8 codes
+CATEGORIES = ("positive", "neutral", "negative")
+
+# Labels of j-hartmann/emotion-english-distilroberta-base
+EMOTION_LABELS = ("anger", "disgust", "fear", "joy", "neutral", "sadness", "surprise")
+
+# Keys holding analysis results, which are stored as columns instead of in the post records
+ANALYSIS_KEYS = ("sentiment", "emotions")
+
+class AnalysisColumns:
+    """A columnar store of analyzed posts backed by NumPy arrays."""
+    
+    def __init__(self, records: List[Dict[str, Any]], emotion_labels: Sequence[str] = EMOTION_LABELS):
+        """
+        Allocate columns for a list of posts.
+        
+        Sentiment scores start out neutral and emotion scores start out
+        missing (NaN) until they are filled in.
+        
+        Args:
+            records: The posts without analysis results (text, date, author, ...)
+            emotion_labels: The emotion labels, in column order
+        """
+        size = len(records)
+        self.records = records
+        self.emotion_labels = tuple(emotion_labels)
+        
+        self.compound = np.zeros(size, dtype=np.float32)
+        self.pos = np.zeros(size, dtype=np.float32)
+        self.neg = np.zeros(size, dtype=np.float32)
+        self.neu = np.ones(size, dtype=np.float32)
+        self.category = np.full(size, CATEGORIES.index("neutral"), dtype=np.int8)
+        self.emotions = np.full((size, len(self.emotion_labels)), np.nan, dtype=np.float32)
+    
+    @classmethod
+    def from_posts(cls, analyzed_posts: Sequence[Dict[str, Any]],
+                   emotion_labels: Sequence[str] = EMOTION_LABELS) -> "AnalysisColumns":
+        """
+        Build columns from analyzed posts in the nested dictionary format.
+        
+        Args:
+            analyzed_posts: Posts with "sentiment" and "emotions" results
+            emotion_labels: The emotion labels, in column order
+        
+        Returns:
+            The columnar store
+        """
+        records = [{key: value for key, value in post.items() if key not in ANALYSIS_KEYS} for post in analyzed_posts]
+        columns = cls(records, emotion_labels)
+        for i, post in enumerate(analyzed_posts):
+            columns.set_analysis(i, post)
+        return columns
+    
+    def set_sentiment(self, index: int, sentiment: Dict[str, Any]) -> None:
+        """Store the VADER result of one post."""
+        scores = sentiment.get("scores", {})
+        self.compound[index] = scores.get("compound", 0)
+        self.pos[index] = scores.get("pos", 0)
+        self.neg[index] = scores.get("neg", 0)
+        self.neu[index] = scores.get("neu", 0)
+        self.category[index] = CATEGORIES.index(sentiment.get("category", "neutral"))
+    
+    def set_emotions(self, index: int, emotions: Dict[str, float]) -> None:
+        """Store the emotion scores of one post, ignoring unknown labels."""
+        for column, label in enumerate(self.emotion_labels):
+            self.emotions[index, column] = emotions.get(label, np.nan)
+    
+    def set_analysis(self, index: int, analysis_results: Dict[str, Any]) -> None:
+        """Store a full analysis result of one post."""
+        self.set_sentiment(index, analysis_results.get("sentiment", {}))
+        self.set_emotions(index, analysis_results.get("emotions", {}))
+    
+    def analysis(self, index: int) -> Dict[str, Any]:
+        """
+        Return the analysis results of one post in the nested dictionary format.
+        
+        VADER rounds its scores to four decimals, so rounding recovers the
+        exact values from float32.
+        """
+        emotions = {
+            label: float(score)
+            for label, score in zip(self.emotion_labels, self.emotions[index])
+            if not np.isnan(score)
+        }
+        return {
+            "sentiment": {
+                "scores": {
+                    "neg": round(float(self.neg[index]), 4),
+                    "neu": round(float(self.neu[index]), 4),
+                    "pos": round(float(self.pos[index]), 4),
+                    "compound": round(float(self.compound[index]), 4)
+                },
+                "category": CATEGORIES[self.category[index]]
+            },
+            "emotions": emotions
+        }
+    
+    def take(self, rows: Sequence[int], records: List[Dict[str, Any]]) -> "AnalysisColumns":
+        """
+        Build a store whose posts reuse the analysis of existing rows.
+        
+        Used to fan the result of each cluster's representative out to the
+        cluster's members.
+        
+        Args:
+            rows: For each new post, the row whose analysis it gets
+            records: The new posts without analysis results
+        
+        Returns:
+            The new columnar store
+        """
+        rows = np.asarray(rows, dtype=np.int64)
+        columns = AnalysisColumns(records, self.emotion_labels)
+        columns.compound = self.compound[rows]
+        columns.pos = self.pos[rows]
+        columns.neg = self.neg[rows]
+        columns.neu = self.neu[rows]
+        columns.category = self.category[rows]
+        columns.emotions = self.emotions[rows]
+        return columns
+    
+    def first_in_cluster(self) -> np.ndarray:
+        """Return a mask of the posts that are not repeats of an earlier post's cluster."""
+        mask = np.ones(len(self), dtype=bool)
+        seen = set()
+        for index, record in enumerate(self.records):
+            cluster_id = record.get("cluster_id")
+            if cluster_id is None:
+                continue
+            if cluster_id in seen:
+                mask[index] = False
+            seen.add(cluster_id)
+        return mask
+    
+    def __len__(self) -> int:
+        return len(self.records)
+    
+    def __getitem__(self, index: int) -> Dict[str, Any]:
+        """Return a dictionary view of one analyzed post, as produced by analyze_posts."""
+        return {**self.records[index], **self.analysis(index)}
+    
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for index in range(len(self)):
+            yield self[index]
+    
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        """Return all posts as dictionaries, e.g. for JSON serialization."""
+        return list(self)
+    
+    def top_k(self, k: int, largest: bool = True) -> np.ndarray:
+        """
+        Return the indices of the k posts with the highest (or lowest) compound score.
+        
+        Ties rank as in a stable sort from highest to lowest score: earlier
+        posts first among the highest scores, later posts first among the
+        lowest.
+        
+        Args:
+            k: Number of posts
+            largest: Select the highest scores if True, the lowest otherwise
+        
+        Returns:
+            Indices ordered from the most extreme score inwards
+        """
+        k = min(k, len(self))
+        if k == 0:
+            return np.array([], dtype=np.int64)
+        
+        keys = -self.compound if largest else self.compound
+        if k < len(self):
+            candidates = np.argpartition(keys, k - 1)[:k]
+            # Include every post tied with the k-th score, then sort stably by position
+            candidates = np.flatnonzero(keys <= keys[candidates].max())
+        else:
+            candidates = np.arange(len(self))
+        if not largest:
+            # Sorting the positions in reverse puts later posts first among ties
+            candidates = candidates[::-1]
+        return candidates[np.argsort(keys[candidates], kind="stable")][:k]
+    
+    def sample_posts(self, k: int = 3) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Select the most positive and most negative posts for a report.
+        
+        Returns:
+            The most positive posts, highest score first, and the most
+            negative posts, least negative first
+        """
+        most_positive = [self[i] for i in self.top_k(k)]
+        bottom = np.sort(self.top_k(k, largest=False))
+        bottom = bottom[np.argsort(-self.compound[bottom], kind="stable")]
+        return most_positive, [self[i] for i in bottom]
+    
+    def sentiment_counts(self, mask: Optional[np.ndarray] = None) -> Dict[str, int]:
+        """Count the posts (optionally only those in mask) in each sentiment category."""
+        categories = self.category if mask is None else self.category[mask]
+        counts = np.bincount(categories, minlength=len(CATEGORIES))
+        return {category: int(count) for category, count in zip(CATEGORIES, counts)}
+    
+    def aggregate(self, histogram_bins: int = 20) -> Dict[str, Any]:
+        """
+        Compute the same statistics as SentimentAggregator.result with vectorized operations.
+        
+        Like SentimentAggregator, each cluster of duplicate posts counts once
+        and tiered-mode posts feed an estimate of the emotion distribution.
+        
+        Args:
+            histogram_bins: Number of equal-width compound score bins over [-1, 1]
+        
+        Returns:
+            A dictionary with sentiment counts, emotion distribution, average
+            sentiment, the compound score histogram and the number of
+            duplicate posts left out; in tiered mode also the standard error
+            of each emotion's estimate
+        """
+        mask = self.first_in_cluster()
+        
+        # Recover VADER's four-decimal scores so that bin edges match the aggregator
+        compound = np.round(self.compound[mask].astype(np.float64), 4)
+        average_sentiment = float(compound.mean()) if len(compound) else 0
+        
+        # Split off the random sample of tiered mode and the posts it stands for
+        tiers = np.array([record.get("emotion_tier") for record in self.records], dtype=object)[mask]
+        sampled_population = np.isin(tiers, SAMPLED_POPULATION_TIERS)
+        emotions = self.emotions[mask].astype(np.float64)
+        scored = ~np.isnan(emotions)
+        in_sample = (tiers == "sample") & scored.any(axis=1)
+        observed = ~sampled_population
+        
+        # Average each emotion over the posts that have a score for it
+        counts = (scored & observed[:, None]).sum(axis=0)
+        totals = np.where(scored & observed[:, None], emotions, 0).sum(axis=0)
+        sample_values = np.where(scored[in_sample], emotions[in_sample], 0)
+        sample_totals = sample_values.sum(axis=0)
+        sample_squares = (sample_values * sample_values).sum(axis=0)
+        
+        emotion_distribution, emotion_errors = estimate_emotion_distribution(
+            {label: float(totals[column]) for column, label in enumerate(self.emotion_labels) if counts[column]},
+            {label: int(counts[column]) for column, label in enumerate(self.emotion_labels) if counts[column]},
+            {label: float(sample_totals[column]) for column, label in enumerate(self.emotion_labels)} if in_sample.any() else {},
+            {label: float(sample_squares[column]) for column, label in enumerate(self.emotion_labels)},
+            int(in_sample.sum()),
+            int(sampled_population.sum())
+        )
+        
+        bins = np.clip(((compound + 1) / 2 * histogram_bins).astype(np.int64), 0, histogram_bins - 1)
+        histogram = np.bincount(bins, minlength=histogram_bins)
+        
+        result = {
+            "sentiment_counts": self.sentiment_counts(mask),
+            "emotion_distribution": emotion_distribution,
+            "average_sentiment": average_sentiment,
+            "compound_histogram": [int(count) for count in histogram],
+            "duplicate_posts": int(len(self) - mask.sum())
+        }
+        
+        if sampled_population.any():
+            result["emotion_distribution_error"] = emotion_errors
+        
+        return result
@@ -0,0 +1,180 @@
+import zlib
+import hashlib
+from typing import Any, Dict, List, Set, Tuple
+
+import numpy as np
+
+# Prime just above 2**32, the range of the shingle hashes
+_MINHASH_PRIME = 4294967311
+
+class PostDeduplicator:
+    """
+    Cluster exact and near-duplicate posts, such as reshares and templated announcements.
+    
+    Exact duplicates (after normalizing case and whitespace) are grouped
+    by hash. The remaining distinct texts are compared with MinHash
+    signatures over word shingles, bucketed with locality-sensitive hashing
+    so that only likely pairs are compared, and candidate pairs are
+    confirmed by their exact Jaccard similarity.
+    """
+    
+    def __init__(self, threshold: float = 0.8, num_perm: int = 64, bands: int = 16, shingle_size: int = 3,
+                 seed: int = 1):
+        """
+        Initialize the MinHash permutations.
+        
+        Args:
+            threshold: Jaccard similarity of word shingles above which two
+                posts are near-duplicates
+            num_perm: Number of MinHash permutations
+            bands: Number of LSH bands (must divide num_perm); more bands
+                find pairs of lower similarity
+            shingle_size: Number of consecutive words per shingle
+            seed: Seed of the random permutations
+        """
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.shingle_size = shingle_size
+        
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, 2 ** 31, size=num_perm).astype(np.uint64)
+        self._b = rng.randint(0, 2 ** 31, size=num_perm).astype(np.uint64)
+    
+    @staticmethod
+    def normalize(text: str) -> str:
+        """Lowercase a text and collapse its whitespace."""
+        return " ".join(text.lower().split())
+    
+    @classmethod
+    def cluster_id(cls, text: str) -> str:
+        """Return a stable id for the cluster represented by a text."""
+        return hashlib.sha1(cls.normalize(text).encode("utf-8")).hexdigest()[:16]
+    
+    def shingles(self, normalized_text: str) -> Set[str]:
+        """Split a normalized text into overlapping word shingles."""
+        words = normalized_text.split()
+        if len(words) <= self.shingle_size:
+            return {normalized_text}
+        return {" ".join(words[i:i + self.shingle_size]) for i in range(len(words) - self.shingle_size + 1)}
+    
+    def signature(self, shingles: Set[str]) -> np.ndarray:
+        """Compute the MinHash signature of a set of shingles."""
+        hashes = np.array([zlib.crc32(shingle.encode("utf-8")) for shingle in shingles], dtype=np.uint64)
+        permuted = (self._a[:, None] * hashes[None, :] + self._b[:, None]) % np.uint64(_MINHASH_PRIME)
+        return permuted.min(axis=1)
+    
+    @staticmethod
+    def jaccard(first: Set[str], second: Set[str]) -> float:
+        """Return the Jaccard similarity of two shingle sets."""
+        intersection = len(first & second)
+        return intersection / (len(first) + len(second) - intersection)
+    
+    def cluster(self, texts: List[str]) -> List[int]:
+        """
+        Group texts into clusters of duplicates.
+        
+        Args:
+            texts: The texts to cluster
+        
+        Returns:
+            For each text, the index of its cluster's representative (the
+            first text of the cluster)
+        """
+        # Exact duplicates share a normalized text
+        first_index: Dict[str, int] = {}
+        representatives = []
+        for index, text in enumerate(texts):
+            representatives.append(first_index.setdefault(self.normalize(text), index))
+        
+        # Near-duplicates among the distinct texts, joined with union-find
+        distinct = list(first_index.values())
+        shingle_sets = [self.shingles(self.normalize(texts[index])) for index in distinct]
+        signatures = [self.signature(shingles) for shingles in shingle_sets]
+        parent = list(range(len(distinct)))
+        
+        def find(i):
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+        
+        def union(i, j):
+            root_i, root_j = find(i), find(j)
+            # Keep the earliest text as the root
+            parent[max(root_i, root_j)] = min(root_i, root_j)
+        
+        # Texts sharing a band of their signatures are candidates. Within a
+        # bucket each text is compared with one text per cluster found so far,
+        # so templated posts don't cost a comparison for every pair.
+        rows = self.num_perm // self.bands
+        for band in range(self.bands):
+            buckets: Dict[bytes, List[int]] = {}
+            for position, signature in enumerate(signatures):
+                buckets.setdefault(signature[band * rows:(band + 1) * rows].tobytes(), []).append(position)
+            
+            for members in buckets.values():
+                leaders = []
+                for position in members:
+                    for leader in leaders:
+                        if find(leader) == find(position):
+                            break
+                        if self.jaccard(shingle_sets[leader], shingle_sets[position]) >= self.threshold:
+                            union(leader, position)
+                            break
+                    else:
+                        leaders.append(position)
+        
+        cluster_of = {index: distinct[find(position)] for position, index in enumerate(distinct)}
+        return [cluster_of[representative] for representative in representatives]
+    
+    def cluster_posts(self, posts: List[Dict[str, Any]]) -> Tuple[List[int], List[Dict[str, Any]]]:
+        """
+        Label posts with their cluster before analysis.
+        
+        Args:
+            posts: Posts with text
+        
+        Returns:
+            The representative index of each post, and copies of the posts
+            with their cluster's "cluster_id" and "cluster_size"
+        """
+        clusters = self.cluster([post["text"] for post in posts])
+        sizes: Dict[int, int] = {}
+        for representative in clusters:
+            sizes[representative] = sizes.get(representative, 0) + 1
+        
+        clustered_posts = [
+            {
+                **post,
+                "cluster_id": self.cluster_id(posts[representative]["text"]),
+                "cluster_size": sizes[representative]
+            }
+            for post, representative in zip(posts, clusters)
+        ]
+        return clusters, clustered_posts
+    
+    @staticmethod
+    def fan_out(posts: List[Dict[str, Any]], clusters: List[int],
+                analyzed: Dict[int, Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Give every post the analysis of its cluster's representative.
+        
+        Args:
+            posts: The posts labelled by cluster_posts
+            clusters: The representative index of each post
+            analyzed: The analyzed representative of each cluster, by index
+        
+        Returns:
+            The posts with their cluster's sentiment, emotions and emotion tier
+        """
+        fanned_out = []
+        for post, i in zip(posts, clusters):
+            post_with_analysis = {**post, "sentiment": analyzed[i]["sentiment"], "emotions": analyzed[i]["emotions"]}
+            if "emotion_tier" in analyzed[i]:
+                post_with_analysis["emotion_tier"] = analyzed[i]["emotion_tier"]
+            fanned_out.append(post_with_analysis)
+        return fanned_out
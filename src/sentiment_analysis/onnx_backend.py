@@ -0,0 +1,168 @@
+import os
+import logging
+import tempfile
+from typing import Callable, List
+
+import numpy as np
+import torch
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# Largest absolute difference allowed between an emotion probability from the
+# quantized ONNX model and the same probability from the PyTorch model
+ONNX_SCORE_TOLERANCE = 0.05
+
+class _LogitsOnly(torch.nn.Module):
+    """Wrap a sequence classifier so that it returns a plain logits tensor."""
+    
+    def __init__(self, model: torch.nn.Module):
+        super().__init__()
+        self.model = model
+    
+    def forward(self, input_ids: torch.Tensor, attention_mask: torch.Tensor) -> torch.Tensor:
+        return self.model(input_ids=input_ids, attention_mask=attention_mask).logits
+
+def _write_atomically(path: str, write: Callable[[str], None]) -> None:
+    """
+    Write a file through write(temp_path), then move it into place in one step.
+    
+    The temporary file is in the same directory, so that os.replace is an
+    atomic rename: concurrent readers never see a partly written file, and
+    concurrent writers each replace it with a complete one.
+    """
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-", suffix=".onnx")
+    os.close(fd)
+    try:
+        write(temp_path)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+def export_onnx_model(model: torch.nn.Module, export_dir: str, quantize: bool = True) -> str:
+    """
+    Export a sequence classifier to ONNX, optionally with int8 dynamic quantization.
+    
+    The export is skipped if the file already exists in export_dir, so it
+    runs once per model revision. Files are written under a temporary name
+    and renamed into place, so that processes exporting at the same time
+    never load a partly written model.
+    
+    Args:
+        model: The PyTorch sequence classification model
+        export_dir: Directory to write the ONNX files to
+        quantize: Whether to quantize the weights to int8
+    
+    Returns:
+        Path to the ONNX file to load
+    """
+    fp32_path = os.path.join(export_dir, "model.onnx")
+    int8_path = os.path.join(export_dir, "model.int8.onnx")
+    target_path = int8_path if quantize else fp32_path
+    
+    if os.path.exists(target_path):
+        return target_path
+    
+    os.makedirs(export_dir, exist_ok=True)
+    
+    if not os.path.exists(fp32_path):
+        logger.info(f"Exporting emotion model to {fp32_path}")
+        model.eval()
+        dummy_ids = torch.ones((1, 8), dtype=torch.long)
+        dummy_mask = torch.ones((1, 8), dtype=torch.long)
+        _write_atomically(fp32_path, lambda path: torch.onnx.export(
+            _LogitsOnly(model),
+            (dummy_ids, dummy_mask),
+            path,
+            input_names=["input_ids", "attention_mask"],
+            output_names=["logits"],
+            dynamic_axes={
+                "input_ids": {0: "batch", 1: "sequence"},
+                "attention_mask": {0: "batch", 1: "sequence"},
+                "logits": {0: "batch"}
+            },
+            opset_version=17,
+            dynamo=False
+        ))
+    
+    if quantize:
+        from onnxruntime.quantization import quantize_dynamic, QuantType
+        
+        logger.info(f"Quantizing emotion model to {int8_path}")
+        _write_atomically(int8_path, lambda path: quantize_dynamic(fp32_path, path, weight_type=QuantType.QInt8))
+    
+    return target_path
+
+def softmax(logits: np.ndarray) -> np.ndarray:
+    """Numerically stable softmax over the last axis."""
+    shifted = np.exp(logits - logits.max(axis=-1, keepdims=True))
+    return shifted / shifted.sum(axis=-1, keepdims=True)
+
+class OnnxEmotionModel:
+    """Run an exported emotion classifier with ONNX Runtime on the CPU."""
+    
+    def __init__(self, model_path: str, num_threads: int = 0):
+        """
+        Load an ONNX model into an inference session.
+        
+        Args:
+            model_path: Path to the ONNX file
+            num_threads: Intra-op threads for ONNX Runtime (0 lets it decide)
+        """
+        import onnxruntime as ort
+        
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = num_threads
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        
+        self.model_path = model_path
+        self.session = ort.InferenceSession(model_path, options, providers=["CPUExecutionProvider"])
+    
+    def predict_proba(self, input_ids: np.ndarray, attention_mask: np.ndarray) -> np.ndarray:
+        """
+        Score a padded batch.
+        
+        Args:
+            input_ids: Token ids of shape (batch, sequence)
+            attention_mask: Attention mask of the same shape
+        
+        Returns:
+            Label probabilities of shape (batch, labels)
+        """
+        logits = self.session.run(
+            ["logits"],
+            {"input_ids": input_ids.astype(np.int64), "attention_mask": attention_mask.astype(np.int64)}
+        )[0]
+        return softmax(logits)
+
+def max_score_difference(model: torch.nn.Module, onnx_model: OnnxEmotionModel, batches: List[dict]) -> float:
+    """
+    Compare the ONNX model against the PyTorch model on sample batches.
+    
+    Args:
+        model: The PyTorch sequence classification model
+        onnx_model: The exported model
+        batches: Padded batches with numpy "input_ids" and "attention_mask"
+    
+    Returns:
+        The largest absolute difference between any two label probabilities
+    """
+    max_difference = 0.0
+    
+    for batch in batches:
+        with torch.no_grad():
+            logits = model(
+                input_ids=torch.from_numpy(batch["input_ids"]).long(),
+                attention_mask=torch.from_numpy(batch["attention_mask"]).long()
+            ).logits
+        expected = torch.softmax(logits, dim=-1).numpy()
+        actual = onnx_model.predict_proba(batch["input_ids"], batch["attention_mask"])
+        max_difference = max(max_difference, float(np.abs(expected - actual).max()))
+    
+    return max_difference
@@ -0,0 +1,223 @@
+import os
+import math
+import atexit
+import logging
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Any, Iterable, Iterator, Optional
+
+from .analyzer import SentimentAnalyzer
+from .aggregator import SentimentAggregator
+from .cache import AnalysisCache
+from .dedup import PostDeduplicator
+from .vader_batch import BatchVaderScorer
+from .vader_registry import get_vader_scorer
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# Workers are spawned rather than forked, so that no thread pools or locks
+# of the parent (torch, tokenizers, logging) are copied into them
+MP_CONTEXT = multiprocessing.get_context("spawn")
+
+# Analyzers built once per worker process by the pool initializers
+_worker_analyzer: Optional[SentimentAnalyzer] = None
+_worker_scorer: Optional[BatchVaderScorer] = None
+
+# Pool of polarity_scores_parallel, kept between calls so that its workers
+# load the VADER lexicon once per process rather than once per call
+_vader_pool: Optional[ProcessPoolExecutor] = None
+_vader_pool_workers = 0
+_vader_pool_lock = threading.Lock()
+
+def threads_per_worker(workers: int) -> int:
+    """Split the CPU cores evenly between workers so that they don't oversubscribe them."""
+    return max(1, (os.cpu_count() or 1) // workers)
+
+def _shards(items: List[Any], shard_size: int) -> List[List[Any]]:
+    """Split a list into consecutive shards."""
+    return [items[start:start + shard_size] for start in range(0, len(items), shard_size)]
+
+def _init_analyzer_worker(analyzer_kwargs: Dict[str, Any], cache_path: Optional[str], cache_max_mb: float,
+                          num_threads: int) -> None:
+    """Load VADER and the emotion model once in a worker process."""
+    global _worker_analyzer
+    
+    # Limit native thread pools that read the environment when they start
+    os.environ["OMP_NUM_THREADS"] = str(num_threads)
+    os.environ["TOKENIZERS_PARALLELISM"] = "false"
+    
+    cache = AnalysisCache(cache_path, max_size_mb=cache_max_mb) if cache_path else None
+    _worker_analyzer = SentimentAnalyzer(cache=cache, num_threads=num_threads, **analyzer_kwargs)
+
+def _analyze_shard(posts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Analyze one shard of posts in a worker process."""
+    return _worker_analyzer.analyze_posts(posts)
+
+def _init_vader_worker() -> None:
+    """Load the VADER lexicon once in a worker process."""
+    global _worker_scorer
+    _worker_scorer = get_vader_scorer()
+
+def _score_shard(texts: List[str]) -> List[Dict[str, float]]:
+    """Score one shard of texts with VADER in a worker process."""
+    return _worker_scorer.polarity_scores_batch(texts)
+
+def polarity_scores_parallel(texts: List[str], workers: int, shard_size: int = 2000) -> List[Dict[str, float]]:
+    """
+    Score texts with VADER across several processes.
+    
+    The worker processes are started on the first call and reused by the
+    following ones, until shutdown_vader_pool() or a call with a different
+    number of workers replaces them.
+    
+    Args:
+        texts: The texts to score
+        workers: Number of worker processes
+        shard_size: Number of texts sent to a worker at a time
+    
+    Returns:
+        VADER scores for each text, in the order of the input texts
+    """
+    global _vader_pool, _vader_pool_workers
+    
+    with _vader_pool_lock:
+        if _vader_pool is None or _vader_pool_workers != workers:
+            if _vader_pool is not None:
+                _vader_pool.shutdown()
+            _vader_pool = ProcessPoolExecutor(max_workers=workers, mp_context=MP_CONTEXT, initializer=_init_vader_worker)
+            _vader_pool_workers = workers
+        # Submitted under the lock, so that no other call shuts the pool down first
+        shards = _vader_pool.map(_score_shard, _shards(texts, shard_size))
+    
+    try:
+        return [scores for shard in shards for scores in shard]
+    except BrokenProcessPool:
+        # A worker died: start new ones on the next call
+        shutdown_vader_pool()
+        raise
+
+@atexit.register
+def shutdown_vader_pool() -> None:
+    """Stop the worker processes of polarity_scores_parallel, if running."""
+    global _vader_pool, _vader_pool_workers
+    
+    with _vader_pool_lock:
+        if _vader_pool is not None:
+            _vader_pool.shutdown()
+        _vader_pool = None
+        _vader_pool_workers = 0
+
+class ParallelSentimentAnalyzer:
+    """
+    Analyze posts with a pool of worker processes, each holding its own SentimentAnalyzer.
+    
+    With a deduplicator, posts are clustered in this process before they are
+    split into shards, so that duplicates landing in different shards still
+    share one cluster and are analyzed once.
+    """
+    
+    def __init__(self, workers: Optional[int] = None, shard_size: int = 256, cache_path: Optional[str] = None,
+                 cache_max_mb: float = 256, deduplicator: Optional[PostDeduplicator] = None, **analyzer_kwargs):
+        """
+        Start the worker pool.
+        
+        Each worker loads VADER and the emotion model once, with its torch
+        intra-op threads limited to its share of the CPU cores. The models
+        are loaded in the workers only, not in this process.
+        
+        Args:
+            workers: Number of worker processes (defaults to one per core)
+            shard_size: Largest number of posts sent to a worker at a time
+            cache_path: Optional SQLite file for caching analysis results,
+                opened by every worker
+            cache_max_mb: Size of the cache above which old entries are evicted
+            deduplicator: Optional clusterer of duplicate posts
+            **analyzer_kwargs: Arguments for each worker's SentimentAnalyzer
+                (batch_size, long_text_mode, backend, ...)
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.shard_size = max(1, shard_size)
+        self.deduplicator = deduplicator
+        num_threads = threads_per_worker(self.workers)
+        
+        self.executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=MP_CONTEXT,
+            initializer=_init_analyzer_worker,
+            initargs=(analyzer_kwargs, cache_path, cache_max_mb, num_threads)
+        )
+        logger.info(f"Started {self.workers} analysis workers with {num_threads} threads each")
+    
+    def analyze_posts(self, posts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Analyze sentiment and emotions for a list of posts across the workers.
+        
+        Args:
+            posts: A list of post dictionaries with 'text' keys
+        
+        Returns:
+            The posts with added sentiment and emotion analysis results, in
+            input order (posts without text are skipped)
+        """
+        # Skip posts without text
+        posts = [post for post in posts if post.get("text")]
+        
+        if self.deduplicator:
+            clusters, posts = self.deduplicator.cluster_posts(posts)
+            representatives = sorted(set(clusters))
+            analyzed = dict(zip(representatives, self._analyze_sharded([posts[i] for i in representatives])))
+            return PostDeduplicator.fan_out(posts, clusters, analyzed)
+        
+        return self._analyze_sharded(posts)
+    
+    def _analyze_sharded(self, posts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Analyze posts that all have text in shards across the workers."""
+        # Give every worker a share even when there are fewer posts than a full shard each
+        shard_size = min(self.shard_size, max(1, math.ceil(len(posts) / self.workers)))
+        shards = _shards(posts, shard_size)
+        return [post for shard in self.executor.map(_analyze_shard, shards) for post in shard]
+    
+    def iter_analyze(self, posts: Iterable[Dict[str, Any]], chunk_size: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Analyze a stream of posts, yielding analyzed posts in input order.
+        
+        Args:
+            posts: Any iterable of post dictionaries with 'text' keys
+            chunk_size: Number of posts distributed at a time (defaults to
+                four shards per worker)
+        
+        Yields:
+            The posts with added sentiment and emotion analysis results
+        """
+        chunk_size = chunk_size or self.shard_size * self.workers * 4
+        chunk = []
+        
+        for post in posts:
+            chunk.append(post)
+            if len(chunk) >= chunk_size:
+                yield from self.analyze_posts(chunk)
+                chunk = []
+        
+        if chunk:
+            yield from self.analyze_posts(chunk)
+    
+    def get_aggregated_results(self, analyzed_posts: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+        """Aggregate analyzed posts, as SentimentAnalyzer.get_aggregated_results."""
+        return SentimentAggregator().update_many(analyzed_posts).result()
+    
+    def close(self) -> None:
+        """Shut down the worker pool."""
+        self.executor.shutdown()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
@@ -0,0 +1,155 @@
+import os
+import gc
+import sys
+import logging
+from typing import Dict, List, Optional
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+def configure_fork_safe_threads(threads: int = 1) -> None:
+    """
+    Limit native thread pools before the models are loaded in a process that will fork.
+    
+    Thread pools (OpenMP, tokenizers) started in the parent are not copied
+    into forked children, and a pool whose locks were held at fork time
+    deadlocks them. The parent therefore only sets the sizes and never runs
+    inference; each child starts its own pools on first use.
+    
+    Args:
+        threads: Intra-op threads of each worker
+    """
+    os.environ.setdefault("OMP_NUM_THREADS", str(threads))
+    os.environ.setdefault("MKL_NUM_THREADS", str(threads))
+    os.environ["TOKENIZERS_PARALLELISM"] = "false"
+    
+    try:
+        import torch
+        torch.set_num_threads(threads)
+        # Must be set before any inter-op parallel work
+        torch.set_num_interop_threads(1)
+    except ImportError:
+        pass
+    except RuntimeError as e:
+        logger.warning(f"Could not set torch threads: {str(e)}")
+
+def preload_models(emotion_analysis: bool = True, threads: int = 1) -> None:
+    """
+    Load VADER and the emotion model in a pre-fork master process.
+    
+    The process-wide inference service is built with the model loaded
+    eagerly, but its thread is left to start in each worker. The weights
+    are put in inference mode and every object allocated so far is moved
+    out of the garbage collector's reach, so that neither autograd nor
+    collections write to the shared pages and they stay shared
+    copy-on-write between the workers.
+    
+    Args:
+        emotion_analysis: Whether to load the emotion model as well as VADER
+        threads: Intra-op threads of each worker
+    """
+    from .resources import get_resource_manager
+    from .service import get_inference_client
+    from .vader_registry import get_vader_scorer
+    
+    configure_fork_safe_threads(threads)
+    get_resource_manager().verify()
+    get_vader_scorer()
+    
+    if emotion_analysis:
+        analyzer = get_inference_client(model_loading="eager").service.analyzer
+        if analyzer.is_ready() and not analyzer.onnx_model:
+            model = analyzer.emotion_classifier.model
+            model.eval()
+            model.requires_grad_(False)
+        elif analyzer.onnx_model:
+            logger.warning("ONNX Runtime sessions are not fork-safe; preload the torch backend instead")
+    
+    gc.collect()
+    gc.freeze()
+    logger.info(f"Preloaded models in process {os.getpid()}")
+
+def post_fork_worker(threads: int = 1) -> None:
+    """Set a forked worker's own thread pool size."""
+    try:
+        import torch
+        torch.set_num_threads(threads)
+    except ImportError:
+        pass
+
+def process_memory(pid: int) -> Optional[Dict[str, int]]:
+    """
+    Measure the memory of a process from /proc (Linux only).
+    
+    Args:
+        pid: The process id
+    
+    Returns:
+        The resident set size ("rss"), the proportional set size with
+        shared pages split between their users ("pss"), the unique set size
+        of pages no other process maps ("uss") and the shared part of the
+        RSS ("shared"), in bytes; None if they cannot be read
+    """
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            fields = {}
+            for line in f:
+                parts = line.split()
+                if len(parts) == 3 and parts[2] == "kB":
+                    fields[parts[0].rstrip(":")] = int(parts[1]) * 1024
+    except OSError:
+        return None
+    
+    return {
+        "rss": fields.get("Rss", 0),
+        "pss": fields.get("Pss", 0),
+        "uss": fields.get("Private_Clean", 0) + fields.get("Private_Dirty", 0),
+        "shared": fields.get("Shared_Clean", 0) + fields.get("Shared_Dirty", 0)
+    }
+
+def worker_memory_report(master_pid: int) -> List[Dict[str, int]]:
+    """
+    Measure the memory of every worker forked by a master process.
+    
+    Args:
+        master_pid: The process id of the gunicorn master
+    
+    Returns:
+        One entry per worker with its "pid" and the measures of process_memory
+    """
+    try:
+        with open(f"/proc/{master_pid}/task/{master_pid}/children") as f:
+            pids = [int(pid) for pid in f.read().split()]
+    except OSError:
+        return []
+    
+    report = []
+    for pid in pids:
+        memory = process_memory(pid)
+        if memory is not None:
+            report.append({"pid": pid, **memory})
+    return report
+
+def format_memory_report(report: List[Dict[str, int]]) -> str:
+    """Format a worker memory report as a table in megabytes."""
+    lines = [f"{'PID':>8} {'RSS MB':>10} {'PSS MB':>10} {'Unique MB':>10} {'Shared MB':>10}"]
+    for entry in report:
+        lines.append(f"{entry['pid']:>8} " + " ".join(
+            f"{entry[key] / 2 ** 20:>10.1f}" for key in ("rss", "pss", "uss", "shared")
+        ))
+    if report:
+        lines.append(f"{'total':>8} " + " ".join(
+            f"{sum(entry[key] for entry in report) / 2 ** 20:>10.1f}" for key in ("rss", "pss", "uss", "shared")
+        ))
+    return "\n".join(lines)
+
+# For testing purposes
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        print("Usage: python -m src.sentiment_analysis.preload <gunicorn master pid>")
+        sys.exit(1)
+    print(format_memory_report(worker_memory_report(int(sys.argv[1]))))
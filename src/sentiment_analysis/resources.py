@@ -0,0 +1,330 @@
+import os
+import sys
+import json
+import shutil
+import hashlib
+import logging
+import argparse
+import datetime
+import threading
+from importlib import metadata
+from typing import Dict, Iterable, Optional, Tuple
+
+from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# Version of the bundle layout; bundles of another version are ignored
+BUNDLE_VERSION = 1
+
+# Where bundles are looked up unless configured otherwise
+DEFAULT_RESOURCE_DIR = os.path.join(".cache", "resources")
+
+# Environment variables configuring the default resource manager
+RESOURCE_DIR_ENV = "SENTIMENT_RESOURCE_DIR"
+ALLOW_DOWNLOADS_ENV = "SENTIMENT_ALLOW_DOWNLOADS"
+
+VADER_FILES = ("vader_lexicon.txt", "emoji_utf8_lexicon.txt")
+
+# Weights in formats we don't load are left out of the bundle
+MODEL_IGNORE_PATTERNS = ["*.h5", "*.msgpack", "*.ot", "*.onnx", "rust_model*", "coreml/*"]
+
+MANIFEST_NAME = "manifest.json"
+VERIFIED_NAME = ".verified"
+
+def _sha256(path: str) -> str:
+    """Hash a file in chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+class ResourceManager:
+    """
+    Resolve the VADER lexicons and the transformer weights from a local bundle.
+    
+    A bundle is a directory "bundle-v<BUNDLE_VERSION>" under the resource
+    directory, built by prefetch, with a manifest of the size and SHA-256 of
+    every file. The bundle is checked once: later starts only compare file
+    sizes and modification times with a stamp written after the full check.
+    Resolved paths are cached. Without a valid bundle, VADER falls back to
+    the lexicons installed with vaderSentiment and models to the local
+    Hugging Face cache. The network is used only by prefetch, or to fetch
+    missing models if allow_downloads is set.
+    """
+    
+    def __init__(self, resource_dir: str = DEFAULT_RESOURCE_DIR, allow_downloads: bool = False):
+        """
+        Initialize the resource manager.
+        
+        Args:
+            resource_dir: Directory holding the bundle
+            allow_downloads: Whether models missing locally may be fetched
+                from the Hugging Face hub
+        """
+        self.resource_dir = resource_dir
+        self.allow_downloads = allow_downloads
+        self._lock = threading.Lock()
+        self._manifest: Optional[Dict] = None
+        self._verified: Optional[bool] = None
+        self._paths: Dict[str, Optional[str]] = {}
+    
+    def __getstate__(self):
+        # Locks cannot be pickled, e.g. for worker processes
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+    
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+    
+    @property
+    def bundle_dir(self) -> str:
+        """The directory of the bundle of the current layout version."""
+        return os.path.join(self.resource_dir, f"bundle-v{BUNDLE_VERSION}")
+    
+    def verify(self) -> bool:
+        """Return whether the bundle exists and is intact, checking it on the first call only."""
+        with self._lock:
+            if self._verified is None:
+                self._verified = self._check_bundle()
+            return self._verified
+    
+    def _check_bundle(self) -> bool:
+        """Check the bundle files against the manifest."""
+        manifest_path = os.path.join(self.bundle_dir, MANIFEST_NAME)
+        if not os.path.exists(manifest_path):
+            logger.info(f"No resource bundle at {self.bundle_dir}")
+            return False
+        
+        try:
+            with open(manifest_path, encoding="utf-8") as f:
+                manifest = json.load(f)
+            
+            if manifest.get("bundle_version") != BUNDLE_VERSION:
+                logger.warning(f"Ignoring resource bundle of version {manifest.get('bundle_version')}")
+                return False
+            
+            # A stamp of the file sizes and times recorded after the last full
+            # check spares hashing the model weights on every start
+            files = manifest["files"]
+            observed = []
+            for relative_path, expected in sorted(files.items()):
+                stat = os.stat(os.path.join(self.bundle_dir, relative_path))
+                if stat.st_size != expected["size"]:
+                    logger.error(f"Resource bundle file has the wrong size: {relative_path}")
+                    return False
+                observed.append([relative_path, stat.st_size, stat.st_mtime_ns])
+            stamp = hashlib.sha256(json.dumps([_sha256(manifest_path), observed]).encode("utf-8")).hexdigest()
+            
+            verified_path = os.path.join(self.bundle_dir, VERIFIED_NAME)
+            if os.path.exists(verified_path):
+                with open(verified_path, encoding="utf-8") as f:
+                    if f.read().strip() == stamp:
+                        self._manifest = manifest
+                        return True
+            
+            for relative_path, expected in files.items():
+                if _sha256(os.path.join(self.bundle_dir, relative_path)) != expected["sha256"]:
+                    logger.error(f"Resource bundle file is corrupt: {relative_path}")
+                    return False
+            
+            try:
+                with open(verified_path, "w", encoding="utf-8") as f:
+                    f.write(stamp)
+            except OSError as e:
+                # Read-only bundles are checked in full on every start
+                logger.warning(f"Could not record the bundle check: {str(e)}")
+            
+            self._manifest = manifest
+            logger.info(f"Verified resource bundle at {self.bundle_dir}")
+            return True
+        
+        except Exception as e:
+            logger.error(f"Failed to check resource bundle: {str(e)}")
+            return False
+    
+    def _resolve(self, key: str, resolver) -> Optional[str]:
+        """Resolve a resource once and cache its path."""
+        self.verify()
+        with self._lock:
+            if key not in self._paths:
+                self._paths[key] = resolver()
+            return self._paths[key]
+    
+    def vader_lexicon_paths(self) -> Tuple[str, str]:
+        """
+        Return the paths of the VADER word and emoji lexicons.
+        
+        Returns:
+            The lexicon paths from the bundle, or those installed with
+            vaderSentiment if there is no valid bundle
+        """
+        def resolve(name):
+            if self._manifest and name in self._manifest.get("vader", {}):
+                return os.path.abspath(os.path.join(self.bundle_dir, self._manifest["vader"][name]))
+            # vaderSentiment opens names relative to its own directory
+            return name
+        
+        return tuple(self._resolve(f"vader:{name}", lambda name=name: resolve(name)) for name in VADER_FILES)
+    
+    def model_path(self, model_name: str) -> Optional[str]:
+        """
+        Return where to load a transformer model from.
+        
+        Args:
+            model_name: The model id on the Hugging Face hub
+        
+        Returns:
+            The bundled model directory, else the model's snapshot in the
+            local Hugging Face cache, else the model id if downloads are
+            allowed, else None
+        """
+        return self._resolve(f"model:{model_name}", lambda: self._find_model(model_name))
+    
+    def model_revision(self, model_name: str) -> Optional[str]:
+        """Return the revision of a bundled model, or None if it is not bundled."""
+        self.verify()
+        if self._manifest and model_name in self._manifest.get("models", {}):
+            return self._manifest["models"][model_name]["revision"]
+        return None
+    
+    def _find_model(self, model_name: str) -> Optional[str]:
+        """Look up a model in the bundle and the local Hugging Face cache."""
+        if self._manifest and model_name in self._manifest.get("models", {}):
+            return os.path.abspath(os.path.join(self.bundle_dir, self._manifest["models"][model_name]["path"]))
+        
+        try:
+            from huggingface_hub import snapshot_download
+            return snapshot_download(model_name, local_files_only=True)
+        except Exception:
+            pass
+        
+        if self.allow_downloads:
+            logger.info(f"{model_name} is not available locally and will be downloaded")
+            return model_name
+        
+        logger.error(f"{model_name} is not available locally. Build a resource bundle with "
+                     f"'python -m src.sentiment_analysis.resources prefetch' or allow downloads.")
+        return None
+    
+    def prefetch(self, model_names: Iterable[str] = ()) -> str:
+        """
+        Build the bundle, downloading the models it should contain.
+        
+        The bundle is built next to the current one and swapped in when
+        complete, so a failed prefetch leaves the current bundle in place.
+        
+        Args:
+            model_names: Hugging Face hub ids of the models to bundle
+        
+        Returns:
+            The bundle directory
+        """
+        staging_dir = f"{self.bundle_dir}.tmp-{os.getpid()}"
+        shutil.rmtree(staging_dir, ignore_errors=True)
+        os.makedirs(os.path.join(staging_dir, "vader"))
+        
+        manifest = {
+            "bundle_version": BUNDLE_VERSION,
+            "created": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "vader_sentiment_version": metadata.version("vaderSentiment"),
+            "vader": {},
+            "models": {},
+            "files": {}
+        }
+        
+        # Copy the lexicons shipped with vaderSentiment
+        vader_dir = os.path.dirname(sys.modules[SentimentIntensityAnalyzer.__module__].__file__)
+        for name in VADER_FILES:
+            shutil.copyfile(os.path.join(vader_dir, name), os.path.join(staging_dir, "vader", name))
+            manifest["vader"][name] = f"vader/{name}"
+        
+        if model_names:
+            from huggingface_hub import HfApi, snapshot_download
+            
+            for model_name in model_names:
+                revision = HfApi().model_info(model_name).sha
+                relative_path = f"models/{model_name.replace('/', '--')}"
+                local_dir = os.path.join(staging_dir, relative_path)
+                logger.info(f"Downloading {model_name}@{revision}")
+                snapshot_download(model_name, revision=revision, local_dir=local_dir,
+                                  ignore_patterns=MODEL_IGNORE_PATTERNS)
+                # Drop the download metadata kept by huggingface_hub
+                shutil.rmtree(os.path.join(local_dir, ".cache"), ignore_errors=True)
+                manifest["models"][model_name] = {"path": relative_path, "revision": revision}
+        
+        for directory, _, file_names in os.walk(staging_dir):
+            for file_name in file_names:
+                path = os.path.join(directory, file_name)
+                relative_path = os.path.relpath(path, staging_dir).replace(os.sep, "/")
+                manifest["files"][relative_path] = {"sha256": _sha256(path), "size": os.path.getsize(path)}
+        
+        with open(os.path.join(staging_dir, MANIFEST_NAME), "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+        
+        # Swap the new bundle in
+        old_dir = f"{self.bundle_dir}.old-{os.getpid()}"
+        if os.path.exists(self.bundle_dir):
+            os.rename(self.bundle_dir, old_dir)
+        os.rename(staging_dir, self.bundle_dir)
+        shutil.rmtree(old_dir, ignore_errors=True)
+        
+        with self._lock:
+            self._verified = None
+            self._manifest = None
+            self._paths.clear()
+        
+        logger.info(f"Built resource bundle at {self.bundle_dir}")
+        return self.bundle_dir
+
+# The resource manager shared by the analyzers of a process
+_default_manager: Optional[ResourceManager] = None
+_default_manager_lock = threading.Lock()
+
+def get_resource_manager() -> ResourceManager:
+    """
+    Return the process-wide resource manager.
+    
+    It is configured from the SENTIMENT_RESOURCE_DIR and
+    SENTIMENT_ALLOW_DOWNLOADS environment variables on first use.
+    """
+    global _default_manager
+    with _default_manager_lock:
+        if _default_manager is None:
+            _default_manager = ResourceManager(
+                os.getenv(RESOURCE_DIR_ENV, DEFAULT_RESOURCE_DIR),
+                allow_downloads=os.getenv(ALLOW_DOWNLOADS_ENV, "").lower() in ("1", "true", "yes")
+            )
+        return _default_manager
+
+def main() -> None:
+    """Command line interface: build or check the resource bundle."""
+    from .analyzer import EMOTION_MODEL_NAME
+    
+    parser = argparse.ArgumentParser(description='Manage the offline resource bundle')
+    parser.add_argument('command', choices=['prefetch', 'verify'],
+                        help='Build the bundle (uses the network) or check an existing one')
+    parser.add_argument('--resource-dir', default=os.getenv(RESOURCE_DIR_ENV, DEFAULT_RESOURCE_DIR),
+                        help='Directory holding the bundle')
+    parser.add_argument('--skip-model', action='store_true',
+                        help='Bundle the VADER lexicons only')
+    args = parser.parse_args()
+    
+    manager = ResourceManager(args.resource_dir)
+    if args.command == 'prefetch':
+        manager.prefetch([] if args.skip_model else [EMOTION_MODEL_NAME])
+    
+    if not manager.verify():
+        sys.exit(1)
+    logger.info(f"Resource bundle at {manager.bundle_dir} is valid")
+
+if __name__ == "__main__":
+    main()
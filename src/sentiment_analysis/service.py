@@ -0,0 +1,247 @@
+import time
+import queue
+import logging
+import threading
+from concurrent.futures import Future
+from typing import Dict, List, Any, Iterable, Iterator, Optional
+
+from .analyzer import SentimentAnalyzer
+from .aggregator import SentimentAggregator
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+class InferenceService:
+    """
+    Analyze posts for many callers with one model, in dynamic micro-batches.
+    
+    A single thread owns the SentimentAnalyzer. Requests submitted from any
+    thread are queued; the thread takes the oldest request, keeps collecting
+    queued requests until max_batch_posts posts are gathered or max_wait_ms
+    has passed since the batch was opened, analyzes them in one call and
+    hands every caller its own results. With a deduplicator, duplicate posts
+    of concurrent requests are analyzed once; in tiered emotion mode, the
+    report tier is chosen per micro-batch.
+    """
+    
+    def __init__(self, analyzer: Optional[SentimentAnalyzer] = None, max_batch_posts: int = 256,
+                 max_wait_ms: float = 10, **analyzer_kwargs):
+        """
+        Initialize the service; call start() to run it.
+        
+        Args:
+            analyzer: The analyzer to serve (built from analyzer_kwargs with
+                background model loading if omitted)
+            max_batch_posts: Number of posts above which a batch is closed
+                early (a single larger request still runs as one batch)
+            max_wait_ms: Longest time a request waits for others to join its batch
+            **analyzer_kwargs: Arguments for the SentimentAnalyzer
+        """
+        if analyzer is None:
+            analyzer_kwargs.setdefault("model_loading", "background")
+            analyzer = SentimentAnalyzer(**analyzer_kwargs)
+        
+        self.analyzer = analyzer
+        self.max_batch_posts = max(1, max_batch_posts)
+        self.max_wait = max_wait_ms / 1000
+        self._requests: "queue.Queue[Optional[tuple]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self.batches = 0
+        self.requests = 0
+        self.posts = 0
+    
+    def start(self) -> "InferenceService":
+        """Start the batching thread, unless it is running already."""
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="inference-service", daemon=True)
+                self._thread.start()
+                logger.info(f"Inference service started (batches of up to {self.max_batch_posts} posts, "
+                            f"{self.max_wait * 1000:g} ms wait)")
+        return self
+    
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Finish the queued requests and stop the batching thread."""
+        with self._lock:
+            thread = self._thread
+            self._thread = None
+        if thread is not None:
+            self._requests.put(None)
+            thread.join(timeout)
+    
+    def __enter__(self):
+        return self.start()
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+    
+    def submit(self, posts: List[Dict[str, Any]]) -> Future:
+        """
+        Queue posts for analysis.
+        
+        Args:
+            posts: A list of post dictionaries with 'text' keys
+        
+        Returns:
+            A future of the analyzed posts, as returned by
+            SentimentAnalyzer.analyze_posts (posts without text are skipped)
+        """
+        future = Future()
+        # Drop posts without text here, so that each request's share of a batch is known
+        posts = [post for post in posts if post.get("text")]
+        if not posts:
+            future.set_result([])
+            return future
+        
+        # Also restarts the thread in a forked child, where it does not run
+        if self._thread is None or not self._thread.is_alive():
+            self.start()
+        self._requests.put((posts, future))
+        return future
+    
+    def _run(self) -> None:
+        """Collect requests into micro-batches and analyze them until stopped."""
+        while True:
+            request = self._requests.get()
+            if request is None:
+                return
+            
+            batch = [request]
+            size = len(request[0])
+            deadline = time.monotonic() + self.max_wait
+            stopping = False
+            
+            while size < self.max_batch_posts:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    request = self._requests.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if request is None:
+                    stopping = True
+                    break
+                batch.append(request)
+                size += len(request[0])
+            
+            self._analyze_batch(batch)
+            if stopping:
+                return
+    
+    def _analyze_batch(self, batch: List[tuple]) -> None:
+        """Analyze the posts of several requests at once and resolve their futures."""
+        # Skip requests whose callers gave up
+        batch = [(posts, future) for posts, future in batch if future.set_running_or_notify_cancel()]
+        if not batch:
+            return
+        
+        try:
+            analyzed_posts = self.analyzer.analyze_posts([post for posts, _ in batch for post in posts])
+        except Exception as e:
+            logger.error(f"Error analyzing a batch of {len(batch)} requests: {str(e)}")
+            for _, future in batch:
+                future.set_exception(e)
+            return
+        
+        start = 0
+        for posts, future in batch:
+            future.set_result(analyzed_posts[start:start + len(posts)])
+            start += len(posts)
+        
+        self.batches += 1
+        self.requests += len(batch)
+        self.posts += start
+    
+    def stats(self) -> Dict[str, Any]:
+        """Return the number of batches, requests and posts served and the average batch size."""
+        return {
+            "batches": self.batches,
+            "requests": self.requests,
+            "posts": self.posts,
+            "average_batch_posts": self.posts / self.batches if self.batches else 0
+        }
+
+class InferenceClient:
+    """A thin client of an InferenceService with the interface of SentimentAnalyzer."""
+    
+    def __init__(self, service: InferenceService, timeout: Optional[float] = None):
+        """
+        Initialize the client.
+        
+        Args:
+            service: The service to send posts to
+            timeout: Seconds to wait for a request's results (None waits indefinitely)
+        """
+        self.service = service
+        self.timeout = timeout
+    
+    def analyze_posts(self, posts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Analyze posts through the service, as SentimentAnalyzer.analyze_posts."""
+        return self.service.submit(list(posts)).result(self.timeout)
+    
+    def analyze_texts(self, texts: List[str]) -> List[Dict[str, Any]]:
+        """
+        Analyze texts through the service.
+        
+        Returns:
+            For each text, a dictionary with "sentiment" and "emotions"
+            results; empty texts get a neutral result
+        """
+        analyzed = iter(self.analyze_posts([{"text": text} for text in texts]))
+        return [next(analyzed) if text else self.service.analyzer.analyze_text(text) for text in texts]
+    
+    def iter_analyze(self, posts: Iterable[Dict[str, Any]], chunk_size: int = 256) -> Iterator[Dict[str, Any]]:
+        """Analyze a stream of posts in chunks, as SentimentAnalyzer.iter_analyze."""
+        chunk = []
+        
+        for post in posts:
+            chunk.append(post)
+            if len(chunk) >= chunk_size:
+                yield from self.analyze_posts(chunk)
+                chunk = []
+        
+        if chunk:
+            yield from self.analyze_posts(chunk)
+    
+    def get_aggregated_results(self, analyzed_posts: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+        """Aggregate analyzed posts, as SentimentAnalyzer.get_aggregated_results."""
+        return SentimentAggregator().update_many(analyzed_posts).result()
+    
+    def is_ready(self) -> bool:
+        """Return whether the service's emotion model is loaded."""
+        return self.service.analyzer.is_ready()
+    
+    def wait_ready(self, timeout: Optional[float] = None) -> bool:
+        """Wait for the service's emotion model, as SentimentAnalyzer.wait_ready."""
+        return self.service.analyzer.wait_ready(timeout)
+
+# The service shared by the threads of a process
+_shared_service: Optional[InferenceService] = None
+_shared_service_lock = threading.Lock()
+
+def get_inference_client(timeout: Optional[float] = None, **service_kwargs) -> InferenceClient:
+    """
+    Return a client of the process-wide inference service, creating it on first use.
+    
+    The service thread starts with the first request, so the service can
+    be created in a process that forks workers afterwards.
+    
+    Args:
+        timeout: Seconds a request waits for its results
+        **service_kwargs: Arguments for the InferenceService, used only when
+            it is created
+    
+    Returns:
+        A client of the shared service
+    """
+    global _shared_service
+    with _shared_service_lock:
+        if _shared_service is None:
+            _shared_service = InferenceService(**service_kwargs)
+        return InferenceClient(_shared_service, timeout=timeout)
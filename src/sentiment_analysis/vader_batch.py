@@ -0,0 +1,309 @@
+import re
+import string
+from typing import Dict, List, Optional
+
+import numpy as np
+from vaderSentiment.vaderSentiment import (
+    SentimentIntensityAnalyzer, BOOSTER_DICT, NEGATE, SPECIAL_CASES, C_INCR, N_SCALAR
+)
+
+# Words of the multi-word idioms and boosters that VADER matches as n-grams
+IDIOM_WORDS = frozenset(
+    word for phrase in list(SPECIAL_CASES) + list(BOOSTER_DICT) if " " in phrase for word in phrase.split()
+)
+
+# Characters that can be emojis
+_NON_ASCII = re.compile(r"[^\x00-\x7f]")
+
+# Id given to words that do not occur in a batch, and to positions before or after a text
+_ABSENT = -1
+_OUTSIDE = -2
+
+class BatchVaderScorer:
+    """
+    Score many texts with VADER at once.
+    
+    The batch is tokenized up front and every distinct word is looked up in
+    the lexicon once. VADER's rules (negation, boosters, capitalization,
+    "least" and "but") are then applied to all tokens of the batch together
+    with NumPy, in the same order and with the same floating point
+    operations as vaderSentiment, so the scores are identical to calling
+    polarity_scores on each text.
+    """
+    
+    def __init__(self, analyzer: Optional[SentimentIntensityAnalyzer] = None):
+        """
+        Load the lexicons.
+        
+        Args:
+            analyzer: An existing vaderSentiment analyzer whose lexicons to
+                reuse (a new one is created if omitted)
+        """
+        analyzer = analyzer or SentimentIntensityAnalyzer()
+        self.lexicon = analyzer.lexicon
+        
+        # vaderSentiment replaces emojis character by character, so only
+        # single-character entries of the emoji lexicon can ever match
+        self.emojis = {emoji: description for emoji, description in analyzer.emojis.items() if len(emoji) == 1}
+        self._ascii_emojis = any(emoji.isascii() for emoji in self.emojis)
+    
+    def _replace_emojis(self, text: str) -> str:
+        """Replace emojis with their descriptions, spaced exactly as vaderSentiment does."""
+        # Most posts are plain ASCII, which holds no emojis
+        if text.isascii() and not self._ascii_emojis:
+            return text
+        
+        pieces = []
+        last = 0
+        candidates = enumerate(text) if self._ascii_emojis else (
+            (match.start(), match.group()) for match in _NON_ASCII.finditer(text)
+        )
+        for start, character in candidates:
+            description = self.emojis.get(character)
+            if description is None:
+                continue
+            pieces.append(text[last:start])
+            pieces.append(description if start == 0 or text[start - 1] == " " else " " + description)
+            last = start + 1
+        
+        pieces.append(text[last:])
+        return "".join(pieces)
+    
+    @staticmethod
+    def _split_words(text: str, stripped: Dict[str, str]) -> List[str]:
+        """Split a text into words, stripping punctuation unless the token is an emoticon."""
+        words = []
+        for token in text.split():
+            word = stripped.get(token)
+            if word is None:
+                word = token.strip(string.punctuation)
+                if len(word) <= 2:
+                    word = token
+                stripped[token] = word
+            words.append(word)
+        return words
+    
+    def polarity_scores(self, text: str) -> Dict[str, float]:
+        """Score a single text, as vaderSentiment's polarity_scores."""
+        return self.polarity_scores_batch([text])[0]
+    
+    def polarity_scores_batch(self, texts: List[str]) -> List[Dict[str, float]]:
+        """
+        Score several texts.
+        
+        Args:
+            texts: The texts to score
+        
+        Returns:
+            A list of dictionaries with "neg", "neu", "pos" and "compound"
+            scores, in the order of the input texts
+        """
+        if not texts:
+            return []
+        
+        # Tokenize the whole batch, stripping each distinct token only once
+        prepared = [self._replace_emojis(text).strip() for text in texts]
+        stripped = {}
+        words_per_text = [self._split_words(text, stripped) for text in prepared]
+        
+        lengths = np.array([len(words) for words in words_per_text], dtype=np.int64)
+        starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+        raw_words = [word for words in words_per_text for word in words]
+        
+        text_index = np.repeat(np.arange(len(texts)), lengths)
+        position = np.arange(len(raw_words)) - starts[text_index]
+        remaining = lengths[text_index] - position - 1
+        
+        sentiments = self._token_sentiments(raw_words, text_index, position, remaining, lengths, starts)
+        return self._score_valence(sentiments, prepared, text_index, lengths, starts)
+    
+    def _token_sentiments(self, raw_words: List[str], text_index: np.ndarray, position: np.ndarray,
+                          remaining: np.ndarray, lengths: np.ndarray, starts: np.ndarray) -> np.ndarray:
+        """
+        Compute the valence of every token in the batch.
+        
+        Follows SentimentIntensityAnalyzer.sentiment_valence step by step,
+        with each step applied to all tokens at once.
+        
+        Returns:
+            The valence of each token (0 for tokens that are not sentiment words)
+        """
+        # Map each distinct lowercased word to an id and look up its features once
+        vocabulary = {}
+        ids = np.array([vocabulary.setdefault(word.lower(), len(vocabulary)) for word in raw_words], dtype=np.int64)
+        words = list(vocabulary)
+        
+        in_lexicon = np.array([word in self.lexicon for word in words], dtype=bool)[ids]
+        lexicon_valence = np.array([self.lexicon.get(word, 0.0) for word in words], dtype=np.float64)[ids]
+        is_booster = np.array([word in BOOSTER_DICT for word in words], dtype=bool)[ids]
+        booster_value = np.array([BOOSTER_DICT.get(word, 0.0) for word in words], dtype=np.float64)[ids]
+        is_negation = np.array([word in NEGATE or "n't" in word for word in words], dtype=bool)[ids]
+        is_idiom_word = np.array([word in IDIOM_WORDS for word in words], dtype=bool)[ids]
+        is_upper = np.array([word.isupper() for word in raw_words], dtype=bool)
+        
+        # Capitalization only counts if some, but not all, words of a text are in capitals
+        upper_counts = np.bincount(text_index, weights=is_upper, minlength=len(lengths))
+        cap_differential = (lengths - upper_counts > 0) & (lengths - upper_counts < lengths)
+        cap_differential = cap_differential[text_index]
+        
+        def word_id(word):
+            return vocabulary.get(word, _ABSENT)
+        
+        def shifted(values, offset, fill):
+            """Return the values of the token offset positions later (or earlier) in the same text."""
+            result = np.full(len(values), fill, dtype=values.dtype)
+            if offset > 0:
+                inside = np.flatnonzero(remaining >= offset)
+            else:
+                inside = np.flatnonzero(position >= -offset)
+            result[inside] = values[inside + offset]
+            return result
+        
+        previous_ids = {d: shifted(ids, -d, _OUTSIDE) for d in (1, 2, 3)}
+        next_ids = shifted(ids, 1, _OUTSIDE)
+        previous_in_lexicon = {d: shifted(in_lexicon, -d, False) for d in (1, 2, 3)}
+        
+        def previous_is(d, *candidates):
+            return np.isin(previous_ids[d], [word_id(word) for word in candidates])
+        
+        # Boosters and "kind of" are modifiers, not sentiment words
+        skipped = is_booster | ((ids == word_id("kind")) & (next_ids == word_id("of")))
+        active = in_lexicon & ~skipped
+        
+        valence = lexicon_valence.copy()
+        
+        # "no" followed by a lexicon word negates that word instead of counting itself
+        no_id = word_id("no")
+        valence[(ids == no_id) & (remaining > 0) & shifted(in_lexicon, 1, False)] = 0.0
+        
+        after_no = (
+            previous_is(1, "no") | previous_is(2, "no") |
+            (previous_is(3, "no") & previous_is(1, "or", "nor"))
+        )
+        valence = np.where(after_no, lexicon_valence * N_SCALAR, valence)
+        
+        # Emphasis by capitals
+        emphasized = is_upper & cap_differential
+        valence = np.where(emphasized, np.where(valence > 0, valence + C_INCR, valence - C_INCR), valence)
+        
+        # Boosters and negations up to three words before the sentiment word
+        for d, damping in ((1, None), (2, 0.95), (3, 0.9)):
+            applies = (position >= d) & ~previous_in_lexicon[d]
+            
+            booster = shifted(is_booster, -d, False)
+            scalar = np.where(booster, shifted(booster_value, -d, 0.0), 0.0)
+            scalar = np.where(booster & (valence < 0), scalar * -1, scalar)
+            emphasized_booster = booster & shifted(is_upper, -d, False) & cap_differential
+            scalar = np.where(emphasized_booster, np.where(valence > 0, scalar + C_INCR, scalar - C_INCR), scalar)
+            if damping is not None:
+                scalar = np.where(scalar != 0, scalar * damping, scalar)
+            valence = np.where(applies, valence + scalar, valence)
+            
+            negated = shifted(is_negation, -d, False)
+            if d == 1:
+                intensified = np.zeros(len(ids), dtype=bool)
+                kept = intensified
+            elif d == 2:
+                intensified = previous_is(2, "never") & previous_is(1, "so", "this")
+                kept = previous_is(2, "without") & previous_is(1, "doubt")
+            else:
+                intensified = (previous_is(3, "never") & previous_is(2, "so", "this")) | previous_is(1, "so", "this")
+                kept = previous_is(3, "without") & (previous_is(2, "doubt") | previous_is(1, "doubt"))
+            
+            valence = np.where(applies & intensified, valence * 1.25, valence)
+            valence = np.where(applies & ~intensified & ~kept & negated, valence * N_SCALAR, valence)
+        
+        # Idioms are matched as text, but only near words that can start one
+        near_idiom = is_idiom_word.copy()
+        for offset in (-3, -2, -1, 1, 2):
+            near_idiom |= shifted(is_idiom_word, offset, False)
+        
+        for k in np.flatnonzero(active & (position >= 3) & ~previous_in_lexicon[3] & near_idiom):
+            start = starts[text_index[k]]
+            text_words = [words[word] for word in ids[start:start + lengths[text_index[k]]]]
+            valence[k] = SentimentIntensityAnalyzer._special_idioms_check(float(valence[k]), text_words, position[k])
+        
+        # "least" before a sentiment word negates it, except in "at least" and "very least"
+        after_least = previous_is(1, "least") & ~previous_in_lexicon[1]
+        least_negates = after_least & (((position > 1) & ~previous_is(2, "at", "very")) | (position == 1))
+        valence = np.where(least_negates, valence * N_SCALAR, valence)
+        
+        sentiments = np.where(active, valence, 0.0)
+        
+        # "but" reweights the words around it; VADER's rule depends on
+        # repeated values, so it is applied per text with the original code
+        but_counts = np.bincount(text_index[ids == word_id("but")], minlength=len(lengths))
+        for t in np.flatnonzero(but_counts):
+            start, end = starts[t], starts[t] + lengths[t]
+            text_words = [words[word] for word in ids[start:end]]
+            sentiments[start:end] = SentimentIntensityAnalyzer._but_check(text_words, sentiments[start:end].tolist())
+        
+        return sentiments
+    
+    @staticmethod
+    def _sequential_sums(values: np.ndarray, lengths: np.ndarray, starts: np.ndarray) -> np.ndarray:
+        """
+        Sum the values of each text from left to right, as a Python loop would.
+        
+        NumPy's pairwise summation can differ in the last bits, so the texts
+        are summed position by position instead, longest texts first.
+        """
+        order = np.argsort(-lengths, kind="stable")
+        sorted_lengths = lengths[order]
+        sorted_starts = starts[order]
+        totals = np.zeros(len(lengths), dtype=np.float64)
+        
+        for column in range(int(sorted_lengths[0]) if len(lengths) else 0):
+            active = int(np.searchsorted(-sorted_lengths, -column, side="left"))
+            totals[:active] += values[sorted_starts[:active] + column]
+        
+        sums = np.empty(len(lengths), dtype=np.float64)
+        sums[order] = totals
+        return sums
+    
+    def _score_valence(self, sentiments: np.ndarray, prepared: List[str], text_index: np.ndarray,
+                       lengths: np.ndarray, starts: np.ndarray) -> List[Dict[str, float]]:
+        """Turn token valences into per-text scores, as SentimentIntensityAnalyzer.score_valence."""
+        # Python's sum() is used for the compound score so that it matches on every Python version
+        token_values = sentiments.tolist()
+        sum_s = np.array(
+            [sum(token_values[start:start + length]) for start, length in zip(starts.tolist(), lengths.tolist())],
+            dtype=np.float64
+        )
+        
+        # Emphasis from exclamation points (up to 4) and question marks (2 or more)
+        exclamations = np.minimum([text.count("!") for text in prepared], 4)
+        questions = np.array([text.count("?") for text in prepared])
+        punctuation = exclamations * 0.292 + np.where(questions > 1, np.where(questions <= 3, questions * 0.18, 0.96), 0)
+        
+        sum_s = np.where(sum_s > 0, sum_s + punctuation, np.where(sum_s < 0, sum_s - punctuation, sum_s))
+        compound = np.clip(sum_s / np.sqrt(sum_s * sum_s + 15), -1.0, 1.0)
+        
+        pos_sum = self._sequential_sums(np.where(sentiments > 0, sentiments + 1, 0.0), lengths, starts)
+        neg_sum = self._sequential_sums(np.where(sentiments < 0, sentiments - 1, 0.0), lengths, starts)
+        neu_count = np.bincount(text_index, weights=(sentiments == 0), minlength=len(lengths))
+        
+        pos_wins = pos_sum > np.abs(neg_sum)
+        neg_wins = pos_sum < np.abs(neg_sum)
+        pos_sum = np.where(pos_wins, pos_sum + punctuation, pos_sum)
+        neg_sum = np.where(neg_wins, neg_sum - punctuation, neg_sum)
+        
+        with np.errstate(invalid="ignore", divide="ignore"):
+            total = pos_sum + np.abs(neg_sum) + neu_count
+            pos = np.abs(pos_sum / total)
+            neg = np.abs(neg_sum / total)
+            neu = np.abs(neu_count / total)
+        
+        results = []
+        for t, length in enumerate(lengths.tolist()):
+            if not length:
+                results.append({"neg": 0.0, "neu": 0.0, "pos": 0.0, "compound": 0.0})
+                continue
+            results.append({
+                "neg": round(float(neg[t]), 3),
+                "neu": round(float(neu[t]), 3),
+                "pos": round(float(pos[t]), 3),
+                "compound": round(float(compound[t]), 4)
+            })
+        
+        return results
@@ -0,0 +1,57 @@
+import logging
+import threading
+from typing import Dict, Optional, Tuple
+
+from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+
+from .resources import ResourceManager, get_resource_manager
+from .vader_batch import BatchVaderScorer
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# VADER analyzers and batch scorers of this process, by lexicon paths. Both
+# only read their lexicons after loading, so threads can share them.
+_analyzers: Dict[Tuple[str, ...], SentimentIntensityAnalyzer] = {}
+_scorers: Dict[Tuple[str, ...], BatchVaderScorer] = {}
+_lock = threading.Lock()
+_load_count = 0
+
+def get_vader_analyzer(resources: Optional[ResourceManager] = None) -> SentimentIntensityAnalyzer:
+    """
+    Return the shared VADER analyzer, loading its lexicons on first use.
+    
+    Args:
+        resources: Resolves the lexicon files (defaults to the process-wide
+            resource manager)
+    
+    Returns:
+        The analyzer shared by every caller using the same lexicon files
+    """
+    global _load_count
+    paths = tuple((resources or get_resource_manager()).vader_lexicon_paths())
+    
+    with _lock:
+        if paths not in _analyzers:
+            _analyzers[paths] = SentimentIntensityAnalyzer(*paths)
+            _load_count += 1
+            logger.info(f"Loaded VADER lexicon (load {_load_count} in this process)")
+        return _analyzers[paths]
+
+def get_vader_scorer(resources: Optional[ResourceManager] = None) -> BatchVaderScorer:
+    """Return the shared batch scorer over the shared VADER analyzer's lexicons."""
+    analyzer = get_vader_analyzer(resources)
+    paths = tuple((resources or get_resource_manager()).vader_lexicon_paths())
+    
+    with _lock:
+        if paths not in _scorers:
+            _scorers[paths] = BatchVaderScorer(analyzer)
+        return _scorers[paths]
+
+def vader_load_count() -> int:
+    """Return how many times this process has loaded a VADER lexicon."""
+    return _load_count
@@ -0,0 +1,135 @@
+import sys
+import os
+import json
+import unittest
+
+# Add parent directory to path to allow imports from src
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.sentiment_analysis import SentimentAggregator
+
+class TestSentimentAggregator(unittest.TestCase):
+    """Unit tests for the SentimentAggregator class."""
+    
+    def setUp(self):
+        """Set up the test case."""
+        self.posts = [
+            {
+                "sentiment": {"category": "positive", "scores": {"compound": 0.7}},
+                "emotions": {"joy": 0.8, "sadness": 0.1}
+            },
+            {
+                "sentiment": {"category": "negative", "scores": {"compound": -0.7}},
+                "emotions": {"anger": 0.8, "joy": 0.1}
+            },
+            {
+                "sentiment": {"category": "neutral", "scores": {"compound": 0.1}},
+                "emotions": {"surprise": 0.5, "joy": 0.3}
+            },
+            {
+                "sentiment": {"category": "positive", "scores": {"compound": 1.0}},
+                "emotions": {}
+            }
+        ]
+    
+    def test_result(self):
+        """Test aggregating posts in a single pass."""
+        result = SentimentAggregator(histogram_bins=4).update_many(iter(self.posts)).result()
+        
+        self.assertEqual(result["sentiment_counts"], {"positive": 2, "neutral": 1, "negative": 1})
+        self.assertAlmostEqual(result["average_sentiment"], 0.275)
+        self.assertAlmostEqual(result["emotion_distribution"]["joy"], 0.4)
+        self.assertAlmostEqual(result["emotion_distribution"]["anger"], 0.8)
+        self.assertEqual(result["compound_histogram"], [1, 0, 1, 2])
+    
+    def test_empty(self):
+        """Test the result of an empty aggregate."""
+        result = SentimentAggregator().result()
+        
+        self.assertEqual(result["sentiment_counts"], {"positive": 0, "neutral": 0, "negative": 0})
+        self.assertEqual(result["emotion_distribution"], {})
+        self.assertEqual(result["average_sentiment"], 0)
+    
+    def test_merge(self):
+        """Test that merged partial aggregates equal a single aggregate."""
+        whole = SentimentAggregator().update_many(self.posts)
+        
+        first = SentimentAggregator().update_many(self.posts[:1])
+        second = SentimentAggregator().update_many(self.posts[1:])
+        
+        # Partial aggregates can travel between processes as JSON
+        second = SentimentAggregator.from_dict(json.loads(json.dumps(second.to_dict())))
+        merged = first.merge(second)
+        
+        self.assertEqual(merged.result()["sentiment_counts"], whole.result()["sentiment_counts"])
+        self.assertEqual(merged.result()["compound_histogram"], whole.result()["compound_histogram"])
+        self.assertAlmostEqual(merged.result()["average_sentiment"], whole.result()["average_sentiment"])
+        for emotion, score in whole.result()["emotion_distribution"].items():
+            self.assertAlmostEqual(merged.result()["emotion_distribution"][emotion], score)
+    
+    def test_merge_shared_cluster(self):
+        """Test that a cluster counted by both partials counts once after merging."""
+        def post(cluster_id, category, compound, joy):
+            return {
+                "sentiment": {"category": category, "scores": {"compound": compound}},
+                "emotions": {"joy": joy},
+                "cluster_id": cluster_id
+            }
+        
+        posts = [post("viral", "positive", 0.8, 0.9), post("a", "negative", -0.6, 0.1),
+                 post("viral", "positive", 0.8, 0.9), post("b", "neutral", 0.0, 0.5)]
+        whole = SentimentAggregator().update_many(posts)
+        
+        first = SentimentAggregator().update_many(posts[:2])
+        second = SentimentAggregator().update_many(posts[2:])
+        second = SentimentAggregator.from_dict(json.loads(json.dumps(second.to_dict())))
+        merged = first.merge(second).result()
+        
+        self.assertEqual(merged["sentiment_counts"], {"positive": 1, "neutral": 1, "negative": 1})
+        self.assertEqual(merged["sentiment_counts"], whole.result()["sentiment_counts"])
+        self.assertEqual(merged["duplicate_posts"], 1)
+        self.assertEqual(merged["compound_histogram"], whole.result()["compound_histogram"])
+        self.assertAlmostEqual(merged["average_sentiment"], whole.result()["average_sentiment"])
+        self.assertAlmostEqual(merged["emotion_distribution"]["joy"], 0.5)
+    
+    def test_clusters_are_bounded(self):
+        """Test that only the most recently seen clusters are remembered."""
+        aggregator = SentimentAggregator(max_clusters=2)
+        for cluster_id in ["a", "b", "a", "c", "a", "b"]:
+            aggregator.update({"sentiment": {"category": "neutral", "scores": {"compound": 0.0}}, "cluster_id": cluster_id})
+        
+        self.assertEqual(list(aggregator.clusters), ["a", "b"])
+        # "b" was forgotten when "c" arrived, so its repeat counts again
+        self.assertEqual(aggregator.result()["duplicate_posts"], 2)
+        self.assertEqual(aggregator.result()["sentiment_counts"]["neutral"], 4)
+    
+    def test_tiered_estimate(self):
+        """Test the emotion estimate from a fully scored stratum and a random sample."""
+        def post(tier, joy=None):
+            return {
+                "sentiment": {"category": "neutral", "scores": {"compound": 0.0}},
+                "emotions": {} if joy is None else {"joy": joy},
+                "emotion_tier": tier
+            }
+        
+        posts = [post("ambiguous", 0.2), post("ambiguous", 0.4)]
+        posts += [post("sample", 0.6), post("sample", 1.0)] + [post("skipped") for _ in range(2)]
+        
+        result = SentimentAggregator().update_many(posts).result()
+        
+        # The sample mean (0.8) stands for all four unambiguous posts
+        self.assertAlmostEqual(result["emotion_distribution"]["joy"], (0.2 + 0.4 + 4 * 0.8) / 6)
+        
+        # Sample variance 0.08 with half of the population sampled
+        self.assertAlmostEqual(result["emotion_distribution_error"]["joy"], 4 / 6 * (0.08 / 2 * 0.5) ** 0.5)
+        
+        # Untiered posts report no error
+        self.assertNotIn("emotion_distribution_error", SentimentAggregator().update_many(self.posts).result())
+    
+    def test_merge_mismatched_bins(self):
+        """Test that aggregates with different histograms cannot be merged."""
+        with self.assertRaises(ValueError):
+            SentimentAggregator(histogram_bins=10).merge(SentimentAggregator(histogram_bins=20))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+import sys
+import os
+import unittest
+import tempfile
+import shutil
+
+# Add parent directory to path to allow imports from src
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.sentiment_analysis import AnalysisCache
+
+class TestAnalysisCache(unittest.TestCase):
+    """Unit tests for the AnalysisCache class."""
+    
+    def setUp(self):
+        """Set up the test case."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.cache = AnalysisCache(os.path.join(self.temp_dir, "cache.sqlite"))
+        self.result = {
+            "sentiment": {"category": "positive", "scores": {"neg": 0.0, "neu": 0.3, "pos": 0.7, "compound": 0.8}},
+            "emotions": {"joy": 0.8}
+        }
+    
+    def tearDown(self):
+        """Clean up after the test."""
+        self.cache.close()
+        shutil.rmtree(self.temp_dir)
+    
+    def test_make_key(self):
+        """Test that keys depend on normalized text and model signature."""
+        key = self.cache.make_key("I love  this\nproduct", "model-a")
+        
+        self.assertEqual(key, self.cache.make_key(" I love this product ", "model-a"))
+        self.assertNotEqual(key, self.cache.make_key("I love this product", "model-b"))
+        self.assertNotEqual(key, self.cache.make_key("I LOVE this product", "model-a"))
+    
+    def test_put_and_get_many(self):
+        """Test storing and retrieving results in bulk."""
+        self.cache.put_many({"a": self.result, "b": self.result})
+        
+        found = self.cache.get_many(["a", "b", "c"])
+        
+        self.assertEqual(found, {"a": self.result, "b": self.result})
+        self.assertIsNone(self.cache.get("c"))
+    
+    def test_persistence(self):
+        """Test that results survive reopening the database."""
+        self.cache.put("a", self.result)
+        self.cache.close()
+        
+        self.cache = AnalysisCache(os.path.join(self.temp_dir, "cache.sqlite"))
+        
+        self.assertEqual(self.cache.get("a"), self.result)
+    
+    def test_stats(self):
+        """Test hit rate reporting."""
+        self.cache.put("a", self.result)
+        self.cache.get_many(["a", "a", "b", "c"])
+        
+        stats = self.cache.stats()
+        
+        self.assertEqual(stats["entries"], 1)
+        self.assertEqual(stats["hits"], 2)
+        self.assertEqual(stats["misses"], 2)
+        self.assertAlmostEqual(stats["hit_rate"], 0.5)
+    
+    def test_eviction(self):
+        """Test that least recently used entries are evicted past the size limit."""
+        entry_size = len('{"sentiment": {}, "emotions": {}}')
+        self.cache.max_size_bytes = entry_size * 4 - 1
+        
+        for key in ["a", "b", "c"]:
+            self.cache.put(key, {"sentiment": {}, "emotions": {}})
+        
+        # Touch "a" so that "b" becomes the least recently used entry
+        self.cache.get("a")
+        self.cache.put("d", {"sentiment": {}, "emotions": {}})
+        
+        self.assertEqual(set(self.cache.get_many(["a", "b", "c", "d"])), {"a", "c", "d"})
+
+if __name__ == "__main__":
+    unittest.main()
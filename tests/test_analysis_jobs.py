@@ -0,0 +1,123 @@
+import sys
+import os
+import time
+import unittest
+import tempfile
+import shutil
+import threading
+
+# Add parent directory to path to allow imports from src
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from analysis_jobs import JobStore, JobQueue, MAX_ATTEMPTS, QUEUED, RUNNING, DONE, FAILED
+
+class TestJobQueue(unittest.TestCase):
+    """Unit tests for the persisted analysis job queue."""
+    
+    def setUp(self):
+        """Set up the test case."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, "jobs.sqlite")
+        self.store = JobStore(self.path)
+    
+    def tearDown(self):
+        """Clean up after the test."""
+        self.store.close()
+        shutil.rmtree(self.temp_dir)
+    
+    def wait_for(self, queue, job_id, timeout=5):
+        """Poll a job until it is done or failed."""
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            job = queue.get(job_id)
+            if job["status"] in (DONE, FAILED):
+                return job
+            time.sleep(0.01)
+        self.fail(f"Job {job_id} did not finish")
+    
+    def test_claim_once(self):
+        """Test that a job is claimed by one runner only."""
+        job_id = self.store.create({"company_name": "Acme"})
+        
+        self.assertEqual(self.store.claim(job_id), {"company_name": "Acme"})
+        self.assertIsNone(self.store.claim(job_id))
+        self.assertEqual(self.store.get(job_id)["status"], RUNNING)
+        self.assertIsNone(self.store.get("missing"))
+    
+    def test_run_jobs(self):
+        """Test that submitted jobs run in the background and store their results or errors."""
+        def run_job(params, progress):
+            progress({"stage": "analyze"})
+            if params["n"] < 0:
+                raise ValueError("negative")
+            return {"square": params["n"] ** 2}
+        
+        queue = JobQueue(self.store, run_job, max_workers=2)
+        try:
+            done = self.wait_for(queue, queue.submit({"n": 3}))
+            failed = self.wait_for(queue, queue.submit({"n": -1}))
+        finally:
+            queue.shutdown()
+        
+        self.assertEqual(done["result"], {"square": 9})
+        self.assertEqual(done["progress"], {"stage": "analyze"})
+        self.assertEqual(failed["status"], FAILED)
+        self.assertEqual(failed["error"], "negative")
+    
+    def test_bounded_workers(self):
+        """Test that no more than max_workers jobs run at once."""
+        lock = threading.Lock()
+        running = [0, 0]
+        
+        def run_job(params, progress):
+            with lock:
+                running[0] += 1
+                running[1] = max(running[1], running[0])
+            time.sleep(0.05)
+            with lock:
+                running[0] -= 1
+            return params
+        
+        queue = JobQueue(self.store, run_job, max_workers=2)
+        try:
+            job_ids = [queue.submit({"n": n}) for n in range(6)]
+            for job_id in job_ids:
+                self.wait_for(queue, job_id)
+        finally:
+            queue.shutdown()
+        
+        self.assertEqual(running[1], 2)
+    
+    def test_resume_after_restart(self):
+        """Test that queued jobs and jobs of a dead process run when a new queue starts."""
+        queued_id = self.store.create({"n": 1})
+        interrupted_id = self.store.create({"n": 2})
+        self.store.claim(interrupted_id)
+        # Pretend the claiming process died
+        self.store._conn.execute("UPDATE jobs SET owner = -1 WHERE id = ?", (interrupted_id,))
+        self.store._conn.commit()
+        self.store.close()
+        
+        self.store = JobStore(self.path)
+        queue = JobQueue(self.store, lambda params, progress: params)
+        try:
+            queue.start()
+            self.assertEqual(self.wait_for(queue, queued_id)["result"], {"n": 1})
+            self.assertEqual(self.wait_for(queue, interrupted_id)["result"], {"n": 2})
+        finally:
+            queue.shutdown()
+    
+    def test_recover_gives_up(self):
+        """Test that a job interrupted MAX_ATTEMPTS times is failed instead of requeued."""
+        job_id = self.store.create({})
+        for _ in range(MAX_ATTEMPTS):
+            self.store.claim(job_id)
+            self.store._conn.execute("UPDATE jobs SET owner = -1, status = ? WHERE id = ?", (QUEUED, job_id))
+        self.store._conn.execute("UPDATE jobs SET status = ? WHERE id = ?", (RUNNING, job_id))
+        self.store._conn.commit()
+        
+        self.assertEqual(self.store.recover(), [])
+        self.assertEqual(self.store.get(job_id)["status"], FAILED)
+
+if __name__ == '__main__':
+    unittest.main()
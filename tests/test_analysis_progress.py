@@ -0,0 +1,72 @@
+import sys
+import os
+import unittest
+
+# Add parent directory to path to allow imports from src
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from analysis_progress import AnalysisProgress
+from report_aggregation import ReportAggregator
+
+class TestAnalysisProgress(unittest.TestCase):
+    """Unit tests for the progress snapshots of an analysis."""
+    
+    def setUp(self):
+        """Set up the test case."""
+        self.snapshots = []
+        self.progress = AnalysisProgress(self.snapshots.append, 20, min_interval=60)
+    
+    def test_stage_changes_are_published(self):
+        """Test that every new stage publishes a snapshot."""
+        self.progress("login")
+        self.progress("search")
+        self.progress("scroll")
+        
+        self.assertEqual([snapshot["stage"] for snapshot in self.snapshots], ["login", "search", "scroll"])
+        self.assertEqual(self.snapshots[0]["post_count"], 20)
+    
+    def test_updates_within_a_stage_are_throttled(self):
+        """Test that repeated updates of the same stage are published at most every min_interval."""
+        for _ in range(5):
+            self.progress("extract", 1)
+        
+        self.assertEqual(len(self.snapshots), 1)
+        self.assertEqual(self.progress.state["posts_collected"], 5)
+        
+        # The end of collection is always published
+        self.progress.collected([{}] * 5)
+        self.assertEqual(len(self.snapshots), 2)
+        self.assertEqual(self.snapshots[-1]["posts_collected"], 5)
+    
+    def test_running_sentiments(self):
+        """Test that the running aggregate's counts are published."""
+        aggregate = ReportAggregator()
+        aggregate.update({"text": "great", "sentiment": "positive", "compound_score": 0.8, "date": "2024-01-01"})
+        aggregate.update({"text": "bad", "sentiment": "negative", "compound_score": -0.6, "date": "2024-01-01"})
+        self.progress.analyzed(aggregate)
+        
+        self.assertEqual(self.snapshots[-1]["stage"], "analyze")
+        self.assertEqual(self.snapshots[-1]["posts_analyzed"], 2)
+        self.assertEqual(self.snapshots[-1]["sentiments"], {"positive": 1, "neutral": 0, "negative": 1})
+    
+    def test_finished(self):
+        """Test that the finished snapshot carries the final counts and chart data."""
+        self.progress.rendering()
+        result = {"sentiments": {"positive": 3, "neutral": 1, "negative": 2}, "chart_data": {"top_issues": {}}}
+        self.progress.finished(result)
+        
+        snapshot = self.snapshots[-1]
+        self.assertEqual(snapshot["stage"], "done")
+        self.assertEqual(snapshot["posts_analyzed"], 6)
+        self.assertEqual(snapshot["chart_data"], {"top_issues": {}})
+    
+    def test_snapshots_are_copies(self):
+        """Test that later updates do not change published snapshots."""
+        self.progress("scroll")
+        self.progress("extract", 3)
+        
+        self.assertEqual(self.snapshots[0]["posts_collected"], 0)
+        self.assertEqual(self.snapshots[1]["posts_collected"], 3)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+import sys
+import os
+import unittest
+import threading
+from unittest.mock import patch, MagicMock
+
+# Add parent directory to path to allow imports from src
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from linkedin_scraper import BrowserPool, scrape_linkedin_for_company
+
+class TestBrowserPool(unittest.TestCase):
+    """Unit tests for the sharing of logged-in browsers between scrapes."""
+    
+    def setUp(self):
+        """Set up the test case."""
+        setup_patcher = patch('linkedin_scraper.setup_driver', side_effect=lambda: MagicMock())
+        login_patcher = patch('linkedin_scraper.login_to_linkedin', return_value=True)
+        self.setup_driver = setup_patcher.start()
+        self.login = login_patcher.start()
+        self.addCleanup(setup_patcher.stop)
+        self.addCleanup(login_patcher.stop)
+        self.pool = BrowserPool(size=2, username="user", password="secret")
+    
+    def test_browsers_are_reused(self):
+        """Test that a released browser is lent again without starting or logging in another."""
+        driver = self.pool.acquire()
+        self.pool.release(driver)
+        
+        self.assertIs(self.pool.acquire(), driver)
+        self.assertEqual(self.setup_driver.call_count, 1)
+        self.assertEqual(self.login.call_count, 1)
+    
+    def test_size_is_bounded(self):
+        """Test that a scrape waits for a browser once size are borrowed."""
+        first = self.pool.acquire()
+        self.pool.acquire()
+        borrowed = []
+        waiter = threading.Thread(target=lambda: borrowed.append(self.pool.acquire()))
+        waiter.start()
+        waiter.join(0.2)
+        
+        self.assertTrue(waiter.is_alive())
+        self.pool.release(first)
+        waiter.join(5)
+        self.assertEqual(borrowed, [first])
+        self.assertEqual(self.setup_driver.call_count, 2)
+    
+    def test_unhealthy_browsers_are_replaced(self):
+        """Test that a browser released as unhealthy is quit and frees its slot."""
+        drivers = [self.pool.acquire(), self.pool.acquire()]
+        self.pool.release(drivers[0], healthy=False)
+        
+        drivers[0].quit.assert_called_once()
+        self.assertNotIn(self.pool.acquire(), drivers)
+        self.assertEqual(self.setup_driver.call_count, 3)
+    
+    def test_failed_login_is_not_retried(self):
+        """Test that once a login fails, later scrapes get no browser without trying again."""
+        self.login.return_value = False
+        
+        self.assertIsNone(self.pool.acquire())
+        self.assertIsNone(self.pool.acquire())
+        self.assertEqual(self.login.call_count, 1)
+    
+    def test_close(self):
+        """Test that closing the pool quits every browser."""
+        drivers = [self.pool.acquire(), self.pool.acquire()]
+        self.pool.release(drivers[0])
+        self.pool.close()
+        
+        for driver in drivers:
+            driver.quit.assert_called_once()
+    
+    @patch('linkedin_scraper.scrape_public_posts', return_value=[])
+    @patch('linkedin_scraper.get_company_posts', return_value=[])
+    @patch('linkedin_scraper.search_company', return_value=None)
+    def test_scrape_borrows_from_the_pool(self, search_company, get_company_posts, scrape_public_posts):
+        """Test that scrapes given a pool give their browser back instead of quitting it."""
+        for company_name in ["Acme", "Globex"]:
+            posts, real_data = scrape_linkedin_for_company(company_name, 4, browsers=self.pool)
+            self.assertEqual(len(posts), 4)
+            self.assertFalse(real_data)
+        
+        self.assertEqual(self.setup_driver.call_count, 1)
+        self.assertIs(search_company.call_args_list[0][0][0], search_company.call_args_list[1][0][0])
+        search_company.call_args[0][0].quit.assert_not_called()
+
+if __name__ == '__main__':
+    unittest.main()
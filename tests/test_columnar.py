@@ -0,0 +1,94 @@
+import sys
+import os
+import unittest
+
+import numpy as np
+
+# Add parent directory to path to allow imports from src
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.sentiment_analysis import AnalysisColumns, SentimentAggregator
+from src.report_generation import select_sample_posts
+
+class TestAnalysisColumns(unittest.TestCase):
+    """Unit tests for the AnalysisColumns class."""
+    
+    def setUp(self):
+        """Set up the test case."""
+        self.posts = []
+        for i, compound in enumerate([0.7, -0.7, 0.1, 1.0, -0.2, 0.7, -0.7]):
+            category = "positive" if compound >= 0.05 else "negative" if compound <= -0.05 else "neutral"
+            self.posts.append({
+                "text": f"post {i}",
+                "date": "2023-01-01",
+                "sentiment": {
+                    "scores": {"neg": 0.1234, "neu": 0.5, "pos": 0.3766, "compound": compound},
+                    "category": category
+                },
+                "emotions": {"joy": 0.8, "sadness": 0.1} if i % 2 else {}
+            })
+        self.columns = AnalysisColumns.from_posts(self.posts)
+    
+    def test_column_types(self):
+        """Test that scores are stored in compact NumPy columns."""
+        self.assertEqual(self.columns.compound.dtype, np.float32)
+        self.assertEqual(self.columns.category.dtype, np.int8)
+        self.assertEqual(self.columns.emotions.shape, (len(self.posts), 7))
+        self.assertEqual(self.columns.emotions.dtype, np.float32)
+    
+    def test_dict_view(self):
+        """Test that the dictionary view reproduces the analyzed posts."""
+        self.assertEqual(len(self.columns), len(self.posts))
+        
+        for original, view in zip(self.posts, self.columns):
+            self.assertEqual(view["text"], original["text"])
+            self.assertEqual(view["sentiment"], original["sentiment"])
+            self.assertEqual(set(view["emotions"]), set(original["emotions"]))
+            for emotion, score in original["emotions"].items():
+                self.assertAlmostEqual(view["emotions"][emotion], score, places=6)
+    
+    def test_aggregate(self):
+        """Test that vectorized aggregation matches SentimentAggregator."""
+        expected = SentimentAggregator().update_many(self.posts).result()
+        result = self.columns.aggregate()
+        
+        self.assertEqual(result["sentiment_counts"], expected["sentiment_counts"])
+        self.assertEqual(result["compound_histogram"], expected["compound_histogram"])
+        self.assertAlmostEqual(result["average_sentiment"], expected["average_sentiment"], places=6)
+        self.assertEqual(set(result["emotion_distribution"]), set(expected["emotion_distribution"]))
+        for emotion, score in expected["emotion_distribution"].items():
+            self.assertAlmostEqual(result["emotion_distribution"][emotion], score, places=6)
+    
+    def test_sample_posts(self):
+        """Test that vectorized top-k matches the heap-based selection, including ties."""
+        most_positive, most_negative = self.columns.sample_posts(3)
+        expected_positive, expected_negative = select_sample_posts(self.posts, 3)
+        
+        self.assertEqual([post["text"] for post in most_positive], [post["text"] for post in expected_positive])
+        self.assertEqual([post["text"] for post in most_negative], [post["text"] for post in expected_negative])
+        
+        # select_sample_posts dispatches to the columnar implementation
+        self.assertEqual(select_sample_posts(self.columns, 3), (most_positive, most_negative))
+    
+    def test_sample_posts_ties(self):
+        """Test that tied scores are selected like slicing a full descending sort."""
+        posts = [{"text": str(i), "sentiment": {"scores": {"compound": score}, "category": "neutral"}}
+                 for i, score in enumerate([0.5, -0.5, 0, 0, 0.5, 0.5, 0])]
+        columns = AnalysisColumns.from_posts(posts)
+        most_positive, most_negative = columns.sample_posts(3)
+        
+        sorted_posts = sorted(posts, key=lambda x: x["sentiment"]["scores"]["compound"], reverse=True)
+        self.assertEqual([post["text"] for post in most_positive], [post["text"] for post in sorted_posts[:3]])
+        self.assertEqual([post["text"] for post in most_negative], [post["text"] for post in sorted_posts[-3:]])
+        self.assertEqual(columns.top_k(3, largest=False).tolist(), [1, 6, 3])
+    
+    def test_empty(self):
+        """Test an empty store."""
+        columns = AnalysisColumns([])
+        
+        self.assertEqual(columns.sample_posts(), ([], []))
+        self.assertEqual(columns.aggregate()["average_sentiment"], 0)
+        self.assertEqual(columns.aggregate()["emotion_distribution"], {})
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+import sys
+import os
+import unittest
+
+# Add parent directory to path to allow imports from src
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from company_comparison import side_by_side, format_table, parse_arguments
+from report_aggregation import ReportAggregator
+
+FEATURES = {"app": ["app"], "rewards": ["reward"]}
+ISSUES = {"fees": ["fee"], "support": ["support"]}
+
+def make_result(company_name, posts, keep_mentions=True):
+    """Build the report data of analyzed posts, like run_analysis."""
+    aggregate = ReportAggregator(FEATURES, ISSUES).update_many(posts)
+    result = {
+        'company_name': company_name,
+        'post_count': len(posts),
+        'date_range': f"{aggregate.oldest_date} to {aggregate.newest_date}",
+        'sentiments': aggregate.sentiment_counts,
+        'chart_data': aggregate.chart_data(),
+        'data_source': 'generated mock data',
+        'company_type': 'fintech',
+        'mentions': {'features': dict(aggregate.feature_counts), 'issues': dict(aggregate.issue_counts)}
+    }
+    if not keep_mentions:
+        del result['mentions']
+    return result
+
+def post(text, sentiment, date):
+    """Build an analyzed post."""
+    return {"text": text, "sentiment": sentiment, "compound_score": 0, "date": date}
+
+class TestCompanyComparison(unittest.TestCase):
+    """Unit tests for the side-by-side comparison of companies."""
+    
+    def setUp(self):
+        """Set up the test case."""
+        self.acme = make_result("Acme", [
+            post("Great app", "positive", "2024-01-05"),
+            post("Love the rewards and the app", "positive", "2024-02-01"),
+            post("Hidden fee again", "negative", "2024-02-03"),
+            post("Nothing new", "neutral", "2024-02-04")
+        ])
+        self.globex = make_result("Globex", [
+            post("Support never answers", "negative", "2024-03-10"),
+            post("The fee and the support are bad", "negative", "2024-03-11")
+        ])
+    
+    def test_sentiments(self):
+        """Test that each company's counts, shares and net sentiment are compared in order."""
+        comparison = side_by_side([self.acme, self.globex])
+        acme, globex = comparison['companies']
+        
+        self.assertEqual(acme['company'], 'Acme')
+        self.assertEqual(acme['posts'], 4)
+        self.assertEqual(acme['shares'], {'positive': 0.5, 'neutral': 0.25, 'negative': 0.25})
+        self.assertEqual(acme['net_sentiment'], 0.25)
+        self.assertEqual(globex['net_sentiment'], -1.0)
+    
+    def test_trend_is_aligned_on_all_months(self):
+        """Test that every company's trend covers the months of all companies."""
+        trend = side_by_side([self.acme, self.globex])['trend']
+        
+        self.assertEqual(trend['months'], ['2024-01', '2024-02', '2024-03'])
+        self.assertEqual(trend['companies']['Acme']['positive'], [1, 1, 0])
+        self.assertEqual(trend['companies']['Acme']['net_sentiment'], [1.0, 0.0, None])
+        self.assertEqual(trend['companies']['Globex']['negative'], [0, 0, 2])
+    
+    def test_mentions(self):
+        """Test that features and issues are compared by company, most mentioned first."""
+        comparison = side_by_side([self.acme, self.globex])
+        
+        self.assertEqual(comparison['features'], [
+            {'name': 'app', 'mentions': {'Acme': 2, 'Globex': 0}},
+            {'name': 'rewards', 'mentions': {'Acme': 1, 'Globex': 0}}
+        ])
+        # Ties are ordered by name
+        self.assertEqual(comparison['issues'], [
+            {'name': 'fees', 'mentions': {'Acme': 1, 'Globex': 1}},
+            {'name': 'support', 'mentions': {'Acme': 0, 'Globex': 2}}
+        ])
+    
+    def test_results_without_all_mentions(self):
+        """Test that analyses without all mentions are compared on their charts' top ones."""
+        acme = make_result("Acme", [post("Great app", "positive", "2024-01-05")], keep_mentions=False)
+        comparison = side_by_side([acme, self.globex])
+        
+        self.assertEqual(comparison['features'], [{'name': 'app', 'mentions': {'Acme': 1, 'Globex': 0}}])
+    
+    def test_format_table(self):
+        """Test that the table has a row per company with its top feature and issue."""
+        table = format_table(side_by_side([self.acme, self.globex])).splitlines()
+        
+        self.assertEqual(len(table), 3)
+        self.assertIn('app / fees', table[1])
+        self.assertIn('- / support', table[2])
+    
+    def test_parse_arguments(self):
+        """Test the command line of a comparison."""
+        args = parse_arguments(['Acme', 'Globex Corp', '--posts', '20', '--use-mock-data'])
+        
+        self.assertEqual(args.companies, ['Acme', 'Globex Corp'])
+        self.assertEqual(args.posts, 20)
+        self.assertEqual(args.concurrency, 3)
+        self.assertTrue(args.use_mock_data)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+import sys
+import os
+import unittest
+from unittest.mock import MagicMock
+
+# Add parent directory to path to allow imports from src
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.sentiment_analysis import SentimentAnalyzer, SentimentAggregator, PostDeduplicator
+
+ANNOUNCEMENT = "Excited to announce our new product launch today, join us for the live stream at 5pm and bring questions"
+
+class TestPostDeduplicator(unittest.TestCase):
+    """Unit tests for the PostDeduplicator class."""
+    
+    def setUp(self):
+        """Set up the test case."""
+        self.deduplicator = PostDeduplicator()
+    
+    def test_cluster(self):
+        """Test that exact and near-duplicates share a representative."""
+        texts = [
+            ANNOUNCEMENT,
+            "We are hiring engineers in Berlin this spring, send us your resume",
+            "  " + ANNOUNCEMENT.upper() + "  ",
+            "Reposting: " + ANNOUNCEMENT,
+            "Terrible customer service, I waited an hour on the phone"
+        ]
+        
+        self.assertEqual(self.deduplicator.cluster(texts), [0, 1, 0, 0, 4])
+    
+    def test_cluster_id(self):
+        """Test that cluster ids ignore case and whitespace."""
+        self.assertEqual(PostDeduplicator.cluster_id("Great  product"), PostDeduplicator.cluster_id("great product"))
+        self.assertNotEqual(PostDeduplicator.cluster_id("great product"), PostDeduplicator.cluster_id("bad product"))
+    
+    def test_invalid_bands(self):
+        """Test that the bands must divide the permutations."""
+        with self.assertRaises(ValueError):
+            PostDeduplicator(num_perm=64, bands=10)
+
+class TestDeduplicatedAnalysis(unittest.TestCase):
+    """Tests for analysis with duplicate collapsing."""
+    
+    def setUp(self):
+        """Set up the test case."""
+        self.analyzer = SentimentAnalyzer(deduplicator=PostDeduplicator())
+        self.analyzer.emotion_classifier = MagicMock()
+        self.analyzer.emotion_classifier.model.config.id2label = {0: "joy", 1: "anger"}
+        self.analyzer._encode = lambda batch: [[list(range(len(text.split())))] for text in batch]
+        self.analyzer._forward = MagicMock(side_effect=lambda batch_ids: [[0.9, 0.1] for _ in batch_ids])
+        
+        # One viral post reshared four times and one negative post
+        self.posts = [{"text": ANNOUNCEMENT + " Amazing!"} for _ in range(4)]
+        self.posts.append({"text": "Terrible customer service, I waited an hour on the phone"})
+    
+    def test_analyze_posts(self):
+        """Test that each cluster is analyzed once and the result fanned out."""
+        analyzed_posts = self.analyzer.analyze_posts(self.posts)
+        
+        # Only the two distinct texts went through the model
+        self.assertEqual(sum(len(call.args[0]) for call in self.analyzer._forward.call_args_list), 2)
+        
+        self.assertEqual(len(analyzed_posts), 5)
+        self.assertEqual(len({post["cluster_id"] for post in analyzed_posts}), 2)
+        self.assertEqual([post["cluster_size"] for post in analyzed_posts], [4, 4, 4, 4, 1])
+        self.assertEqual(analyzed_posts[3]["sentiment"], analyzed_posts[0]["sentiment"])
+        self.assertAlmostEqual(analyzed_posts[3]["emotions"]["joy"], 0.9)
+    
+    def test_clusters_count_once(self):
+        """Test that a reshared post counts once in the aggregate."""
+        aggregated = self.analyzer.get_aggregated_results(self.analyzer.analyze_posts(self.posts))
+        
+        self.assertEqual(aggregated["sentiment_counts"], {"positive": 1, "neutral": 0, "negative": 1})
+        self.assertEqual(aggregated["duplicate_posts"], 3)
+        
+        # The columnar path fans out and aggregates the same way
+        columns = self.analyzer.analyze_posts_columnar(self.posts)
+        self.assertEqual([post["cluster_size"] for post in columns], [4, 4, 4, 4, 1])
+        self.assertEqual(self.analyzer.get_aggregated_results(columns)["sentiment_counts"], aggregated["sentiment_counts"])
+        self.assertEqual(self.analyzer.get_aggregated_results(columns)["duplicate_posts"], 3)
+    
+    def test_merge_keeps_clusters(self):
+        """Test that serialized partial aggregates remember the clusters they counted."""
+        analyzed_posts = self.analyzer.analyze_posts(self.posts)
+        
+        first = SentimentAggregator().update_many(analyzed_posts[:2])
+        first = SentimentAggregator.from_dict(first.to_dict())
+        first.update_many(analyzed_posts[2:])
+        
+        self.assertEqual(first.result()["sentiment_counts"], {"positive": 1, "neutral": 0, "negative": 1})
+
+if __name__ == "__main__":
+    unittest.main()
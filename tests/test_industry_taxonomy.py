@@ -0,0 +1,86 @@
+import sys
+import os
+import unittest
+
+# Add parent directory to path to allow imports from src
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from industry_taxonomy import Taxonomy, TAXONOMY_VERSION, classify_company, get_taxonomy
+
+def industry_spec(terms, feature):
+    """Return a minimal taxonomy entry."""
+    return {
+        "name_terms": terms,
+        "strengths": {"positive": f"{feature} strengths", "negative": f"{feature} weaknesses"},
+        "recommendations": [f"Promote {{company_name}}'s {feature}."],
+        "priority_areas": [{"icon": "bi-gear", "title": feature, "items": []}],
+        "feature_keywords": {feature: [feature]},
+        "issue_keywords": {"bugs": ["bug"]},
+        "reviews": {"positive_share": 0.5, "neutral_share": 0.1, "features": [feature], "issues": ["bugs"],
+                    "templates": {}, "posts": []}
+    }
+
+class TestTaxonomy(unittest.TestCase):
+    """Unit tests for the industry taxonomy."""
+    
+    def setUp(self):
+        """Set up a small taxonomy."""
+        self.document = {
+            "version": TAXONOMY_VERSION,
+            "default_industry": "bank",
+            "industries": {
+                "bank": industry_spec(["bank", "pay"], "savings"),
+                "games": industry_spec(["game", "play"], "graphics")
+            },
+            "generic": {
+                "like": "games",
+                "recommendations": ["Listen to {company_name}'s customers."],
+                "reviews": {"positive_share": 0.4}
+            }
+        }
+        self.taxonomy = Taxonomy(self.document)
+    
+    def test_classify(self):
+        """Test that the first industry with a term in the name wins, and the default otherwise."""
+        self.assertEqual(self.taxonomy.classify("Game Studio"), "games")
+        self.assertEqual(self.taxonomy.classify("PayPlay"), "bank")
+        self.assertEqual(self.taxonomy.classify("Acme"), "bank")
+    
+    def test_industry(self):
+        """Test the lookups of an industry."""
+        industry = self.taxonomy.industry("games")
+        
+        self.assertEqual(industry.recommendations("Acme"), ["Promote Acme's graphics."])
+        self.assertEqual(industry.strength({"positive": 2, "negative": 1}), "graphics strengths")
+        self.assertEqual(industry.strength({"positive": 1, "negative": 1}), "graphics weaknesses")
+    
+    def test_generic_industry(self):
+        """Test that unknown industries get the generic entry, completed by the industry it is like."""
+        generic = self.taxonomy.industry("unknown")
+        
+        self.assertIs(generic, self.taxonomy.generic)
+        self.assertEqual(generic.recommendations("Acme"), ["Listen to Acme's customers."])
+        self.assertEqual(generic.feature_keywords, {"graphics": ["graphics"]})
+        self.assertEqual(generic.reviews["positive_share"], 0.4)
+        self.assertEqual(generic.reviews["features"], ["graphics"])
+    
+    def test_unsupported_version(self):
+        """Test that a taxonomy file of another version is rejected."""
+        self.document["version"] = TAXONOMY_VERSION + 1
+        
+        with self.assertRaises(ValueError):
+            Taxonomy(self.document)
+    
+    def test_shipped_taxonomy(self):
+        """Test the taxonomy file shipped with the app."""
+        taxonomy = get_taxonomy()
+        
+        self.assertIs(get_taxonomy(), taxonomy)
+        self.assertEqual(list(taxonomy.industries), ["fintech", "tech", "food", "travel", "retail"])
+        self.assertEqual(classify_company("Pizza Palace"), "food")
+        self.assertEqual(classify_company("Acme"), "fintech")
+        for industry in list(taxonomy.industries.values()) + [taxonomy.generic]:
+            self.assertEqual(set(industry.reviews["templates"]), {"positive", "negative", "neutral"})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,136 @@
+import sys
+import os
+import gzip
+import json
+import unittest
+
+from flask import Flask, request
+
+# Add parent directory to path to allow imports from src
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import json_api
+from json_api import compact_report, json_response
+from report_aggregation import ReportAggregator
+
+def make_result(posts):
+    """Build the report data of analyzed posts, like run_analysis."""
+    aggregate = ReportAggregator({"app": ["app"]}, {"fees": ["fee"]}).update_many(posts)
+    return {
+        'company_name': 'Acme',
+        'report': 'Full report text',
+        'post_count': 10,
+        'date_range': f"{aggregate.oldest_date} to {aggregate.newest_date}",
+        'sentiments': aggregate.sentiment_counts,
+        'chart_data': aggregate.chart_data(),
+        'sample_posts': {'positive': aggregate.most_positive(), 'negative': aggregate.most_negative()},
+        'data_source': 'generated mock data',
+        'priority_areas': [],
+        'company_type': 'tech'
+    }
+
+class TestJsonApi(unittest.TestCase):
+    """Unit tests for the JSON analysis API's payloads and responses."""
+    
+    def setUp(self):
+        """Set up the test case."""
+        self.posts = [
+            {"text": "Love the app", "sentiment": "positive", "compound_score": 0.81234, "date": "2024-01-03",
+             "author": "Ann", "url": "https://example.com/1", "scores": {"pos": 0.7}},
+            {"text": "The fee is too high", "sentiment": "negative", "compound_score": -0.5, "date": "2024-02-10",
+             "author": "Bob", "url": "https://example.com/2"},
+            {"text": "Just an update", "sentiment": "neutral", "compound_score": 0.0, "date": "2024-02-11",
+             "author": "Cy", "url": "https://example.com/3"}
+        ]
+        self.app = Flask(__name__)
+        self.original_brotli = json_api.brotli
+    
+    def tearDown(self):
+        """Restore the optional brotli module."""
+        json_api.brotli = self.original_brotli
+    
+    def respond(self, payload, headers=None, method='GET'):
+        """Answer a request with a payload."""
+        with self.app.test_request_context('/api/analyze', method=method, headers=headers or {}):
+            return json_response(payload, request)
+    
+    def test_compact_report(self):
+        """Test that the payload has the report's data without the report text and placeholders."""
+        payload = compact_report(make_result(self.posts))
+        
+        self.assertEqual(payload['company'], 'Acme')
+        self.assertEqual(payload['posts'], 3)
+        self.assertEqual(payload['sentiments'], {'positive': 1, 'neutral': 1, 'negative': 1})
+        self.assertEqual(payload['trend'], {'months': ['2024-01', '2024-02'], 'positive': [1, 0],
+                                            'neutral': [0, 1], 'negative': [0, 1]})
+        self.assertEqual(payload['features'], [['app', 1]])
+        self.assertEqual(payload['issues'], [['fees', 1]])
+        self.assertEqual(payload['samples']['positive'][0], {
+            'author': 'Ann', 'date': '2024-01-03', 'text': 'Love the app',
+            'url': 'https://example.com/1', 'score': 0.8123
+        })
+        self.assertNotIn('report', payload)
+        self.assertNotIn('emotions', payload)
+    
+    def test_no_features_or_issues(self):
+        """Test that the charts' placeholder bars are not part of the payload."""
+        payload = compact_report(make_result(self.posts[2:]))
+        
+        self.assertEqual(payload['features'], [])
+        self.assertEqual(payload['issues'], [])
+    
+    def test_conditional_get(self):
+        """Test that a request with the current ETag gets an empty 304."""
+        payload = compact_report(make_result(self.posts))
+        response = self.respond(payload)
+        etag = response.headers['ETag']
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(etag.startswith('W/'))
+        self.assertEqual(json.loads(response.get_data()), payload)
+        self.assertEqual(self.respond(payload).headers['ETag'], etag)
+        
+        not_modified = self.respond(payload, {'If-None-Match': etag})
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(not_modified.get_data(), b'')
+        
+        payload['posts'] += 1
+        changed = self.respond(payload, {'If-None-Match': etag})
+        self.assertEqual(changed.status_code, 200)
+        self.assertNotEqual(changed.headers['ETag'], etag)
+    
+    def test_gzip(self):
+        """Test that large bodies are gzip-compressed for clients accepting it, with their own ETag."""
+        json_api.brotli = None
+        payload = {'text': 'x' * 2000}
+        identity = self.respond(payload)
+        compressed = self.respond(payload, {'Accept-Encoding': 'gzip, deflate, br'})
+        
+        self.assertNotIn('Content-Encoding', identity.headers)
+        self.assertEqual(compressed.headers['Content-Encoding'], 'gzip')
+        self.assertEqual(compressed.headers['Vary'], 'Accept-Encoding')
+        self.assertEqual(json.loads(gzip.decompress(compressed.get_data())), payload)
+        self.assertLess(len(compressed.get_data()), len(identity.get_data()))
+        self.assertNotEqual(compressed.headers['ETag'], identity.headers['ETag'])
+        
+        # The identity representation does not match the compressed one's ETag
+        self.assertEqual(self.respond(payload, {'If-None-Match': compressed.headers['ETag']}).status_code, 200)
+    
+    def test_small_bodies_are_not_compressed(self):
+        """Test that bodies below MIN_COMPRESS_SIZE are sent as they are."""
+        response = self.respond({'ok': True}, {'Accept-Encoding': 'gzip'})
+        
+        self.assertNotIn('Content-Encoding', response.headers)
+        self.assertEqual(json.loads(response.get_data()), {'ok': True})
+    
+    @unittest.skipIf(json_api.brotli is None, "brotli is not installed")
+    def test_brotli(self):
+        """Test that brotli is preferred when installed and accepted."""
+        payload = {'text': 'x' * 2000}
+        response = self.respond(payload, {'Accept-Encoding': 'gzip, br'})
+        
+        self.assertEqual(response.headers['Content-Encoding'], 'br')
+        self.assertEqual(json.loads(json_api.brotli.decompress(response.get_data())), payload)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import sys
+import os
+import unittest
+
+# Add parent directory to path to allow imports from src
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from keyword_matching import KeywordMatch, KeywordMatcher, compile_keywords
+
+class TestKeywordMatcher(unittest.TestCase):
+    """Unit tests for the compiled keyword matcher."""
+    
+    def setUp(self):
+        """Set up a taxonomy with overlapping keywords."""
+        self.keywords = {
+            "app": ["app", "application", "interface"],
+            "fees": ["fee", "fees", "charge"],
+            "support": ["customer support", "support"]
+        }
+        self.matcher = KeywordMatcher(self.keywords)
+    
+    def test_topics_match_substring_checks(self):
+        """Test that the matched topics are those of `keyword in text` checks."""
+        texts = [
+            "The Application has hidden FEES!",
+            "Customer support was great",
+            "Nothing to see here",
+            "feesupport charges",
+            ""
+        ]
+        for text in texts:
+            expected = [
+                topic for topic, keywords in self.keywords.items()
+                if any(keyword in text.lower() for keyword in keywords)
+            ]
+            self.assertEqual(self.matcher.topics_in(text), expected)
+    
+    def test_find_overlapping_positions(self):
+        """Test that overlapping keywords are all found, with their spans."""
+        matches = self.matcher.find("Great application, no fees")
+        
+        self.assertEqual(matches, [
+            KeywordMatch(6, 17, "application", "app"),
+            KeywordMatch(6, 9, "app", "app"),
+            KeywordMatch(22, 26, "fees", "fees"),
+            KeywordMatch(22, 25, "fee", "fees")
+        ])
+    
+    def test_keyword_in_several_topics(self):
+        """Test that a keyword shared by topics counts for each of them."""
+        matcher = KeywordMatcher({"speed": ["slow"], "app": ["slow app", "app"]})
+        
+        self.assertEqual(matcher.topics_in("a slow app"), ["speed", "app"])
+    
+    def test_empty_taxonomy(self):
+        """Test that a taxonomy without keywords matches nothing."""
+        matcher = KeywordMatcher({})
+        
+        self.assertEqual(matcher.find("anything"), [])
+        self.assertEqual(matcher.topics_in("anything"), [])
+    
+    def test_compile_keywords_reuses_matcher(self):
+        """Test that a taxonomy is compiled once."""
+        matcher = compile_keywords(self.keywords)
+        
+        self.assertIs(compile_keywords(dict(self.keywords)), matcher)
+        self.assertIsNot(compile_keywords({"fees": ["fee"]}), matcher)
+
+if __name__ == '__main__':
+    unittest.main()
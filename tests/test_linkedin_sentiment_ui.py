@@ -0,0 +1,104 @@
+import sys
+import os
+import unittest
+from unittest.mock import patch, MagicMock
+
+# Add parent directory to path to allow imports from src
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import linkedin_sentiment_ui as ui
+from linkedin_sentiment_analysis import generate_company_reviews
+from result_cache import ResultCache
+from analysis_jobs import RUNNING, DONE
+
+class TestLinkedInSentimentUI(unittest.TestCase):
+    """Unit tests for the web app's routes."""
+    
+    def setUp(self):
+        """Set up the test case."""
+        self.client = ui.app.test_client()
+        self.queue = MagicMock()
+        queue_patcher = patch.object(ui, 'job_queue', return_value=self.queue)
+        queue_patcher.start()
+        self.addCleanup(queue_patcher.stop)
+    
+    def make_job(self, status, progress, result=None):
+        """Build a job as returned by the job queue."""
+        return {'id': 'job1', 'params': {'company_name': 'Acme', 'post_count': 10}, 'status': status,
+                'progress': progress, 'result': result, 'error': None}
+    
+    @patch.object(ui, 'PROGRESS_POLL_INTERVAL', 0.01)
+    @patch.object(ui, 'EVENT_STREAM_MAX_SECONDS', 0.1)
+    def test_event_stream_ends_and_resumes(self):
+        """Test that a long stream ends early and a reconnection resumes from the latest snapshot."""
+        self.queue.get.return_value = self.make_job(RUNNING, {'stage': 'scroll', 'posts_collected': 4})
+        
+        first = self.client.get('/jobs/job1/events').get_data(as_text=True)
+        
+        self.assertTrue(first.startswith(f"retry: {ui.EVENT_STREAM_RETRY_MS}\n\n"))
+        self.assertEqual(first.count("event: progress"), 1)
+        self.assertNotIn("event: done", first)
+        
+        result = {'sentiments': {'positive': 1, 'neutral': 0, 'negative': 0}, 'chart_data': {}}
+        self.queue.get.return_value = self.make_job(DONE, {'stage': 'done', 'posts_collected': 10}, result)
+        
+        resumed = self.client.get('/jobs/job1/events').get_data(as_text=True)
+        
+        self.assertIn('"stage": "done"', resumed)
+        self.assertIn("event: done", resumed)
+        self.assertIn("/jobs/job1/report", resumed)
+    
+    @patch.object(ui, 'cached_analysis')
+    def test_api_analyze_rejects_bad_post_counts(self, cached_analysis):
+        """Test that the JSON API answers 400 with a JSON error for an invalid post count."""
+        for post_count in ['abc', '0', '-5', str(ui.MAX_POST_COUNT + 1)]:
+            response = self.client.get(f'/api/analyze?company_name=Acme&post_count={post_count}')
+            self.assertEqual(response.status_code, 400)
+            self.assertIn('post_count', response.get_json()['error'])
+        
+        response = self.client.post('/api/analyze', json={'company_name': 'Acme', 'post_count': None})
+        self.assertEqual(response.status_code, 400)
+        cached_analysis.assert_not_called()
+    
+    def test_submit_job_rejects_bad_post_counts(self):
+        """Test that an invalid post count gets a 400 JSON error without queuing a job."""
+        for post_count in ['abc', '0']:
+            response = self.client.post('/jobs', data={'company_name': 'Acme', 'post_count': post_count})
+            self.assertEqual(response.status_code, 400)
+            self.assertIn('post_count', response.get_json()['error'])
+        
+        self.queue.submit.assert_not_called()
+    
+    @patch.object(ui, 'DATA_SOURCE', 'linkedin')
+    @patch.object(ui, 'scrape_linkedin_for_company')
+    def test_fallback_results_are_not_cached(self, scrape):
+        """Test that an analysis whose scrape fell back to generated posts is run again, while a scraped one is cached."""
+        cache = ResultCache(ttl_seconds=900)
+        scrape.side_effect = lambda company_name, post_count, **kwargs: (generate_company_reviews(company_name, post_count), False)
+        
+        with patch.object(ui, 'result_cache', return_value=cache):
+            result = ui.cached_analysis('Acme', 10)
+            self.assertEqual(result['data_source'], 'generated mock data (scraping failed)')
+            ui.cached_analysis('Acme', 10)
+            self.assertEqual(scrape.call_count, 2)
+            
+            scrape.side_effect = lambda company_name, post_count, **kwargs: (generate_company_reviews(company_name, post_count), True)
+            self.assertEqual(ui.cached_analysis('Acme', 10)['data_source'], 'LinkedIn')
+            ui.cached_analysis('Acme', 10)
+            self.assertEqual(scrape.call_count, 3)
+    
+    @patch.object(ui, 'run_analysis')
+    def test_result_stored_after_the_cache_check_is_reused(self, run_analysis):
+        """Test that an analysis is not run again when the previous flight stored its result after the cache missed."""
+        result = {'data_source': 'LinkedIn'}
+        cache = MagicMock()
+        cache.get.side_effect = [None, result]
+        
+        with patch.object(ui, 'result_cache', return_value=cache):
+            self.assertIs(ui.cached_analysis('Acme', 10), result)
+        
+        run_analysis.assert_not_called()
+        cache.put.assert_not_called()
+
+if __name__ == '__main__':
+    unittest.main()
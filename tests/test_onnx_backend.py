@@ -0,0 +1,80 @@
+import sys
+import os
+import unittest
+import tempfile
+import shutil
+from unittest.mock import patch
+
+import numpy as np
+
+# Add parent directory to path to allow imports from src
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+try:
+    import onnxruntime
+except ImportError:
+    onnxruntime = None
+
+from transformers import RobertaConfig, RobertaForSequenceClassification
+
+from src.sentiment_analysis.onnx_backend import (
+    OnnxEmotionModel, export_onnx_model, max_score_difference, ONNX_SCORE_TOLERANCE
+)
+
+@unittest.skipIf(onnxruntime is None, "onnxruntime is not installed")
+class TestOnnxBackend(unittest.TestCase):
+    """Unit tests for the ONNX Runtime emotion backend."""
+    
+    def setUp(self):
+        """Set up the test case with a small randomly initialized classifier."""
+        self.temp_dir = tempfile.mkdtemp()
+        config = RobertaConfig(
+            vocab_size=50, hidden_size=32, num_hidden_layers=2, num_attention_heads=2,
+            intermediate_size=64, max_position_embeddings=40, num_labels=7, pad_token_id=1
+        )
+        self.model = RobertaForSequenceClassification(config).eval()
+        
+        rng = np.random.default_rng(0)
+        self.batch = {
+            "input_ids": rng.integers(3, 50, size=(4, 12)),
+            "attention_mask": np.ones((4, 12), dtype=np.int64)
+        }
+        # Pad the last sequence
+        self.batch["input_ids"][3, 8:] = 1
+        self.batch["attention_mask"][3, 8:] = 0
+    
+    def tearDown(self):
+        """Clean up after the test."""
+        shutil.rmtree(self.temp_dir)
+    
+    def test_export_is_reused(self):
+        """Test that the model is exported and quantized only once."""
+        path = export_onnx_model(self.model, self.temp_dir)
+        modified = os.path.getmtime(path)
+        
+        self.assertTrue(path.endswith("model.int8.onnx"))
+        self.assertEqual(export_onnx_model(self.model, self.temp_dir), path)
+        self.assertEqual(os.path.getmtime(path), modified)
+    
+    def test_export_is_atomic(self):
+        """Test that only complete files are left in the export directory, even when quantizing fails."""
+        with patch("onnxruntime.quantization.quantize_dynamic", side_effect=RuntimeError("quantization failed")):
+            with self.assertRaises(RuntimeError):
+                export_onnx_model(self.model, self.temp_dir)
+        self.assertEqual(os.listdir(self.temp_dir), ["model.onnx"])
+        
+        export_onnx_model(self.model, self.temp_dir)
+        self.assertEqual(sorted(os.listdir(self.temp_dir)), ["model.int8.onnx", "model.onnx"])
+    
+    def test_quantized_scores_within_tolerance(self):
+        """Test that quantized probabilities stay close to PyTorch."""
+        onnx_model = OnnxEmotionModel(export_onnx_model(self.model, self.temp_dir))
+        
+        probabilities = onnx_model.predict_proba(self.batch["input_ids"], self.batch["attention_mask"])
+        
+        self.assertEqual(probabilities.shape, (4, 7))
+        np.testing.assert_allclose(probabilities.sum(axis=1), 1.0, rtol=1e-5)
+        self.assertLess(max_score_difference(self.model, onnx_model, [self.batch]), ONNX_SCORE_TOLERANCE)
+
+if __name__ == "__main__":
+    unittest.main()
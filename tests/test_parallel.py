@@ -0,0 +1,84 @@
+import sys
+import os
+import unittest
+
+# Add parent directory to path to allow imports from src
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.sentiment_analysis import SentimentAnalyzer, ParallelSentimentAnalyzer, PostDeduplicator, SentimentAggregator
+from src.sentiment_analysis.vader_batch import BatchVaderScorer
+from src.sentiment_analysis import parallel
+from src.sentiment_analysis.parallel import polarity_scores_parallel, shutdown_vader_pool, threads_per_worker
+
+class TestParallelAnalysis(unittest.TestCase):
+    """Unit tests for process-pool analysis."""
+    
+    def setUp(self):
+        """Set up the test case."""
+        texts = [
+            "I love this company!",
+            "The service was terrible.",
+            "Today is Monday.",
+            "",
+            "Great support but slow delivery."
+        ]
+        self.posts = [{"text": text, "id": i} for i, text in enumerate(texts * 4)]
+    
+    def test_threads_per_worker(self):
+        """Test that workers split the cores without going below one thread."""
+        self.assertEqual(threads_per_worker(1), os.cpu_count() or 1)
+        self.assertEqual(threads_per_worker(10000), 1)
+    
+    def test_polarity_scores_parallel(self):
+        """Test that parallel VADER scores match a single batch, in order."""
+        self.addCleanup(shutdown_vader_pool)
+        texts = [post["text"] for post in self.posts]
+        
+        scores = polarity_scores_parallel(texts, workers=2, shard_size=3)
+        
+        self.assertEqual(scores, BatchVaderScorer().polarity_scores_batch(texts))
+    
+    def test_vader_pool_is_reused(self):
+        """Test that parallel VADER scoring keeps its worker processes between calls until shut down."""
+        self.addCleanup(shutdown_vader_pool)
+        texts = [post["text"] for post in self.posts]
+        
+        polarity_scores_parallel(texts, workers=2)
+        pool = parallel._vader_pool
+        polarity_scores_parallel(texts, workers=2)
+        self.assertIs(parallel._vader_pool, pool)
+        
+        shutdown_vader_pool()
+        self.assertIsNone(parallel._vader_pool)
+        self.assertEqual(polarity_scores_parallel(texts, workers=2), BatchVaderScorer().polarity_scores_batch(texts))
+    
+    def test_analyze_posts(self):
+        """Test that sharded analysis keeps the input order and matches serial analysis."""
+        expected = SentimentAnalyzer().analyze_posts(self.posts)
+        
+        with ParallelSentimentAnalyzer(workers=2, shard_size=3) as analyzer:
+            analyzed_posts = analyzer.analyze_posts(self.posts)
+            streamed_posts = list(analyzer.iter_analyze(iter(self.posts), chunk_size=7))
+        
+        self.assertEqual([post["id"] for post in analyzed_posts], [post["id"] for post in expected])
+        self.assertEqual([post["id"] for post in streamed_posts], [post["id"] for post in expected])
+        for post, expected_post in zip(analyzed_posts, expected):
+            self.assertEqual(post["sentiment"], expected_post["sentiment"])
+    
+    def test_duplicates_across_shards(self):
+        """Test that duplicates sent to different shards share one cluster."""
+        posts = [post for post in self.posts if post["text"]]
+        
+        with ParallelSentimentAnalyzer(workers=2, shard_size=3, deduplicator=PostDeduplicator()) as analyzer:
+            analyzed_posts = analyzer.analyze_posts(posts)
+        
+        self.assertEqual([post["id"] for post in analyzed_posts], [post["id"] for post in posts])
+        self.assertEqual(len({post["cluster_id"] for post in analyzed_posts}), 4)
+        self.assertEqual({post["cluster_size"] for post in analyzed_posts}, {4})
+        
+        aggregated = SentimentAggregator().update_many(analyzed_posts).result()
+        self.assertEqual(sum(aggregated["sentiment_counts"].values()), 4)
+        self.assertEqual(aggregated["duplicate_posts"], 12)
+
+if __name__ == "__main__":
+    unittest.main()
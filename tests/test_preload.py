@@ -0,0 +1,41 @@
+import sys
+import os
+import time
+import unittest
+
+# Add parent directory to path to allow imports from src
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.sentiment_analysis.preload import process_memory, worker_memory_report, format_memory_report
+
+@unittest.skipUnless(os.path.exists("/proc/self/smaps_rollup"), "requires Linux /proc")
+class TestWorkerMemoryReport(unittest.TestCase):
+    """Unit tests for the per-worker memory report."""
+    
+    def test_process_memory(self):
+        """Test that the unique and shared sizes add up to the resident size."""
+        memory = process_memory(os.getpid())
+        
+        self.assertGreater(memory["rss"], 0)
+        self.assertLessEqual(memory["uss"], memory["pss"])
+        self.assertEqual(memory["uss"] + memory["shared"], memory["rss"])
+    
+    def test_worker_memory_report(self):
+        """Test that forked children are reported and share the parent's pages."""
+        pid = os.fork()
+        if pid == 0:
+            time.sleep(2)
+            os._exit(0)
+        
+        try:
+            time.sleep(0.2)
+            report = worker_memory_report(os.getpid())
+            worker = next(entry for entry in report if entry["pid"] == pid)
+            self.assertLess(worker["uss"], worker["rss"])
+            self.assertIn(str(pid), format_memory_report(report))
+        finally:
+            os.kill(pid, 9)
+            os.waitpid(pid, 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import sys
+import os
+import unittest
+
+# Add parent directory to path to allow imports from src
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from report_aggregation import ReportAggregator
+
+class TestReportAggregator(unittest.TestCase):
+    """Unit tests for the ReportAggregator class."""
+    
+    def setUp(self):
+        """Set up the test case."""
+        scores = [0.5, -0.2, 0.5, 0.0, -0.2, 0.9, -0.2, 0.1]
+        dates = ["2023-01-15", "2023-02-01", "2023-01-20", "bad date", "2023-2-3", "2023-03-01", "2023-01-02", ""]
+        sentiments = ["positive", "negative", "positive", "neutral", "negative", "positive", "negative", "positive"]
+        texts = ["Great support", "App crash again", "Love the design", "Office move",
+                 "Support never answers", "Fast and great", "Crash on login", "ok"]
+        self.posts = [
+            {"text": text, "date": date, "sentiment": sentiment, "compound_score": score, "id": i}
+            for i, (text, date, sentiment, score) in enumerate(zip(texts, dates, sentiments, scores))
+        ]
+    
+    def test_matches_sorting(self):
+        """Test that sample posts match a stable sort by score, ties included."""
+        aggregate = ReportAggregator(top_k=3).update_many(self.posts)
+        sorted_posts = sorted(self.posts, key=lambda post: post["compound_score"], reverse=True)
+        
+        self.assertEqual(aggregate.most_positive(), sorted_posts[:3])
+        self.assertEqual(aggregate.most_negative(), list(reversed(sorted_posts[-3:])))
+    
+    def test_counts_and_trend(self):
+        """Test the sentiment counts, monthly trend and date range."""
+        aggregate = ReportAggregator().update_many(self.posts)
+        
+        self.assertEqual(aggregate.sentiment_counts, {"positive": 4, "neutral": 1, "negative": 3})
+        self.assertEqual([month for month, _ in aggregate.trend()], ["2023-01", "2023-02", "2023-03"])
+        self.assertEqual(dict(aggregate.trend())["2023-02"], {"positive": 0, "neutral": 0, "negative": 2, "total": 2})
+        self.assertEqual((aggregate.oldest_date, aggregate.newest_date), ("", "bad date"))
+    
+    def test_features_and_issues(self):
+        """Test that features are counted in positive posts and issues in negative ones."""
+        aggregate = ReportAggregator(
+            {"customer service": ["support"], "design": ["design", "ui"]},
+            {"app stability": ["crash"], "customer service": ["support"]}
+        ).update_many(self.posts)
+        
+        self.assertEqual(aggregate.top_features(), [("customer service", 1), ("design", 1)])
+        self.assertEqual(aggregate.top_issues(), [("app stability", 2), ("customer service", 1)])
+        self.assertEqual(aggregate.chart_data()["top_issues"]["labels"], ["app stability", "customer service"])
+
+if __name__ == '__main__':
+    unittest.main()
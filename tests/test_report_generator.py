@@ -7,7 +7,9 @@ import shutil
 # Add parent directory to path to allow imports from src
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from src.report_generation import ReportGenerator
+import json
+
+from src.report_generation import ReportGenerator, select_sample_posts
 
 class TestReportGenerator(unittest.TestCase):
     """Unit tests for the ReportGenerator class."""
@@ -99,5 +101,57 @@ class TestReportGenerator(unittest.TestCase):
         for file_path in report_files.values():
             self.assertTrue(os.path.exists(file_path))
 
+    def test_select_sample_posts(self):
+        """Test single-pass selection of the most positive and negative posts."""
+        scores = [0.1, -0.9, 0.5, 0.5, -0.2, 0.9, 0.0, -0.9]
+        posts = [{"text": str(i), "sentiment": {"scores": {"compound": score}}} for i, score in enumerate(scores)]
+        
+        most_positive, most_negative = select_sample_posts(iter(posts))
+        
+        # Same posts and order as slicing a full descending sort
+        sorted_posts = sorted(posts, key=lambda x: x["sentiment"]["scores"]["compound"], reverse=True)
+        self.assertEqual([p["text"] for p in most_positive], [p["text"] for p in sorted_posts[:3]])
+        self.assertEqual([p["text"] for p in most_negative], ["4", "1", "7"])
+    
+    def test_select_sample_posts_ties(self):
+        """Test that tied scores are selected like slicing a full descending sort."""
+        scores = [0.5, -0.5, 0, 0, 0.5, 0.5, 0]
+        posts = [{"text": str(i), "sentiment": {"scores": {"compound": score}}} for i, score in enumerate(scores)]
+        
+        most_positive, most_negative = select_sample_posts(iter(posts))
+        
+        sorted_posts = sorted(posts, key=lambda x: x["sentiment"]["scores"]["compound"], reverse=True)
+        self.assertEqual([p["text"] for p in most_positive], [p["text"] for p in sorted_posts[:3]])
+        self.assertEqual([p["text"] for p in most_negative], [p["text"] for p in sorted_posts[-3:]])
+        self.assertEqual([p["text"] for p in most_negative], ["3", "6", "1"])
+    
+    def test_generate_report_from_stream(self):
+        """Test generating a complete report from a generator of posts."""
+        aggregate_calls = []
+        def aggregate(posts):
+            aggregate_calls.append(list(posts))
+            return self.aggregated_results
+        
+        report_files = self.report_generator.generate_report_from_stream(
+            self.company_name,
+            (post for post in self.analyzed_posts),
+            aggregate,
+            include_viz=False
+        )
+        
+        self.assertEqual(aggregate_calls, [self.analyzed_posts])
+        self.assertEqual(set(report_files), {"text_report", "raw_data"})
+        
+        with open(report_files["raw_data"], "r") as f:
+            data = json.load(f)
+        self.assertEqual(data["company"], self.company_name)
+        self.assertEqual(data["posts"], self.analyzed_posts)
+        self.assertEqual(data["aggregated_results"], self.aggregated_results)
+        
+        with open(report_files["text_report"], "r") as f:
+            content = f.read()
+        self.assertIn("I love this company's products!", content)
+        self.assertIn("The customer service is terrible.", content)
+
 if __name__ == "__main__":
     unittest.main() 
\ No newline at end of file
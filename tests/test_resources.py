@@ -0,0 +1,75 @@
+import sys
+import os
+import unittest
+import tempfile
+import shutil
+import pickle
+from unittest.mock import patch
+
+# Add parent directory to path to allow imports from src
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.sentiment_analysis import ResourceManager, SentimentAnalyzer
+from src.sentiment_analysis import resources
+
+class TestResourceManager(unittest.TestCase):
+    """Unit tests for the ResourceManager class."""
+    
+    def setUp(self):
+        """Set up the test case."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.manager = ResourceManager(self.temp_dir)
+        self.manager.prefetch()
+    
+    def tearDown(self):
+        """Clean up after the test case."""
+        shutil.rmtree(self.temp_dir)
+    
+    def test_vader_from_bundle(self):
+        """Test that the VADER lexicons resolve to the bundle and score as usual."""
+        self.assertTrue(self.manager.verify())
+        for path in self.manager.vader_lexicon_paths():
+            self.assertTrue(path.startswith(os.path.abspath(self.manager.bundle_dir)))
+        
+        analyzer = SentimentAnalyzer(model_loading="lazy", resources=self.manager)
+        self.assertEqual(analyzer.analyze_sentiment("I love this company!")["category"], "positive")
+    
+    def test_verified_once(self):
+        """Test that an unchanged bundle is not hashed again on the next start."""
+        self.assertTrue(self.manager.verify())
+        
+        with patch.object(resources, "_sha256", wraps=resources._sha256) as sha256:
+            manager = ResourceManager(self.temp_dir)
+            self.assertTrue(manager.verify())
+            self.assertTrue(manager.verify())
+        
+        # Only the manifest is hashed
+        self.assertEqual(sha256.call_count, 1)
+    
+    def test_corrupt_bundle(self):
+        """Test that a modified file invalidates the bundle and VADER falls back to the installed lexicons."""
+        self.assertTrue(self.manager.verify())
+        
+        lexicon_path = os.path.join(self.manager.bundle_dir, "vader", "vader_lexicon.txt")
+        with open(lexicon_path, "r+b") as f:
+            f.write(b"X")
+        
+        manager = ResourceManager(self.temp_dir)
+        self.assertFalse(manager.verify())
+        self.assertEqual(manager.vader_lexicon_paths(), resources.VADER_FILES)
+    
+    def test_model_offline(self):
+        """Test that a missing model is only fetched when downloads are allowed."""
+        with patch("huggingface_hub.snapshot_download", side_effect=OSError("not cached")):
+            self.assertIsNone(self.manager.model_path("example/missing-model"))
+            self.assertEqual(ResourceManager(self.temp_dir, allow_downloads=True).model_path("example/missing-model"),
+                             "example/missing-model")
+    
+    def test_pickle(self):
+        """Test that the manager can be sent to worker processes."""
+        self.manager.verify()
+        manager = pickle.loads(pickle.dumps(self.manager))
+        self.assertEqual(manager.vader_lexicon_paths(), self.manager.vader_lexicon_paths())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+import sys
+import os
+import json
+import unittest
+import tempfile
+import shutil
+from unittest.mock import patch
+
+# Add parent directory to path to allow imports from src
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from result_cache import ResultCache, make_key
+
+class TestResultCache(unittest.TestCase):
+    """Unit tests for the analysis result cache."""
+    
+    def setUp(self):
+        """Set up the test case."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.result = {"company_name": "Acme", "sentiments": {"positive": 2, "neutral": 1, "negative": 0}}
+        self.size = len(json.dumps(self.result))
+    
+    def tearDown(self):
+        """Clean up after the test."""
+        shutil.rmtree(self.temp_dir)
+    
+    def test_make_key(self):
+        """Test that keys ignore case and spacing of the company name, but not the post count or mode."""
+        key = make_key("Fi  Money", 30, "linkedin")
+        
+        self.assertEqual(key, make_key(" fi money ", 30, "linkedin"))
+        self.assertNotEqual(key, make_key("Fi Money", 50, "linkedin"))
+        self.assertNotEqual(key, make_key("Fi Money", 30, "mock"))
+    
+    def test_hits_and_misses(self):
+        """Test that results are served until they expire, and lookups are counted."""
+        cache = ResultCache(ttl_seconds=60)
+        
+        with patch("result_cache.time.time", return_value=1000):
+            self.assertIsNone(cache.get("a"))
+            # A second look after a miss is not counted again
+            self.assertIsNone(cache.get("a", count_miss=False))
+            cache.put("a", self.result)
+            self.assertEqual(cache.get("a"), self.result)
+        with patch("result_cache.time.time", return_value=1061):
+            self.assertIsNone(cache.get("a"))
+        
+        stats = cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["expirations"]), (1, 2, 1))
+        self.assertEqual(stats["entries"], 0)
+    
+    def test_lru_eviction_by_size(self):
+        """Test that the least recently used results are evicted once the memory budget is exceeded."""
+        cache = ResultCache(max_size_mb=2.5 * self.size / 1024 / 1024)
+        cache.put("a", self.result)
+        cache.put("b", self.result)
+        cache.get("a")
+        cache.put("c", self.result)
+        
+        self.assertIsNone(cache.get("b"))
+        self.assertIsNotNone(cache.get("a"))
+        self.assertIsNotNone(cache.get("c"))
+        self.assertEqual(cache.stats()["evictions"], 1)
+        self.assertLessEqual(cache.stats()["size_bytes"], cache.max_size_bytes)
+    
+    def test_disk_tier(self):
+        """Test that results on disk survive a new cache instance."""
+        path = os.path.join(self.temp_dir, "results.sqlite")
+        cache = ResultCache(disk_path=path)
+        cache.put("a", self.result)
+        cache.close()
+        
+        cache = ResultCache(disk_path=path)
+        self.assertEqual(cache.get("a"), self.result)
+        self.assertEqual(cache.get("a"), self.result)
+        
+        stats = cache.stats()
+        self.assertEqual((stats["disk_hits"], stats["hits"]), (1, 1))
+        self.assertEqual(stats["disk_entries"], 1)
+        cache.close()
+    
+    def test_disabled(self):
+        """Test that a TTL of zero disables caching."""
+        cache = ResultCache(ttl_seconds=0)
+        cache.put("a", self.result)
+        
+        self.assertIsNone(cache.get("a"))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,11 +1,17 @@
 import sys
 import os
 import unittest
+import tempfile
+import shutil
+import threading
+from unittest.mock import MagicMock
+
+import numpy as np
 
 # Add parent directory to path to allow imports from src
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from src.sentiment_analysis import SentimentAnalyzer
+from src.sentiment_analysis import SentimentAnalyzer, AnalysisCache
 
 class TestSentimentAnalyzer(unittest.TestCase):
     """Unit tests for the SentimentAnalyzer class."""
@@ -59,6 +65,214 @@ class TestSentimentAnalyzer(unittest.TestCase):
         self.assertIn("sentiment", analyzed_posts[0])
         self.assertIn("emotions", analyzed_posts[0])
     
+    def test_analyze_emotions_batch(self):
+        """Test that batched emotion scores map back to the right texts."""
+        texts = ["a much longer post about the company", "short", "medium length post"]
+        
+        self.analyzer.batch_size = 2
+        self.analyzer.emotion_classifier = MagicMock()
+        self.analyzer.emotion_classifier.model.config.id2label = {0: "joy", 1: "anger"}
+        self.analyzer._encode = lambda batch: [[list(range(len(text.split())))] for text in batch]
+        
+        batches = []
+        def fake_forward(batch_ids):
+            batches.append([len(ids) for ids in batch_ids])
+            return [[len(ids) / 10, 1 - len(ids) / 10] for ids in batch_ids]
+        self.analyzer._forward = fake_forward
+        
+        emotions = self.analyzer.analyze_emotions_batch(texts)
+        
+        # Batches are grouped by length and limited to batch_size
+        self.assertEqual(batches, [[1, 3], [7]])
+        
+        # Results come back in input order
+        self.assertAlmostEqual(emotions[0]["joy"], 0.7)
+        self.assertAlmostEqual(emotions[1]["joy"], 0.1)
+        self.assertAlmostEqual(emotions[2]["anger"], 0.7)
+    
+    def test_analyze_emotions_batch_fallback(self):
+        """Test that texts are scored one at a time when a batch fails, losing only the failing text's scores."""
+        texts = ["fine post", "bad", "another fine post"]
+        
+        self.analyzer.emotion_classifier = MagicMock()
+        self.analyzer.emotion_classifier.model.config.id2label = {0: "joy", 1: "anger"}
+        self.analyzer._encode = lambda batch: [[list(range(len(text.split())))] for text in batch]
+        
+        def fake_forward(batch_ids):
+            if any(len(ids) == 1 for ids in batch_ids):
+                raise RuntimeError("bad input")
+            return [[0.25, 0.75] for _ in batch_ids]
+        self.analyzer._forward = fake_forward
+        
+        emotions = self.analyzer.analyze_emotions_batch(texts)
+        matrix = self.analyzer.analyze_emotions_matrix(texts)
+        
+        self.assertEqual(emotions, [{"joy": 0.25, "anger": 0.75}, {}, {"joy": 0.25, "anger": 0.75}])
+        self.assertEqual(matrix[0].tolist(), [0.25, 0.75])
+        self.assertTrue(np.isnan(matrix[1]).all())
+        self.assertEqual(matrix[2].tolist(), [0.25, 0.75])
+    
+    def test_analyze_posts_columnar(self):
+        """Test that columnar analysis matches analyze_posts."""
+        posts = [
+            {"text": "I love this company!", "date": "2023-01-01"},
+            {"text": "   ", "date": "2023-01-02"},
+            {"text": "", "date": "2023-01-03"},
+            {"text": "The service was terrible.", "date": "2023-01-04"}
+        ]
+        
+        self.analyzer.emotion_classifier = MagicMock()
+        self.analyzer.emotion_classifier.model.config.id2label = {0: "joy", 1: "anger"}
+        self.analyzer._encode = lambda batch: [[list(range(len(text.split())))] for text in batch]
+        self.analyzer._forward = lambda batch_ids: [[0.25, 0.75] for _ in batch_ids]
+        
+        columns = self.analyzer.analyze_posts_columnar(posts)
+        expected = self.analyzer.analyze_posts(posts)
+        
+        self.assertEqual(len(columns), 3)
+        self.assertEqual(columns.emotion_labels, ("joy", "anger"))
+        for post, expected_post in zip(columns, expected):
+            self.assertEqual(post["sentiment"], expected_post["sentiment"])
+            self.assertEqual(post["emotions"], expected_post["emotions"])
+        
+        aggregated = self.analyzer.get_aggregated_results(columns)
+        self.assertEqual(aggregated["sentiment_counts"], self.analyzer.get_aggregated_results(expected)["sentiment_counts"])
+    
+    def test_tiered_mode(self):
+        """Test that tiered mode sends only ambiguous, sampled and report posts to the model."""
+        analyzer = SentimentAnalyzer(emotion_mode="tiered", ambiguity_threshold=0.5, sample_rate=0.0,
+                                     report_samples=1)
+        analyzer.emotion_classifier = MagicMock()
+        analyzer.emotion_classifier.model.config.id2label = {0: "joy", 1: "anger"}
+        analyzer._encode = lambda batch: [[list(range(len(text.split())))] for text in batch]
+        analyzer._forward = MagicMock(side_effect=lambda batch_ids: [[0.75, 0.25] for _ in batch_ids])
+        
+        posts = [
+            {"text": "I love this company, the service is wonderful!"},
+            {"text": "Great product, happy with it."},
+            {"text": "The office is on Main Street."},
+            {"text": "Awful service, I hate waiting, terrible support."}
+        ]
+        
+        analyzed_posts = analyzer.analyze_posts(posts)
+        tiers = [post["emotion_tier"] for post in analyzed_posts]
+        
+        # The most positive and most negative posts are kept for the report
+        self.assertEqual(tiers, ["report", "skipped", "ambiguous", "report"])
+        self.assertEqual(analyzed_posts[1]["emotions"], {})
+        self.assertAlmostEqual(analyzed_posts[2]["emotions"]["joy"], 0.75)
+        
+        # Without a random sample the skipped post cannot be estimated
+        aggregated = analyzer.get_aggregated_results(analyzed_posts)
+        self.assertIsNone(aggregated["emotion_distribution_error"]["joy"])
+        self.assertEqual(analyzer.get_aggregated_results(analyzer.analyze_posts_columnar(posts))["emotion_distribution_error"],
+                         aggregated["emotion_distribution_error"])
+    
+    def test_background_model_loading(self):
+        """Test that posts get VADER results only until a background model load finishes."""
+        analyzer = SentimentAnalyzer(model_loading="lazy")
+        release = threading.Event()
+        classifier = MagicMock()
+        classifier.model.config.id2label = {0: "joy", 1: "anger"}
+        
+        def slow_load():
+            release.wait(5)
+            analyzer._classifier = classifier
+            analyzer._loaded.set()
+        analyzer._load_emotion_model = slow_load
+        analyzer._encode = lambda batch: [[list(range(len(text.split())))] for text in batch]
+        analyzer._forward = lambda batch_ids: [[0.75, 0.25] for _ in batch_ids]
+        
+        self.assertFalse(analyzer.wait_ready(timeout=0.01))
+        analyzed_posts = analyzer.analyze_posts([{"text": "I love this company!"}])
+        self.assertEqual(analyzed_posts[0]["sentiment"]["category"], "positive")
+        self.assertEqual(analyzed_posts[0]["emotions"], {})
+        
+        release.set()
+        self.assertTrue(analyzer.wait_ready(timeout=5))
+        self.assertTrue(analyzer.is_ready())
+        analyzed_posts = analyzer.analyze_posts([{"text": "I love this company!"}])
+        self.assertAlmostEqual(analyzed_posts[0]["emotions"]["joy"], 0.75)
+    
+    def test_analyze_emotion_long_text_chunking(self):
+        """Test that long texts are split into overlapping token windows."""
+        tokenizer = MagicMock()
+        tokenizer.model_max_length = 6
+        tokenizer.return_value = {
+            "input_ids": [[-1, 0, 1, 2, 3, -2], [-1, 3, 4, 5, 6, -2], [-1, 6, 7, 8, -2], [-1, 0, -2]],
+            "overflow_to_sample_mapping": [0, 0, 0, 1]
+        }
+        
+        self.analyzer.long_text_mode = "chunk"
+        self.analyzer.window_overlap = 1
+        self.analyzer.emotion_classifier = MagicMock()
+        self.analyzer.emotion_classifier.tokenizer = tokenizer
+        self.analyzer.emotion_classifier.model.config.id2label = {0: "joy", 1: "anger"}
+        self.analyzer.emotion_classifier.model.config.max_position_embeddings = 514
+        
+        scored_windows = []
+        def fake_forward(batch_ids):
+            scored_windows.extend(batch_ids)
+            # Windows containing token 0 are joyful, the rest angry
+            return [[1.0, 0.0] if 0 in ids else [0.0, 1.0] for ids in batch_ids]
+        self.analyzer._forward = fake_forward
+        
+        emotions = self.analyzer.analyze_emotions_batch(["one two three four five six seven eight nine", "one"])
+        
+        # All windows of both texts are scored, each exactly once
+        self.assertEqual(len(scored_windows), 4)
+        self.assertEqual(tokenizer.call_args.kwargs["stride"], 1)
+        self.assertTrue(tokenizer.call_args.kwargs["return_overflowing_tokens"])
+        
+        # Window scores are averaged per text, weighted by window length
+        self.assertAlmostEqual(emotions[0]["joy"], 6 / 17)
+        self.assertAlmostEqual(emotions[0]["anger"], 11 / 17)
+        self.assertAlmostEqual(emotions[1]["joy"], 1.0)
+    
+    def test_analyze_posts_with_cache(self):
+        """Test that cached posts are not analyzed again."""
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+        self.analyzer.cache = AnalysisCache(os.path.join(temp_dir, "cache.sqlite"))
+        self.addCleanup(self.analyzer.cache.close)
+        
+        self.analyzer.emotion_classifier = MagicMock()
+        self.analyzer.emotion_classifier.model.config._commit_hash = "abc123"
+        scored_texts = []
+        def fake_batch(texts):
+            scored_texts.extend(texts)
+            return [{"joy": 0.5} for _ in texts]
+        self.analyzer.analyze_emotions_batch = fake_batch
+        
+        posts = [{"text": "I love this company!"}, {"text": "The service was terrible."}]
+        first_run = self.analyzer.analyze_posts(posts)
+        second_run = self.analyzer.analyze_posts(posts + [{"text": "Product arrived on schedule."}])
+        
+        self.assertEqual(scored_texts, [
+            "I love this company!", "The service was terrible.", "Product arrived on schedule."
+        ])
+        self.assertEqual(second_run[:2], first_run)
+        self.assertEqual(self.analyzer.cache.stats()["hits"], 2)
+    
+    def test_iter_analyze(self):
+        """Test streaming analysis in chunks."""
+        chunks = []
+        def fake_batch(texts):
+            chunks.append(len(texts))
+            return [{"joy": 0.5} for _ in texts]
+        self.analyzer.analyze_emotions_batch = fake_batch
+        
+        posts = ({"text": f"Post number {i}", "id": i} for i in range(5))
+        analyzed = list(self.analyzer.iter_analyze(posts, chunk_size=2))
+        
+        self.assertEqual(chunks, [2, 2, 1])
+        self.assertEqual([post["id"] for post in analyzed], [0, 1, 2, 3, 4])
+        
+        # The stream can be aggregated without building a list
+        results = self.analyzer.get_aggregated_results(self.analyzer.iter_analyze(iter(analyzed)))
+        self.assertEqual(sum(results["sentiment_counts"].values()), 5)
+        self.assertAlmostEqual(results["emotion_distribution"]["joy"], 0.5)
+    
     def test_get_aggregated_results(self):
         """Test aggregating analysis results."""
         analyzed_posts = [
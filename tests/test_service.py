@@ -0,0 +1,71 @@
+import sys
+import os
+import unittest
+import threading
+from unittest.mock import MagicMock
+
+# Add parent directory to path to allow imports from src
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.sentiment_analysis import SentimentAnalyzer, InferenceService, InferenceClient
+
+class TestInferenceService(unittest.TestCase):
+    """Unit tests for the InferenceService and InferenceClient classes."""
+    
+    def setUp(self):
+        """Set up the test case."""
+        self.analyzer = SentimentAnalyzer(model_loading="lazy")
+        self.analyzer.emotion_classifier = MagicMock()
+        self.analyzer.emotion_classifier.model.config.id2label = {0: "joy", 1: "anger"}
+        self.analyzer._encode = lambda batch: [[list(range(len(text.split())))] for text in batch]
+        self.analyzer._forward = lambda batch_ids: [[0.75, 0.25] for _ in batch_ids]
+        self.service = InferenceService(self.analyzer, max_batch_posts=100, max_wait_ms=200).start()
+        self.client = InferenceClient(self.service, timeout=10)
+    
+    def tearDown(self):
+        """Stop the service."""
+        self.service.stop()
+    
+    def test_concurrent_requests_share_batches(self):
+        """Test that concurrent requests are batched together and get their own results."""
+        results = {}
+        start = threading.Barrier(4)
+        
+        def request(index):
+            posts = [{"text": f"Request {index} post {i} is great", "request": index} for i in range(index + 1)]
+            start.wait()
+            results[index] = self.client.analyze_posts(posts)
+        
+        threads = [threading.Thread(target=request, args=(index,)) for index in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        for index, analyzed_posts in results.items():
+            self.assertEqual(len(analyzed_posts), index + 1)
+            self.assertTrue(all(post["request"] == index for post in analyzed_posts))
+            self.assertAlmostEqual(analyzed_posts[0]["emotions"]["joy"], 0.75)
+        
+        stats = self.service.stats()
+        self.assertEqual(stats["requests"], 4)
+        self.assertEqual(stats["posts"], 10)
+        self.assertLess(stats["batches"], 4)
+    
+    def test_analyze_texts(self):
+        """Test that every text gets a result, including empty ones."""
+        analyses = self.client.analyze_texts(["I love it!", "", "I hate it."])
+        
+        self.assertEqual([analysis["sentiment"]["category"] for analysis in analyses],
+                         ["positive", "neutral", "negative"])
+        self.assertEqual(analyses[1]["emotions"], {})
+    
+    def test_errors_reach_callers(self):
+        """Test that a failed batch raises in the callers instead of hanging them."""
+        self.analyzer.analyze_posts = MagicMock(side_effect=RuntimeError("model failed"))
+        
+        with self.assertRaises(RuntimeError):
+            self.client.analyze_posts([{"text": "Anything"}])
+
+if __name__ == '__main__':
+    unittest.main()
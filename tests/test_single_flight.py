@@ -0,0 +1,90 @@
+import sys
+import os
+import unittest
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# Add parent directory to path to allow imports from src
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from single_flight import SingleFlight
+
+class TestSingleFlight(unittest.TestCase):
+    """Unit tests for the coalescing of identical concurrent calls."""
+    
+    def setUp(self):
+        """Set up the test case."""
+        self.flights = SingleFlight()
+        self.release = threading.Event()
+        self.calls = 0
+    
+    def slow_call(self, result="result", error=None):
+        """Return a function that blocks until released, then returns or raises."""
+        def function():
+            self.calls += 1
+            self.release.wait(5)
+            if error is not None:
+                raise error
+            return result
+        return function
+    
+    def run_concurrently(self, function, callers=4, timeout=None):
+        """Call the same key from several threads, release the call once they all wait, and return the outcomes."""
+        with ThreadPoolExecutor(max_workers=callers) as executor:
+            futures = [executor.submit(self.flights.do, "key", function, timeout) for _ in range(callers)]
+            for _ in range(500):
+                if self.flights.stats()["coalesced"] == callers - 1:
+                    break
+                threading.Event().wait(0.01)
+            self.release.set()
+            outcomes = []
+            for future in futures:
+                try:
+                    outcomes.append(future.result())
+                except Exception as e:
+                    outcomes.append(e)
+        return outcomes
+    
+    def test_coalesce(self):
+        """Test that concurrent callers of a key share one call."""
+        outcomes = self.run_concurrently(self.slow_call())
+        
+        self.assertEqual(outcomes, ["result"] * 4)
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(self.flights.stats(), {"calls": 1, "coalesced": 3, "timeouts": 0, "in_flight": 0})
+    
+    def test_error_propagates(self):
+        """Test that the call's exception reaches every waiting caller."""
+        error = ValueError("scraping failed")
+        outcomes = self.run_concurrently(self.slow_call(error=error))
+        
+        self.assertEqual(outcomes, [error] * 4)
+        self.assertEqual(self.calls, 1)
+    
+    def test_waiter_timeout(self):
+        """Test that a waiter gives up after its timeout while the call goes on."""
+        leader = threading.Thread(target=self.flights.do, args=("key", self.slow_call()))
+        leader.start()
+        for _ in range(500):
+            if self.flights.stats()["in_flight"]:
+                break
+            threading.Event().wait(0.01)
+        
+        with self.assertRaises(TimeoutError):
+            self.flights.do("key", self.slow_call(), timeout=0.05)
+        
+        self.release.set()
+        leader.join()
+        self.assertEqual(self.flights.stats()["timeouts"], 1)
+        self.assertEqual(self.calls, 1)
+    
+    def test_new_call_after_completion(self):
+        """Test that a key is computed again once its call finished."""
+        self.release.set()
+        self.flights.do("key", self.slow_call())
+        self.flights.do("key", self.slow_call())
+        
+        self.assertEqual(self.calls, 2)
+
+if __name__ == '__main__':
+    unittest.main()
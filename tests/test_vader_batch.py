@@ -0,0 +1,94 @@
+import sys
+import os
+import random
+import unittest
+
+# Add parent directory to path to allow imports from src
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer, BOOSTER_DICT, NEGATE, SPECIAL_CASES
+from src.sentiment_analysis.vader_batch import BatchVaderScorer
+
+# Sentences exercising each of VADER's rules
+REFERENCE_TEXTS = [
+    "VADER is smart, handsome, and funny.",
+    "VADER is smart, handsome, and funny!",
+    "VADER is very smart, handsome, and funny.",
+    "VADER is VERY SMART, handsome, and FUNNY.",
+    "VADER is VERY SMART, handsome, and FUNNY!!!",
+    "VADER is VERY SMART, uber handsome, and FRIGGIN FUNNY!!!",
+    "VADER is not smart, handsome, nor funny.",
+    "The book was good.",
+    "At least it isn't a horrible book.",
+    "The book was only kind of good.",
+    "The plot was good, but the characters are uncompelling and the dialog is not great.",
+    "Today SUX!",
+    "Today only kinda sux! But I'll get by, lol",
+    "Make sure you :) or :D today!",
+    "Catch utf-8 emoji such as 💘 and 💋 and 😁",
+    "Not bad at all",
+    "no problems, no worries",
+    "It was never so good and without doubt the best",
+    "Is this the least bit helpful???",
+    "That was the bomb, yeah right",
+    "Great support but but slow but fine",
+    "",
+    "   ",
+    "😁😁 great",
+]
+
+class TestBatchVaderScorer(unittest.TestCase):
+    """Unit tests for the BatchVaderScorer class."""
+    
+    @classmethod
+    def setUpClass(cls):
+        """Load the lexicons once for all tests."""
+        cls.reference = SentimentIntensityAnalyzer()
+        cls.scorer = BatchVaderScorer(cls.reference)
+    
+    def assert_identical(self, texts):
+        """Check batch scores against vaderSentiment, text by text."""
+        scores = self.scorer.polarity_scores_batch(texts)
+        
+        self.assertEqual(len(scores), len(texts))
+        for text, batch_scores in zip(texts, scores):
+            self.assertEqual(batch_scores, self.reference.polarity_scores(text), msg=text)
+    
+    def test_reference_texts(self):
+        """Test that the rule examples score exactly as vaderSentiment."""
+        self.assert_identical(REFERENCE_TEXTS)
+    
+    def test_random_corpus(self):
+        """Test random mixes of lexicon words, modifiers, capitals and punctuation."""
+        rng = random.Random(42)
+        emojis = [emoji for emoji in self.reference.emojis if len(emoji) == 1]
+        vocabulary = (
+            rng.sample(sorted(self.reference.lexicon), 500) + list(BOOSTER_DICT) + NEGATE + list(SPECIAL_CASES) +
+            ["no", "but", "least", "at", "very", "never", "so", "this", "without", "doubt", "kind", "of", "or", "nor",
+             "the", "company", "!", "??"]
+        )
+        
+        def random_word():
+            word = rng.choice(vocabulary)
+            if rng.random() < 0.15:
+                word = word.upper()
+            if rng.random() < 0.1:
+                word += rng.choice(".,!?:;)")
+            if rng.random() < 0.05:
+                word = rng.choice(emojis) + word
+            return word
+        
+        texts = [" ".join(random_word() for _ in range(rng.randint(0, 25))) for _ in range(2000)]
+        self.assert_identical(texts)
+    
+    def test_single_text(self):
+        """Test the single-text interface."""
+        text = "I absolutely love this product!"
+        self.assertEqual(self.scorer.polarity_scores(text), self.reference.polarity_scores(text))
+    
+    def test_empty_batch(self):
+        """Test scoring an empty batch."""
+        self.assertEqual(self.scorer.polarity_scores_batch([]), [])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,37 @@
+import sys
+import os
+import unittest
+import threading
+
+# Add parent directory to path to allow imports from src
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.sentiment_analysis import SentimentAnalyzer
+from src.sentiment_analysis.vader_registry import get_vader_analyzer, get_vader_scorer, vader_load_count
+from linkedin_sentiment_analysis import analyze_sentiment
+
+class TestVaderRegistry(unittest.TestCase):
+    """Unit tests for the shared VADER analyzer registry."""
+    
+    def test_one_load_per_process(self):
+        """Test that analyzers, threads and the legacy pipeline share one lexicon load."""
+        analyzer = get_vader_analyzer()
+        loads = vader_load_count()
+        
+        scorers = []
+        threads = [threading.Thread(target=lambda: scorers.append(get_vader_scorer())) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        analyze_sentiment([{"text": "I love this company!"}])
+        sentiment_analyzer = SentimentAnalyzer(model_loading="lazy")
+        
+        self.assertTrue(all(scorer is scorers[0] for scorer in scorers))
+        self.assertIs(sentiment_analyzer.vader_analyzer, analyzer)
+        self.assertIs(sentiment_analyzer.vader_scorer, scorers[0])
+        self.assertEqual(vader_load_count(), loads)
+
+if __name__ == '__main__':
+    unittest.main()